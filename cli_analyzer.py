@@ -5,11 +5,25 @@ Allows running analysis from the command line.
 """
 import os
 import sys
+import json
+import time
+import sqlite3
 import argparse
 import logging
 from core.analyzer import Analyzer
+from core.column_index import ColumnIndex
+from core.snapshot_diff import SnapshotDiff
 from utils.config import Config
 from utils.exporter import Exporter
+from utils.export_pipeline import ExportPipeline
+from utils.plantuml_client import PlantUmlClient
+from utils.render_cache import RenderCache
+from utils.run_store import RunStore
+from utils.sqlite_store import SqliteStore
+
+
+# Questions answered by the query command
+SQLITE_QUERIES = ('runs', 'tables', 'fields', 'relationships', 'statements', 'columns', 'sql')
 
 
 def main():
@@ -30,11 +44,15 @@ def main():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     
-    parser.add_argument('--path', '-p', required=True,
-                        help='Path to directory containing MyBatis XML files')
+    parser.add_argument('--path', '-p', default=None,
+                        help='Path to directory containing MyBatis XML files (required unless running diff)')
+    
+    parser.add_argument('--output', '-o', default=None,
+                        help='Output file path for the --format output, or "-" to write it to stdout '
+                             '(default: diagram.puml, or the default file name of the format)')
     
-    parser.add_argument('--output', '-o', default='diagram.puml',
-                        help='Output file path for PlantUML diagram')
+    parser.add_argument('--format', '-f', choices=['plantuml', 'json', 'ndjson', 'csv'], default='plantuml',
+                        help='Format written to --output; ndjson writes one entity or relationship per line')
     
     parser.add_argument('--csv', default=None,
                         help='Output file path for CSV relationships list')
@@ -42,63 +60,259 @@ def main():
     parser.add_argument('--svg', default=None,
                         help='Output file path for SVG diagram')
     
+    parser.add_argument('--svg-renderer', choices=['native', 'plantuml'],
+                        default=config.get('SVG_RENDERER', 'native'),
+                        help='SVG renderer: built-in offline renderer or the PlantUML server')
+    
+    parser.add_argument('--layout', choices=['auto', 'force', 'layered', 'grid'],
+                        default=config.get('LAYOUT_MODE', 'auto'),
+                        help='Layout of the native SVG diagram')
+    
     parser.add_argument('--png', default=None,
                         help='Output file path for PNG diagram')
     
+    parser.add_argument('--html', default=None,
+                        help='Output file path for a self-contained offline HTML report')
+    
+    parser.add_argument('--json', default=None,
+                        help='Output file path for the analysis results JSON (snapshot for diff)')
+    
+    parser.add_argument('--snapshot', default=None,
+                        help='Output file path for a binary snapshot (compact, memory-mapped by diff)')
+    
+    parser.add_argument('--columns-csv', default=None,
+                        help='Output file path for the column usage CSV')
+    
+    parser.add_argument('--db', default=None, metavar='FILE',
+                        help='Also store the analysis in this SQLite database (see the query command)')
+    
+    parser.add_argument('--results', default=None, metavar='FILE',
+                        help='Use an analysis_results.json saved with --json instead of analyzing --path '
+                             '(its statement, column and search indexes are loaded as saved)')
+    
     parser.add_argument('--max-depth', type=int, default=config.get_int('MAX_DEPTH', 3),
                         help='Maximum depth for nested query parsing')
     
+    parser.add_argument('--focus', default=None, metavar='TABLE',
+                        help='Only export the neighborhood of this table')
+    
+    parser.add_argument('--hops', type=int, default=2,
+                        help='Neighborhood radius (number of joins) used with --focus')
+    
+    parser.add_argument('--partition-size', type=int, default=None, metavar='N',
+                        help='Also export one diagram per partition of at most N tables, '
+                             'plus an overview diagram')
+    
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
     
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND',
+                                       help='Query the analysis instead of exporting it')
+    
+    join_path_parser = subparsers.add_parser(
+        'join-path',
+        help='Show the shortest join paths between two tables',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    join_path_parser.add_argument('source', help='Table to start from')
+    join_path_parser.add_argument('target', help='Table to reach')
+    join_path_parser.add_argument('-k', type=int, default=3,
+                                  help='Number of paths to return')
+    
+    impact_parser = subparsers.add_parser(
+        'impact',
+        help='List every mapper statement that references a table',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    impact_parser.add_argument('table', help='Table to look up')
+    
+    columns_parser = subparsers.add_parser(
+        'columns',
+        help='List every statement that joins, filters, sorts or groups on a column',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    columns_parser.add_argument('column', metavar='TABLE.COLUMN', help='Column to look up')
+    columns_parser.add_argument('--role', action='append', choices=ColumnIndex.ROLES,
+                                help='Only show these roles (repeatable)')
+    
+    search_parser = subparsers.add_parser(
+        'search',
+        help='Find statements whose SQL contains a text fragment',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    search_parser.add_argument('query', help='Text to search (case and whitespace insensitive)')
+    search_parser.add_argument('--limit', type=int, default=50,
+                               help='Maximum number of hits')
+    
+    diff_parser = subparsers.add_parser(
+        'diff',
+        help='Compare two saved analysis results (analysis_results.json or --snapshot files)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    diff_parser.add_argument('old', help='Older snapshot file')
+    diff_parser.add_argument('new', help='Newer snapshot file')
+    diff_parser.add_argument('--save', default=None, metavar='FILE',
+                             help='Also write the diff as JSON to this file')
+    
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Query analyses stored with --db, without analyzing again',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    query_parser.add_argument('db', help='SQLite database written with --db')
+    query_parser.add_argument('what', choices=SQLITE_QUERIES,
+                              help='runs | tables [PATTERN] | fields TABLE | relationships TABLE [FIELD] | '
+                                   'statements TABLE | columns TABLE.COLUMN | sql SELECT...')
+    query_parser.add_argument('terms', nargs='*', help='Arguments of the query')
+    query_parser.add_argument('--run', type=int, default=None,
+                              help='Run id to query (default: latest)')
+    
     args = parser.parse_args()
     
     # Configure logging level
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    # Verify input directory
-    if not os.path.exists(args.path):
+    # Snapshot comparison and stored queries do not analyze a directory
+    if args.command == 'diff':
+        return run_diff(args, logger)
+    
+    if args.command == 'query':
+        return run_query(args, logger)
+    
+    if not args.path and not args.results:
+        parser.error('--path (or --results) is required')
+    
+    # Verify input
+    if args.results:
+        if not os.path.isfile(args.results):
+            logger.error(f"Saved results not found: {args.results}")
+            return 1
+    elif not os.path.exists(args.path):
         logger.error(f"Directory not found: {args.path}")
         return 1
     
-    logger.info(f"Analyzing directory: {args.path}")
-    
     try:
         # Initialize the analyzer
-        analyzer = Analyzer(max_depth=args.max_depth)
+        analyzer = Analyzer(max_depth=args.max_depth, layout_mode=args.layout)
+        
+        if args.results:
+            # Saved results carry the lookup indexes; no mapper is parsed again
+            results = analyzer.load_results(args.results)
+        else:
+            logger.info(f"Analyzing directory: {args.path}")
+            # 字段使用索引只在需要时构建（columns 命令、--columns-csv、保存的结果）
+            column_usages = bool(args.command == 'columns' or args.columns_csv or args.json or args.db)
+            results = analyzer.analyze_directory(args.path, column_usages=column_usages)
+            
+            logger.info(f"Analysis complete. Found {results['stats']['total_entities']} tables "
+                       f"and {results['stats']['total_relationships']} relationships.")
+        
+        # Store the full analysis for later queries if requested
+        if args.db:
+            store = SqliteStore(args.db)
+            try:
+                fingerprint = None
+                if not args.results:
+                    fingerprint = RunStore.fingerprint(args.path, {'max_depth': args.max_depth})
+                run_id = store.save(results, os.path.abspath(args.path or args.results), fingerprint)
+                logger.info(f"Analysis stored in {args.db} (run {run_id})")
+            finally:
+                store.close()
+        
+        if args.command == 'join-path':
+            paths = analyzer.find_join_paths(results, args.source, args.target, args.k)
+            print_join_paths(args.source, args.target, paths)
+            return 0 if paths else 1
         
-        # Analyze the directory
-        results = analyzer.analyze_directory(args.path)
+        if args.command == 'impact':
+            statements = analyzer.find_statements(results, args.table)
+            print_statements(args.table, statements)
+            return 0 if statements else 1
         
-        logger.info(f"Analysis complete. Found {results['stats']['total_entities']} tables "
-                   f"and {results['stats']['total_relationships']} relationships.")
+        if args.command == 'columns':
+            table, _, column = args.column.partition('.')
+            if not column:
+                logger.error(f"Expected TABLE.COLUMN, got: {args.column}")
+                return 1
+            if results.get('column_index') is None:
+                logger.error(f"No column index in {args.results}; save it with --path ... --json")
+                return 1
+            usages = analyzer.find_column_usages(results, table, column, args.role)
+            print_column_usages(args.column, usages)
+            return 0 if usages else 1
+        
+        if args.command == 'search':
+            hits = analyzer.search_statements(results, args.query, args.limit)
+            print_search_hits(args.query, hits)
+            return 0 if hits else 1
+        
+        if args.focus:
+            results = analyzer.focus(results, args.focus, args.hops)
+            if results is None:
+                logger.error(f"Table not found in analysis results: {args.focus}")
+                return 1
+            logger.info(f"Focused on {args.focus} ({args.hops} hops): "
+                        f"{results['stats']['total_entities']} tables "
+                        f"and {results['stats']['total_relationships']} relationships.")
         
         # Initialize the exporter
-        output_dir = os.path.dirname(os.path.abspath(args.output))
-        exporter = Exporter(output_dir=output_dir)
-        
-        # Export PlantUML
-        puml_path = exporter.export_plantuml(results['diagram'], os.path.basename(args.output))
-        logger.info(f"PlantUML diagram saved to: {puml_path}")
-        
-        # Export CSV if requested
-        if args.csv:
-            csv_path = exporter.export_csv(results['relationships'], os.path.basename(args.csv))
-            if csv_path:
-                logger.info(f"CSV relationships saved to: {csv_path}")
-        
-        # Export SVG if requested
-        if args.svg:
-            svg_path = exporter.export_svg(results['diagram'], os.path.basename(args.svg))
-            if svg_path:
-                logger.info(f"SVG diagram saved to: {svg_path}")
-        
-        # Export PNG if requested
-        if args.png:
-            png_path = exporter.export_png(results['diagram'], os.path.basename(args.png))
-            if png_path:
-                logger.info(f"PNG diagram saved to: {png_path}")
+        # "-" 表示主输出写到 stdout，其余文件写到当前目录；日志始终在 stderr
+        to_stdout = args.output == '-'
+        output_name = None if to_stdout else os.path.basename(
+            args.output or ExportPipeline.DEFAULT_FILENAMES[args.format]
+        )
+        output_dir = os.getcwd() if to_stdout else os.path.dirname(os.path.abspath(args.output or output_name))
+        render_cache = None
+        if (args.svg or args.png) and config.get_int('RENDER_CACHE_MAX_MB', 256) > 0:
+            render_cache = RenderCache(
+                config.get('RENDER_CACHE_DIR') or os.path.join(output_dir, '.render_cache'),
+                max_bytes=config.get_int('RENDER_CACHE_MAX_MB', 256) * 1024 * 1024
+            )
+        plantuml_client = PlantUmlClient(
+            config.get('PLANTUML_SERVER'),
+            timeout=config.get_int('PLANTUML_TIMEOUT', 30),
+            retries=config.get_int('PLANTUML_RETRIES', 2),
+            pool_size=config.get_int('PLANTUML_POOL_SIZE', 4)
+        )
+        exporter = Exporter(output_dir=output_dir, render_cache=render_cache, plantuml_client=plantuml_client)
+        
+        # Export partition diagrams if requested
+        partitioned = None
+        if args.partition_size:
+            partitioned = analyzer.partition(results, args.partition_size)
+            prefix = os.path.splitext(output_name or ExportPipeline.DEFAULT_FILENAMES['plantuml'])[0]
+            partition_paths = exporter.export_partitions(partitioned, prefix)
+            logger.info(f"Exported {len(partitioned['partitions'])} partition diagrams "
+                        f"and an overview ({len(partition_paths)} files)")
+        
+        # Export every requested format in one pass; rendering runs concurrently
+        filenames = {} if to_stdout else {args.format: output_name}
+        for fmt, path in (('csv', args.csv), ('json', args.json), ('snapshot', args.snapshot),
+                          ('html', args.html), ('column_usage', args.columns_csv),
+                          ('svg', args.svg), ('png', args.png)):
+            if path:
+                filenames[fmt] = os.path.basename(path)
+        
+        if args.html and partitioned is None:
+            partitioned = analyzer.partition(results, 40)
+        positions = None
+        if args.svg and args.svg_renderer == 'native':
+            positions = analyzer.get_layout(results)['positions']
+        
+        pipeline = ExportPipeline(exporter, svg_renderer=args.svg_renderer)
+        if to_stdout:
+            try:
+                pipeline.stream(results, args.format, sys.stdout, diagram=analyzer.iter_diagram(results))
+            except BrokenPipeError:
+                # The reader (e.g. head) closed the pipe early; discard the rest quietly
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        
+        paths = pipeline.run(results, filenames, diagram=analyzer.iter_diagram(results),
+                             positions=positions, partitioned=partitioned)
+        for fmt, path in paths.items():
+            if path:
+                logger.info(f"{ExportPipeline.LABELS[fmt]} saved to: {path}")
         
         return 0
         
@@ -110,5 +324,240 @@ def main():
         return 1
 
 
+def run_query(args, logger):
+    """
+    Answer a question from an analysis stored with --db.
+    
+    Args:
+        args (argparse.Namespace): Parsed arguments of the query subcommand
+        logger (logging.Logger): Logger
+        
+    Returns:
+        int: Exit code (0 when rows were found, 1 when none, 2 on errors)
+    """
+    if not os.path.exists(args.db):
+        logger.error(f"Database not found: {args.db}")
+        return 2
+    
+    expected = {'fields': 1, 'relationships': 1, 'statements': 1, 'columns': 1, 'sql': 1}
+    if len(args.terms) < expected.get(args.what, 0):
+        logger.error(f"'{args.what}' needs an argument")
+        return 2
+    
+    store = SqliteStore(args.db)
+    try:
+        if args.what == 'runs':
+            columns = ['id', 'directory', 'created_at', 'total_entities', 'total_relationships']
+            rows = [[run[column] for column in columns] for run in store.runs()]
+            for row in rows:
+                row[2] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(row[2]))
+        elif args.what == 'tables':
+            columns = ['name', 'primary_key', 'field_count']
+            pattern = args.terms[0].replace('*', '%') if args.terms else None
+            rows = [[table[column] for column in columns] for table in store.tables(pattern, args.run)]
+        elif args.what == 'fields':
+            columns = ['field']
+            rows = [[field] for field in store.fields(args.terms[0], args.run)]
+        elif args.what == 'relationships':
+            columns = ['source_table', 'source_field', 'target_table', 'target_field',
+                       'relationship_type', 'occurrences', 'source_file']
+            field = args.terms[1] if len(args.terms) > 1 else None
+            rows = [[rel[column] for column in columns]
+                    for rel in store.relationships(args.terms[0], field, args.run)]
+        elif args.what == 'statements':
+            columns = ['namespace', 'sql_id', 'statement_type', 'file', 'line']
+            rows = [[statement[column] for column in columns]
+                    for statement in store.statements(args.terms[0], args.run)]
+        elif args.what == 'columns':
+            table, _, column = args.terms[0].partition('.')
+            if not column:
+                logger.error(f"Expected TABLE.COLUMN, got: {args.terms[0]}")
+                return 2
+            columns = ['role', 'namespace', 'sql_id', 'statement_type', 'file', 'line']
+            rows = [[usage[name] for name in columns]
+                    for usage in store.column_usages(table, column, run_id=args.run)]
+        else:
+            columns, rows = store.query(' '.join(args.terms))
+    except (LookupError, sqlite3.Error) as e:
+        logger.error(f"Query failed: {str(e)}")
+        return 2
+    finally:
+        store.close()
+    
+    print_rows(columns, rows)
+    return 0 if rows else 1
+
+
+def print_rows(columns, rows):
+    """
+    Print query results as an aligned text table.
+    
+    Args:
+        columns (list): Column names
+        rows (list): Row value lists
+    """
+    cells = [[str(value) if value is not None else '' for value in row] for row in rows]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+    
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)).rstrip())
+    print('  '.join('-' * width for width in widths))
+    for row in cells:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+    print(f"({len(rows)} row(s))")
+
+
+def run_diff(args, logger):
+    """
+    Compare two saved snapshots and print the differences.
+    
+    Args:
+        args (argparse.Namespace): Parsed arguments of the diff subcommand
+        logger (logging.Logger): Logger
+        
+    Returns:
+        int: Exit code (0 when the snapshots are identical, 1 otherwise)
+    """
+    snapshot_diff = SnapshotDiff()
+    
+    try:
+        snapshot_a = snapshot_diff.load_snapshot(args.old)
+        snapshot_b = snapshot_diff.load_snapshot(args.new)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading snapshot: {str(e)}")
+        return 2
+    
+    diff = snapshot_diff.diff(snapshot_a, snapshot_b)
+    print_diff(diff)
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, indent=2)
+        logger.info(f"Diff saved to: {args.save}")
+    
+    stats = diff['stats']
+    identical = not any(count for name, count in stats.items() if name != 'relationships_unchanged')
+    return 0 if identical else 1
+
+
+def print_diff(diff):
+    """
+    Print a snapshot diff in a readable form.
+    
+    Args:
+        diff (dict): Result of SnapshotDiff.diff
+    """
+    def describe(rel):
+        return (f"{rel['source_table']}.{rel['source_field']} = "
+                f"{rel['target_table']}.{rel['target_field']}")
+    
+    relationships = diff['relationships']
+    entities = diff['entities']
+    stats = diff['stats']
+    
+    print(f"Relationships: +{stats['relationships_added']} -{stats['relationships_removed']} "
+          f"~{stats['relationships_changed']} ({stats['relationships_unchanged']} unchanged)")
+    for rel in relationships['added']:
+        print(f"  + {describe(rel)} (x{rel['occurrences']})")
+    for rel in relationships['removed']:
+        print(f"  - {describe(rel)} (x{rel['occurrences']})")
+    for rel in relationships['changed']:
+        print(f"  ~ {describe(rel)} (x{rel['occurrences_before']} -> x{rel['occurrences_after']})")
+    
+    print(f"Entities: +{stats['entities_added']} -{stats['entities_removed']} ~{stats['entities_changed']}")
+    for name in entities['added']:
+        print(f"  + {name}")
+    for name in entities['removed']:
+        print(f"  - {name}")
+    for entity in entities['changed']:
+        changes = [f"+{field}" for field in entity['added_fields']]
+        changes += [f"-{field}" for field in entity['removed_fields']]
+        if entity['primary_key_before'] != entity['primary_key_after']:
+            changes.append(f"pk {entity['primary_key_before']} -> {entity['primary_key_after']}")
+        print(f"  ~ {entity['name']}: {', '.join(changes)}")
+
+
+def print_join_paths(source, target, paths):
+    """
+    Print join paths in a readable form.
+    
+    Args:
+        source (str): Start table
+        target (str): Destination table
+        paths (list): Join paths from GraphIndex.join_path
+    """
+    if not paths:
+        print(f"No join path found between {source} and {target}")
+        return
+    
+    for i, path in enumerate(paths, 1):
+        print(f"{i}. {' -> '.join(path['tables'])} (hops: {len(path['hops'])}, cost: {path['cost']})")
+        for hop in path['hops']:
+            join = hop['joins'][0]
+            alternatives = len(hop['joins']) - 1
+            line = (f"   {join['source_table']}.{join['source_field']} = "
+                    f"{join['target_table']}.{join['target_field']}")
+            if alternatives:
+                line += f"  (+{alternatives} other join column(s))"
+            print(line)
+
+
+def print_statements(table, statements):
+    """
+    Print the mapper statements referencing a table.
+    
+    Args:
+        table (str): Table name
+        statements (list): Statement metadata from StatementIndex.lookup
+    """
+    if not statements:
+        print(f"No statements reference {table}")
+        return
+    
+    print(f"{len(statements)} statement(s) reference {table}:")
+    for statement in statements:
+        statement_name = f"{statement['namespace']}.{statement['sql_id']}" if statement['namespace'] else statement['sql_id']
+        print(f"  [{statement['statement_type']}] {statement_name}  {statement['file']}:{statement['line']}")
+
+
+def print_column_usages(column, usages):
+    """
+    Print the statements using a column, grouped by role.
+    
+    Args:
+        column (str): Column as TABLE.COLUMN
+        usages (list): Usages from ColumnIndex.lookup
+    """
+    if not usages:
+        print(f"No statements use {column}")
+        return
+    
+    print(f"{len(usages)} use(s) of {column}:")
+    for role in ColumnIndex.ROLES:
+        for usage in usages:
+            if usage['role'] != role:
+                continue
+            statement_name = f"{usage['namespace']}.{usage['sql_id']}" if usage['namespace'] else usage['sql_id']
+            print(f"  {role:<9} [{usage['statement_type']}] {statement_name}  {usage['file']}:{usage['line']}")
+
+
+def print_search_hits(query, hits):
+    """
+    Print statements matching a search query.
+    
+    Args:
+        query (str): Search query
+        hits (list): Hits from TrigramIndex.search
+    """
+    if not hits:
+        print(f"No statements contain '{query}'")
+        return
+    
+    print(f"{len(hits)} statement(s) contain '{query}':")
+    for hit in hits:
+        statement_name = f"{hit['namespace']}.{hit['sql_id']}" if hit['namespace'] else hit['sql_id']
+        print(f"  {hit['file']}:{hit['line']}  {statement_name}")
+        print(f"      {hit['snippet']}")
+
+
 if __name__ == '__main__':
     sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Analysis Results module.
+Results dict whose PlantUML diagram text is generated on access.
+"""
+
+
+class AnalysisResults(dict):
+    """
+    Analysis results with a lazily generated 'diagram'.
+
+    Behaves like the plain results dict, but results['diagram'] joins the
+    diagram lines on every access instead of keeping the full text alive
+    for as long as the results are. Writers that can stream should use
+    Analyzer.iter_diagram() and never build the string at all.
+    """
+
+    def __init__(self, diagram_lines, *args, **kwargs):
+        """
+        Initialize the results.
+
+        Args:
+            diagram_lines (callable): Called with the results, returns the
+                diagram lines (e.g. Analyzer.iter_diagram)
+            *args, **kwargs: Result entries, as for dict()
+        """
+        super().__init__(*args, **kwargs)
+        self._diagram_lines = diagram_lines
+
+    def __missing__(self, key):
+        if key == 'diagram':
+            return '\n'.join(self._diagram_lines(self))
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key == 'diagram' or super().__contains__(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
@@ -2,11 +2,24 @@
 Main Analyzer module.
 Orchestrates the entire analysis process.
 """
+import json
 import logging
+from core.analysis_results import AnalysisResults
 from core.sql_parser import SqlParser
 from core.relationship_extractor import RelationshipExtractor
 from core.normalizer import Normalizer
 from core.plantuml_generator import PlantUmlGenerator
+from core.extraction_cache import ExtractionCache
+from core.statement_classifier import StatementClassifier
+from core.key_domains import KeyDomainIndex
+from core.graph_index import GraphIndex
+from core.partitioner import GraphPartitioner
+from core.centrality import CentralityAnalyzer
+from core.statement_index import StatementIndex
+from core.column_index import ColumnIndex
+from core.trigram_index import TrigramIndex
+from core.layout_engine import LayoutEngine
+from core.svg_renderer import SvgRenderer
 
 
 class Analyzer:
@@ -15,25 +28,36 @@ class Analyzer:
     Integrates SQL parsing, relationship extraction, and diagram generation.
     """
     
-    def __init__(self, max_depth=3):
+    def __init__(self, max_depth=3, cache_size=4096, hub_table_limit=20, layout_mode='auto'):
         """
         Initialize the analyzer.
         
         Args:
             max_depth (int): Maximum depth for nested query parsing
+            cache_size (int): Maximum number of statement fingerprints kept in the extraction cache
+            hub_table_limit (int): Number of top-ranked tables reported in stats['hub_tables']
+            layout_mode (str): ER diagram layout ('auto', 'force', 'layered' or 'grid')
         """
         self.logger = logging.getLogger(__name__)
         self.sql_parser = SqlParser(max_depth=max_depth)
         self.relationship_extractor = RelationshipExtractor()
         self.normalizer = Normalizer()
         self.plantuml_generator = PlantUmlGenerator()
+        self.extraction_cache = ExtractionCache(max_size=cache_size)
+        self.statement_classifier = StatementClassifier()
+        self.centrality_analyzer = CentralityAnalyzer()
+        self.hub_table_limit = hub_table_limit
+        self.layout_engine = LayoutEngine(mode=layout_mode)
+        self.svg_renderer = SvgRenderer()
     
-    def analyze_directory(self, directory_path):
+    def analyze_directory(self, directory_path, column_usages=False):
         """
         Analyze all MyBatis XML files in a directory.
         
         Args:
             directory_path (str): Path to directory containing MyBatis XML files
+            column_usages (bool): Also build the column usage index; without it
+                results['column_index'] is None
             
         Returns:
             dict: Analysis results
@@ -44,41 +68,453 @@ class Analyzer:
         sql_data = self.sql_parser.parse_directory(directory_path)
         self.logger.info(f"Found {len(sql_data)} SQL statements")
         
-        # Extract relationships
+        # Extract relationships: trivial statements skip the relationship
+        # extractor, and results are memoized by structural fingerprint.
+        # Every statement is recorded in the table -> statements index and,
+        # when requested, its column usages in the column index.
         all_relationships = []
+        table_index = StatementIndex()
+        column_index = ColumnIndex(table_index) if column_usages else None
+        search_index = TrigramIndex(table_index)
+        tier_counts = dict.fromkeys(StatementClassifier.TIERS, 0)
+        cache_hits = 0
+        cache_lookups = 0
         for data in sql_data:
-            relationships = self.relationship_extractor.extract_relationships(data)
+            tables = self.statement_classifier.table_references(data['sql'])
+            statement_id = table_index.add_statement(data, tables)
+            search_index.add(statement_id, data['sql'])
+            
+            tier = self.statement_classifier.classify(data['sql'])
+            tier_counts[tier] += 1
+            
+            relationships, usages, cache_hit = self._extract_statement(data, tier, tables, column_usages)
             all_relationships.extend(relationships)
+            if column_index is not None:
+                column_index.add_usages(statement_id, usages)
+            cache_lookups += 1
+            if cache_hit:
+                cache_hits += 1
         
-        self.logger.info(f"Extracted {len(all_relationships)} relationships")
+        self.logger.info(f"Extracted {len(all_relationships)} relationships "
+                         f"(tiers: {tier_counts}, {cache_hits}/{cache_lookups} extraction cache hits)")
         
         # Normalize relationships
         normalized_relationships = self.normalizer.normalize_relationships(all_relationships)
         
+        # Group transitively joined columns into key domains
+        key_domains = self._build_key_domains(normalized_relationships)
+        
         # Extract and merge entities
         entities = self.normalizer.extract_entities(normalized_relationships)
         entities = self.normalizer.resolve_primary_keys(entities, normalized_relationships)
         
         self.logger.info(f"Identified {len(entities)} entities")
         
-        # Generate PlantUML diagram
-        diagram = self.plantuml_generator.generate_diagram(entities, normalized_relationships)
-        optimized_diagram = self.plantuml_generator.optimize_layout(diagram)
+        # Rank join hubs by degree and PageRank
+        graph_index = GraphIndex(normalized_relationships)
+        table_rankings = self.centrality_analyzer.rank(graph_index)
         
-        # Prepare results
-        results = {
+        # Prepare results; the PlantUML text is generated when 'diagram' is read
+        results = AnalysisResults(self.iter_diagram, {
             'relationships': normalized_relationships,
             'entities': entities,
-            'diagram': optimized_diagram,
+            'key_domains': key_domains,
+            'graph_index': graph_index,
+            'table_rankings': table_rankings,
+            'table_index': table_index,
+            'column_index': column_index,
+            'search_index': search_index,
+            'layout': None,
             'stats': {
                 'total_sql_statements': len(sql_data),
+                'total_indexed_tables': len(table_index),
+                'total_indexed_columns': len(column_index) if column_index is not None else None,
                 'total_relationships': len(normalized_relationships),
-                'total_entities': len(entities)
+                'total_entities': len(entities),
+                'total_key_domains': len(key_domains),
+                'hub_tables': table_rankings[:self.hub_table_limit],
+                'extraction_tiers': tier_counts,
+                'extraction_cache': {
+                    'hits': cache_hits,
+                    'misses': cache_lookups - cache_hits,
+                    'hit_rate': round(cache_hits / cache_lookups, 4) if cache_lookups else 0.0,
+                    'size': self.extraction_cache.stats()['size']
+                }
             }
-        }
+        })
         
         return results
     
+    def focus(self, results, table, hops=2):
+        """
+        Restrict analysis results to the k-hop neighborhood of a table.
+        
+        Only the entities and relationships inside the neighborhood are kept
+        and the diagram is regenerated for that subgraph.
+        
+        Args:
+            results (dict): Analysis results
+            table (str): Table at the center of the focused diagram
+            hops (int): Maximum number of joins away from the table
+            
+        Returns:
+            dict: Results in the same shape as analyze_directory, or None if
+                the table is unknown
+        """
+        tables = self.get_graph_index(results).neighborhood(table, hops)
+        if not tables:
+            return None
+        
+        selected = set(tables)
+        relationships = [
+            rel for rel in results['relationships']
+            if rel['source_table'] in selected and rel['target_table'] in selected
+        ]
+        entities = {
+            name: entity for name, entity in results['entities'].items()
+            if name in selected
+        }
+        key_domains = self._build_key_domains(relationships)
+        
+        self.logger.info(f"Focused on {table} ({hops} hops): "
+                         f"{len(entities)} entities, {len(relationships)} relationships")
+        
+        graph_index = GraphIndex(relationships)
+        table_rankings = self.centrality_analyzer.rank(graph_index)
+        
+        stats = dict(results['stats'])
+        stats.update({
+            'total_relationships': len(relationships),
+            'total_entities': len(entities),
+            'total_key_domains': len(key_domains),
+            'hub_tables': table_rankings[:self.hub_table_limit],
+            'focus': {'table': table.lower(), 'hops': hops}
+        })
+        
+        return AnalysisResults(self.iter_diagram, {
+            'relationships': relationships,
+            'entities': entities,
+            'key_domains': key_domains,
+            'graph_index': graph_index,
+            'table_rankings': table_rankings,
+            'table_index': results.get('table_index'),
+            'column_index': results.get('column_index'),
+            'search_index': results.get('search_index'),
+            'layout': None,
+            'stats': stats
+        })
+    
+    def partition(self, results, max_size=40):
+        """
+        Split analysis results into size-bounded partitions with one diagram
+        each, plus an overview diagram of partition-to-partition edges.
+        
+        Args:
+            results (dict): Analysis results
+            max_size (int): Maximum number of tables per partition
+            
+        Returns:
+            dict: 'partitions' (id, tables, relationships, diagram),
+                'cross_edges' (relationship counts between partitions)
+                and 'overview' (PlantUML diagram code)
+        """
+        graph_index = self.get_graph_index(results)
+        partitioner = GraphPartitioner(max_size=max_size)
+        table_groups = partitioner.partition(graph_index)
+        
+        partition_of = {}
+        for index, tables in enumerate(table_groups):
+            for table in tables:
+                partition_of[table] = index
+        
+        grouped_relationships = [[] for _ in table_groups]
+        for rel in results['relationships']:
+            index = partition_of[rel['source_table']]
+            if partition_of[rel['target_table']] == index:
+                grouped_relationships[index].append(rel)
+        
+        partitions = []
+        for index, tables in enumerate(table_groups):
+            relationships = grouped_relationships[index]
+            entities = {table: results['entities'][table] for table in tables if table in results['entities']}
+            hub = max(tables, key=lambda table: (graph_index.degree(table), table))
+            
+            partitions.append({
+                'id': index + 1,
+                'name': f"partition_{index + 1}",
+                'hub': hub,
+                'tables': tables,
+                'relationships': relationships,
+                'diagram': self._build_diagram(entities, relationships, self._build_key_domains(relationships))
+            })
+        
+        cross_edges = [
+            {
+                'source': edge['source'] + 1,
+                'target': edge['target'] + 1,
+                'relationships': edge['relationships']
+            }
+            for edge in partitioner.cross_partition_edges(table_groups, results['relationships'])
+        ]
+        
+        return {
+            'partitions': partitions,
+            'cross_edges': cross_edges,
+            'overview': self.plantuml_generator.generate_overview_diagram(partitions, cross_edges)
+        }
+    
+    def get_graph_index(self, results):
+        """
+        Get the table graph index of analysis results, building it if needed.
+        
+        Args:
+            results (dict): Analysis results
+            
+        Returns:
+            GraphIndex: CSR index over the relationships
+        """
+        if results.get('graph_index') is None:
+            results['graph_index'] = GraphIndex(results['relationships'])
+        return results['graph_index']
+    
+    def get_layout(self, results):
+        """
+        Get the ER diagram layout, computing it on first use.
+        
+        Positions are sized for the native SVG renderer and cached in the
+        results, so they are computed once per analysis.
+        
+        Args:
+            results (dict): Analysis results
+            
+        Returns:
+            dict: Layout from LayoutEngine ('mode', 'positions', 'width', 'height')
+        """
+        if results.get('layout') is None:
+            entities = results['entities']
+            results['layout'] = self.layout_engine.layout(
+                entities, results['relationships'], self.svg_renderer.box_sizes(entities)
+            )
+        return results['layout']
+    
+    def load_results(self, path):
+        """
+        Load analysis results saved as JSON (Exporter.export_json / --json).
+        
+        The statement, column and SQL search indexes are restored from
+        their saved form, so impact, column and search lookups answer
+        without parsing the mapper files again.
+        
+        Args:
+            path (str): Saved analysis_results.json
+            
+        Returns:
+            AnalysisResults: Results with the restored indexes (None for
+                indexes the file does not contain)
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        entities = {
+            entity['name']: {'fields': entity['fields'], 'primary_key': entity['primary_key']}
+            for entity in data['entities']
+        }
+        
+        table_index = column_index = search_index = None
+        if data.get('table_index') is not None:
+            table_index = StatementIndex.from_dict(data['table_index'])
+        if data.get('column_index') is not None:
+            column_index = ColumnIndex.from_dict(data['column_index'], table_index)
+        if data.get('search_index') is not None:
+            search_index = TrigramIndex.from_dict(data['search_index'], table_index)
+        
+        self.logger.info(f"Loaded {len(entities)} entities and {len(data['relationships'])} "
+                         f"relationships from {path}")
+        
+        return AnalysisResults(self.iter_diagram, {
+            'relationships': data['relationships'],
+            'entities': entities,
+            'key_domains': data.get('key_domains', []),
+            'graph_index': None,
+            'table_rankings': data.get('table_rankings', []),
+            'table_index': table_index,
+            'column_index': column_index,
+            'search_index': search_index,
+            'layout': data.get('layout'),
+            'stats': data.get('stats', {})
+        })
+    
+    def find_join_paths(self, results, source_table, target_table, k=3):
+        """
+        Find the k shortest join paths between two tables.
+        
+        Args:
+            results (dict): Analysis results
+            source_table (str): Table to start from
+            target_table (str): Table to reach
+            k (int): Maximum number of paths
+            
+        Returns:
+            list: Join paths with the join columns for each hop
+        """
+        return self.get_graph_index(results).join_path(source_table, target_table, k)
+    
+    def find_statements(self, results, table):
+        """
+        Find every mapper statement that references a table (impact analysis).
+        
+        Args:
+            results (dict): Analysis results
+            table (str): Table name
+            
+        Returns:
+            list: Statement metadata (namespace, sql_id, statement_type, file, line)
+        """
+        table_index = results.get('table_index')
+        if table_index is None:
+            return []
+        return table_index.lookup(table)
+    
+    def find_column_usages(self, results, table, column, roles=None):
+        """
+        Find every statement that joins, filters, sorts or groups on a column.
+        
+        Args:
+            results (dict): Analysis results
+            table (str): Table name
+            column (str): Column name
+            roles (iterable): Only return these roles (default: all)
+            
+        Returns:
+            list: Statement metadata with the 'role' of each use
+        """
+        column_index = results.get('column_index')
+        if column_index is None:
+            return []
+        return column_index.lookup(table, column, roles)
+    
+    def search_statements(self, results, query, limit=50):
+        """
+        Find the statements whose SQL contains a text fragment.
+        
+        Args:
+            results (dict): Analysis results
+            query (str): Fragment to search (case and whitespace insensitive)
+            limit (int): Maximum number of hits
+            
+        Returns:
+            list: Statement metadata with a snippet around each match
+        """
+        search_index = results.get('search_index')
+        if search_index is None:
+            return []
+        return search_index.search(query, limit)
+    
+    def _build_key_domains(self, relationships):
+        """
+        Group transitively joined columns into key domains.
+        
+        Args:
+            relationships (list): Normalized relationships
+            
+        Returns:
+            list: Key domain classes
+        """
+        key_domain_index = KeyDomainIndex()
+        key_domain_index.add_relationships(relationships)
+        return key_domain_index.classes()
+    
+    def _build_diagram(self, entities, relationships, key_domains):
+        """
+        Generate the layout-optimized PlantUML diagram.
+        
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+            key_domains (list): Key domain classes
+            
+        Returns:
+            str: PlantUML diagram code
+        """
+        return '\n'.join(self.plantuml_generator.iter_diagram(entities, relationships, key_domains, optimize=True))
+    
+    def _extract_statement(self, data, tier=StatementClassifier.TIER_FULL, tables=None, column_usages=False):
+        """
+        Extract relationships (and optionally column usages) from one
+        statement, reusing cached results for structurally identical statements.
+        
+        Args:
+            data (dict): SQL data from the parser
+            tier (str): Extraction tier assigned by the StatementClassifier
+            tables (list): Tables referenced by the statement
+            column_usages (bool): Also extract the column usages
+            
+        Returns:
+            tuple: (list of relationships, list of column usages, whether the cache was hit)
+        """
+        fingerprint = data.get('fingerprint')
+        
+        if fingerprint:
+            cached = self.extraction_cache.lookup(fingerprint)
+            if cached is not None:
+                relationships, usages = cached
+                relationships = [dict(rel, source_file=self.relationship_extractor.get_file_info(data))
+                                 for rel in relationships]
+                if usages is None and column_usages:
+                    # Cached by a run that did not need column usages
+                    usages = self._extract_column_usages(data, tables)
+                    self.extraction_cache.put(fingerprint, cached[0], usages)
+                return relationships, list(usages) if column_usages else [], True
+        
+        if tier == StatementClassifier.TIER_SKIP:
+            relationships = []
+        elif tier == StatementClassifier.TIER_SIMPLE:
+            relationships = self.relationship_extractor.extract_simple_relationships(data)
+        else:
+            relationships = self.relationship_extractor.extract_relationships(data)
+        
+        # 字段使用提取比分级判断慢一个数量级，只在需要时执行
+        usages = self._extract_column_usages(data, tables) if column_usages else None
+        
+        if fingerprint:
+            self.extraction_cache.put(fingerprint, relationships, usages)
+        
+        return relationships, usages or [], False
+    
+    def _extract_column_usages(self, data, tables):
+        """
+        Extract the column usages of one statement.
+        
+        Args:
+            data (dict): SQL data from the parser
+            tables (list): Tables referenced by the statement
+            
+        Returns:
+            list: Unique (table, column, role) tuples
+        """
+        # Unqualified columns can only be attributed in single-table statements
+        distinct_tables = set(tables or [])
+        default_table = distinct_tables.pop() if len(distinct_tables) == 1 else None
+        return self.relationship_extractor.extract_column_usages(data['sql'], default_table)
+    
+    def iter_diagram(self, results):
+        """
+        Stream the layout-optimized PlantUML diagram of analysis results.
+        
+        Produces the text of results['diagram'] line by line, reusing
+        cached entity blocks, so large diagrams can be written to a file or
+        socket without building the whole string.
+        
+        Args:
+            results (dict): Analysis results
+            
+        Returns:
+            generator: Diagram lines
+        """
+        return self.plantuml_generator.iter_diagram(
+            results['entities'], results['relationships'], results.get('key_domains'), optimize=True
+        )
+    
     def get_table_list(self, results):
         """
         Get a list of tables from analysis results.
@@ -0,0 +1,386 @@
+"""
+Binary Snapshot module.
+Columnar, memory-mappable snapshot format for saved analysis results.
+"""
+import sys
+import json
+import mmap
+import struct
+import logging
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+class BinarySnapshot(Mapping):
+    """
+    Analysis results stored as a string table plus integer columns.
+
+    File layout (little-endian):
+
+        magic (8 bytes), section count (u32), reserved (u32)
+        section table: name (8 bytes), offset (u64), length (u64) per section
+        sections, each 8-byte aligned
+
+    Every table, field, relationship type and source file name is stored
+    once in the string table ('str_off' offsets into the UTF-8 'str_data').
+    Relationships are parallel u32 columns of string ids ('rel_st', 'rel_sf',
+    'rel_tt', 'rel_tf', 'rel_ty', 'rel_ev') plus occurrences and flags;
+    entities are name and primary key columns with field lists in
+    'ent_fo'/'ent_fl'. Stats, rankings, key domains and layout are a small
+    JSON 'meta' section.
+
+    A snapshot opened from a file is memory-mapped: columns are memoryviews
+    over the mapping, strings are decoded and relationship dicts built only
+    when accessed. The object behaves like the results dict for the keys
+    'entities', 'relationships', 'stats', 'key_domains', 'table_rankings'
+    and 'layout'.
+    """
+
+    MAGIC = b'MBSNAP\x00\x01'
+    HEADER = struct.Struct('<8sII')
+    SECTION = struct.Struct('<8sQQ')
+    FLAG_POTENTIAL_FK = 1
+    NONE = 0xFFFFFFFF
+
+    RELATIONSHIP_COLUMNS = ('rel_st', 'rel_sf', 'rel_tt', 'rel_tf', 'rel_ty', 'rel_ev', 'rel_oc', 'rel_fl')
+    META_KEYS = ('stats', 'key_domains', 'table_rankings', 'layout')
+
+    def __init__(self, buffer, path=None):
+        """
+        Open a snapshot held in a buffer.
+
+        Args:
+            buffer (bytes, mmap.mmap): Snapshot file contents
+            path (str): File the buffer was read from (optional)
+
+        Raises:
+            ValueError: If the buffer is not a binary snapshot
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._exports = []
+
+        magic, count, _ = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not a binary snapshot: {path or 'buffer'}")
+
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = self.SECTION.unpack_from(buffer, self.HEADER.size + i * self.SECTION.size)
+            self._sections[name.rstrip(b'\0').decode('ascii')] = (offset, length)
+
+        self._meta = None
+        self.strings = StringTable(self._bytes('str_data'), self._column('str_off'))
+        self.relationships = RelationshipColumns(self)
+        self.entities = EntityColumns(self)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Memory-map a snapshot file.
+
+        Args:
+            path (str): Snapshot file
+
+        Returns:
+            BinarySnapshot: Snapshot backed by the mapping
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, path)
+
+    @classmethod
+    def is_snapshot(cls, path):
+        """
+        Check whether a file is a binary snapshot.
+
+        Args:
+            path (str): File to check
+
+        Returns:
+            bool: True if the file starts with the snapshot magic
+        """
+        with open(path, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    @classmethod
+    def write(cls, path, results):
+        """
+        Write analysis results as a binary snapshot.
+
+        Args:
+            path (str): Output file
+            results (dict): Analysis results (or another snapshot)
+
+        Returns:
+            int: Bytes written
+        """
+        strings = []
+        string_ids = {}
+
+        def intern(value):
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        columns = {name: array('I') for name in cls.RELATIONSHIP_COLUMNS}
+        for rel in results['relationships']:
+            columns['rel_st'].append(intern(rel['source_table']))
+            columns['rel_sf'].append(intern(rel['source_field']))
+            columns['rel_tt'].append(intern(rel['target_table']))
+            columns['rel_tf'].append(intern(rel['target_field']))
+            columns['rel_ty'].append(intern(rel.get('relationship_type', '')))
+            columns['rel_ev'].append(intern(rel.get('source_file', '')))
+            columns['rel_oc'].append(rel.get('occurrences', 1))
+            columns['rel_fl'].append(cls.FLAG_POTENTIAL_FK if rel.get('is_potential_fk') else 0)
+
+        entity_names = array('I')
+        entity_keys = array('I')
+        field_offsets = array('I', [0])
+        field_ids = array('I')
+        for name, entity in results['entities'].items():
+            entity_names.append(intern(name))
+            primary_key = entity.get('primary_key')
+            entity_keys.append(cls.NONE if primary_key is None else intern(primary_key))
+            field_ids.extend(intern(field) for field in entity['fields'])
+            field_offsets.append(len(field_ids))
+
+        string_offsets = array('I', [0])
+        string_data = bytearray()
+        for value in strings:
+            string_data += value.encode('utf-8')
+            string_offsets.append(len(string_data))
+
+        meta = {key: results.get(key) for key in cls.META_KEYS if results.get(key) is not None}
+
+        sections = [('str_off', string_offsets), ('str_data', bytes(string_data))]
+        sections += [(name, columns[name]) for name in cls.RELATIONSHIP_COLUMNS]
+        sections += [('ent_name', entity_names), ('ent_pk', entity_keys),
+                     ('ent_fo', field_offsets), ('ent_fl', field_ids),
+                     ('meta', json.dumps(meta, separators=(',', ':')).encode('utf-8'))]
+
+        payloads = []
+        for name, data in sections:
+            if isinstance(data, array):
+                if sys.byteorder != 'little':
+                    data = array(data.typecode, data)
+                    data.byteswap()
+                data = data.tobytes()
+            payloads.append((name, data))
+
+        offset = cls.HEADER.size + cls.SECTION.size * len(payloads)
+        table = []
+        for name, data in payloads:
+            offset += -offset % 8
+            table.append(cls.SECTION.pack(name.encode('ascii'), offset, len(data)))
+            offset += len(data)
+
+        with open(path, 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(payloads), 0))
+            f.write(b''.join(table))
+            position = cls.HEADER.size + cls.SECTION.size * len(payloads)
+            for name, data in payloads:
+                f.write(b'\0' * (-position % 8))
+                position += -position % 8
+                f.write(data)
+                position += len(data)
+
+        return position
+
+    def close(self):
+        """Release the memory mapping."""
+        self.strings = None
+        self.relationships = None
+        self.entities = None
+        # 映射只有在所有派生 memoryview 释放后才能关闭
+        for view in reversed(self._exports):
+            view.release()
+        self._exports = []
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getitem__(self, key):
+        if key == 'relationships':
+            return self.relationships
+        if key == 'entities':
+            return self.entities
+        if key in self.META_KEYS and key in self.meta:
+            return self.meta[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'entities'
+        yield 'relationships'
+        yield from (key for key in self.META_KEYS if key in self.meta)
+
+    def __len__(self):
+        return 2 + sum(1 for key in self.META_KEYS if key in self.meta)
+
+    @property
+    def meta(self):
+        """
+        Decoded 'meta' section (stats, rankings, key domains, layout).
+
+        Returns:
+            dict: Meta values
+        """
+        if self._meta is None:
+            self._meta = json.loads(self._bytes('meta').tobytes().decode('utf-8'))
+        return self._meta
+
+    def column(self, name):
+        """
+        Get an integer column.
+
+        Args:
+            name (str): Section name (e.g. 'rel_st')
+
+        Returns:
+            memoryview or array: u32 values
+        """
+        return self._column(name)
+
+    def _bytes(self, name):
+        """Get the raw bytes of a section as a memoryview."""
+        offset, length = self._sections[name]
+        view = self._view[offset:offset + length]
+        self._exports.append(view)
+        return view
+
+    def _column(self, name):
+        """Get a u32 section without copying it (copied on big-endian hosts)."""
+        raw = self._bytes(name)
+        if sys.byteorder == 'little':
+            view = raw.cast('I')
+            self._exports.append(view)
+            return view
+        values = array('I', raw.tobytes())
+        values.byteswap()
+        return values
+
+
+class StringTable(Sequence):
+    """String table of a snapshot; entries are decoded on first access."""
+
+    def __init__(self, data, offsets):
+        self._data = data
+        self._offsets = offsets
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, string_id):
+        value = self._cache.get(string_id)
+        if value is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            value = self._cache[string_id] = str(self._data[start:end], 'utf-8')
+        return value
+
+
+class RelationshipColumns(Sequence):
+    """Relationships of a snapshot; each dict is built when accessed."""
+
+    def __init__(self, snapshot):
+        self.strings = snapshot.strings
+        self._columns = [snapshot.column(name) for name in BinarySnapshot.RELATIONSHIP_COLUMNS]
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._build(*(column[index] for column in self._columns))
+
+    def __iter__(self):
+        for row in zip(*self._columns):
+            yield self._build(*row)
+
+    def rows(self, *names):
+        """
+        Iterate raw column values without building dicts.
+
+        Args:
+            *names (str): Column names from BinarySnapshot.RELATIONSHIP_COLUMNS
+
+        Yields:
+            tuple: Values of the requested columns per relationship
+                (string ids for the name columns)
+        """
+        columns = [self._columns[BinarySnapshot.RELATIONSHIP_COLUMNS.index(name)] for name in names]
+        return zip(*columns)
+
+    def _build(self, source_table, source_field, target_table, target_field, rel_type, evidence,
+               occurrences, flags):
+        strings = self.strings
+        rel = {
+            'source_table': strings[source_table],
+            'source_field': strings[source_field],
+            'target_table': strings[target_table],
+            'target_field': strings[target_field],
+            'relationship_type': strings[rel_type],
+            'source_file': strings[evidence],
+            'occurrences': occurrences
+        }
+        if flags & BinarySnapshot.FLAG_POTENTIAL_FK:
+            rel['is_potential_fk'] = True
+        return rel
+
+
+class EntityColumns(Mapping):
+    """Entities of a snapshot (name -> entity); built when accessed."""
+
+    def __init__(self, snapshot):
+        self._strings = snapshot.strings
+        self._names = snapshot.column('ent_name')
+        self._keys = snapshot.column('ent_pk')
+        self._field_offsets = snapshot.column('ent_fo')
+        self._field_ids = snapshot.column('ent_fl')
+        self._index = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        strings = self._strings
+        return (strings[string_id] for string_id in self._names)
+
+    def __getitem__(self, name):
+        if self._index is None:
+            self._index = {entity_name: i for i, entity_name in enumerate(self)}
+        return self.entity(self._index[name])
+
+    def entity(self, i):
+        """
+        Build the entity at a position.
+
+        Args:
+            i (int): Entity position
+
+        Returns:
+            dict: 'fields' and 'primary_key'
+        """
+        strings = self._strings
+        primary_key = self._keys[i]
+        fields = self._field_ids[self._field_offsets[i]:self._field_offsets[i + 1]]
+        return {
+            'fields': [strings[string_id] for string_id in fields],
+            'primary_key': None if primary_key == BinarySnapshot.NONE else strings[primary_key]
+        }
+
+    def items(self):
+        """Iterate (name, entity) pairs in snapshot order without a name index."""
+        return ((name, self.entity(i)) for i, name in enumerate(self))
+
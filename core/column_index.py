@@ -0,0 +1,211 @@
+"""
+Column Index module.
+Postings index from (table, column) to the statements and predicate roles using it.
+"""
+import logging
+from array import array
+
+
+class ColumnIndex:
+    """
+    Column usage index for index planning.
+
+    Each (table, column) key owns two parallel arrays: the ids of the
+    statements using the column (see StatementIndex) and the role codes
+    of each use, so the index stays compact for large mapper sets.
+    """
+
+    ROLE_JOIN_ON = 'JOIN_ON'
+    ROLE_WHERE_EQ = 'WHERE_EQ'
+    ROLE_RANGE = 'RANGE'
+    ROLE_ORDER_BY = 'ORDER_BY'
+    ROLE_GROUP_BY = 'GROUP_BY'
+
+    ROLES = (ROLE_JOIN_ON, ROLE_WHERE_EQ, ROLE_RANGE, ROLE_ORDER_BY, ROLE_GROUP_BY)
+
+    def __init__(self, statement_index=None):
+        """
+        Initialize an empty column index.
+
+        Args:
+            statement_index (StatementIndex): Index resolving statement ids to
+                statement metadata
+        """
+        self.logger = logging.getLogger(__name__)
+        self.statement_index = statement_index
+        self._role_codes = {role: code for code, role in enumerate(self.ROLES)}
+        self._postings = {}
+
+    def __contains__(self, key):
+        return self._key(*key) in self._postings
+
+    def __len__(self):
+        return len(self._postings)
+
+    def add_usage(self, statement_id, table, column, role):
+        """
+        Record that a statement uses a column in a role.
+
+        Args:
+            statement_id (int): Statement id
+            table (str): Table name
+            column (str): Column name
+            role (str): One of ROLES
+        """
+        key = self._key(table, column)
+        code = self._role_codes[role]
+
+        postings = self._postings.get(key)
+        if postings is None:
+            postings = self._postings[key] = (array('l'), array('b'))
+
+        statement_ids, role_codes = postings
+        # Statements are added in order, so a duplicate can only be at the end
+        for i in range(len(statement_ids) - 1, -1, -1):
+            if statement_ids[i] != statement_id:
+                break
+            if role_codes[i] == code:
+                return
+
+        statement_ids.append(statement_id)
+        role_codes.append(code)
+
+    def add_usages(self, statement_id, usages):
+        """
+        Record all column usages of a statement.
+
+        Args:
+            statement_id (int): Statement id
+            usages (iterable): (table, column, role) tuples
+        """
+        for table, column, role in usages:
+            self.add_usage(statement_id, table, column, role)
+
+    def lookup(self, table, column, roles=None):
+        """
+        Get every statement using a column.
+
+        Args:
+            table (str): Table name
+            column (str): Column name
+            roles (iterable): Only return these roles (default: all)
+
+        Returns:
+            list: Dicts with 'role' and the statement metadata (or
+                'statement_id' when no StatementIndex is attached)
+        """
+        postings = self._postings.get(self._key(table, column))
+        if postings is None:
+            return []
+
+        wanted = set(roles) if roles else None
+        usages = []
+        for statement_id, code in zip(*postings):
+            role = self.ROLES[code]
+            if wanted is not None and role not in wanted:
+                continue
+            usages.append(self._describe(statement_id, role))
+
+        return usages
+
+    def summary(self, table=None):
+        """
+        Count the uses of every column per role.
+
+        Args:
+            table (str): Only summarize columns of this table (default: all)
+
+        Returns:
+            list: Dicts with 'table', 'column', one count per role and 'total',
+                most used columns first
+        """
+        rows = []
+        for key, (statement_ids, role_codes) in self._postings.items():
+            key_table, column = key.split('.', 1)
+            if table is not None and key_table != table.lower():
+                continue
+
+            row = {'table': key_table, 'column': column}
+            row.update(dict.fromkeys(self.ROLES, 0))
+            for code in role_codes:
+                row[self.ROLES[code]] += 1
+            row['total'] = len(role_codes)
+            rows.append(row)
+
+        rows.sort(key=lambda row: (-row['total'], row['table'], row['column']))
+        return rows
+
+    def rows(self):
+        """
+        Iterate over all postings as flat rows.
+
+        Yields:
+            tuple: (table, column, role, statement metadata dict)
+        """
+        for key in sorted(self._postings):
+            table, column = key.split('.', 1)
+            for statement_id, code in zip(*self._postings[key]):
+                yield table, column, self.ROLES[code], self._describe(statement_id, self.ROLES[code])
+
+    def to_dict(self):
+        """
+        Convert the index into a JSON-serializable dictionary.
+
+        Returns:
+            dict: 'roles' and 'columns' ("table.column" -> [[statement_id, role_code], ...])
+        """
+        return {
+            'roles': list(self.ROLES),
+            'columns': {
+                key: [[statement_id, code] for statement_id, code in zip(*self._postings[key])]
+                for key in sorted(self._postings)
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data, statement_index=None):
+        """
+        Restore an index saved with to_dict().
+
+        Args:
+            data (dict): Serialized index
+            statement_index (StatementIndex): Index resolving statement ids
+
+        Returns:
+            ColumnIndex: Restored index
+        """
+        index = cls(statement_index)
+        roles = data.get('roles', cls.ROLES)
+        for key, postings in data.get('columns', {}).items():
+            table, column = key.split('.', 1)
+            for statement_id, code in postings:
+                index.add_usage(statement_id, table, column, roles[code])
+        return index
+
+    def _describe(self, statement_id, role):
+        """
+        Build the lookup result for one posting.
+
+        Args:
+            statement_id (int): Statement id
+            role (str): Role of the use
+
+        Returns:
+            dict: Role plus statement metadata
+        """
+        if self.statement_index is None:
+            return {'role': role, 'statement_id': statement_id}
+        return dict(self.statement_index.statement(statement_id), role=role)
+
+    def _key(self, table, column):
+        """
+        Build the postings key of a column.
+
+        Args:
+            table (str): Table name
+            column (str): Column name
+
+        Returns:
+            str: Lower-cased "table.column"
+        """
+        return f"{table.lower()}.{column.lower()}"
@@ -0,0 +1,114 @@
+"""
+Extraction Cache module.
+Memoizes relationship extraction results by statement fingerprint.
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+
+class ExtractionCache:
+    """
+    Bounded LRU cache for relationship extraction results.
+    Keyed by the structural fingerprint computed by SqlParser; each entry
+    holds the extracted relationships and the column usages of a statement.
+    """
+
+    def __init__(self, max_size=4096):
+        """
+        Initialize the extraction cache.
+
+        Args:
+            max_size (int): Maximum number of fingerprints to keep
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        """
+        Look up cached relationships.
+
+        Args:
+            fingerprint (str): Statement fingerprint
+
+        Returns:
+            tuple: Cached relationship dicts (without source_file), or None on a miss
+        """
+        entry = self.lookup(fingerprint)
+        return None if entry is None else entry[0]
+
+    def lookup(self, fingerprint):
+        """
+        Look up cached extraction results.
+
+        Args:
+            fingerprint (str): Statement fingerprint
+
+        Returns:
+            tuple: (relationship dicts without source_file, column usage
+                tuples or None if they were not extracted), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return entry
+
+    def put(self, fingerprint, relationships, column_usages=()):
+        """
+        Store extraction results for a fingerprint.
+
+        Args:
+            fingerprint (str): Statement fingerprint
+            relationships (list): Extracted relationship dicts
+            column_usages (list): (table, column, role) tuples, or None if
+                they were not extracted
+        """
+        # source_file 因语句而异，缓存中只保留结构相关的字段
+        entry = (
+            tuple(
+                {key: value for key, value in rel.items() if key != 'source_file'}
+                for rel in relationships
+            ),
+            None if column_usages is None else tuple(column_usages)
+        )
+
+        with self._lock:
+            self._entries[fingerprint] = entry
+            self._entries.move_to_end(fingerprint)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit rate and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size
+            }
@@ -0,0 +1,353 @@
+"""
+Graph Index module.
+Compact CSR adjacency index over table relationships with join-path queries.
+"""
+import heapq
+import logging
+from array import array
+
+
+class GraphIndex:
+    """
+    Undirected table graph in compressed sparse row (CSR) form.
+
+    Tables are mapped to integer node ids. For node i, its neighbours are
+    indices[indptr[i]:indptr[i + 1]], with the matching occurrence weights
+    in weights[] and the undirected edge ids in edge_ids[]; the join columns
+    of an edge are in edge_joins[edge_id].
+    """
+
+    def __init__(self, relationships):
+        """
+        Build the index from normalized relationships.
+
+        Args:
+            relationships (list): Normalized relationship dictionaries
+        """
+        self.logger = logging.getLogger(__name__)
+
+        tables = set()
+        for rel in relationships:
+            tables.add(rel['source_table'])
+            tables.add(rel['target_table'])
+
+        self.tables = sorted(tables)
+        self.node_ids = {table: i for i, table in enumerate(self.tables)}
+
+        # Aggregate all join columns between the same pair of tables
+        pair_edges = {}
+        for rel in relationships:
+            u = self.node_ids[rel['source_table']]
+            v = self.node_ids[rel['target_table']]
+            if u == v:
+                continue  # self-joins never help a join path
+
+            key = (u, v) if u < v else (v, u)
+            pair_edges.setdefault(key, []).append({
+                'source_table': rel['source_table'],
+                'source_field': rel['source_field'],
+                'target_table': rel['target_table'],
+                'target_field': rel['target_field'],
+                'occurrences': rel.get('occurrences', 1)
+            })
+
+        # Join columns per undirected edge, most frequent first
+        self.edge_joins = []
+        edge_weights = []
+        adjacency = [[] for _ in self.tables]
+        for (u, v), joins in sorted(pair_edges.items()):
+            joins.sort(key=lambda j: -j['occurrences'])
+            edge_id = len(self.edge_joins)
+            self.edge_joins.append(joins)
+            edge_weights.append(sum(j['occurrences'] for j in joins))
+            adjacency[u].append((v, edge_id))
+            adjacency[v].append((u, edge_id))
+
+        self.edge_weights = array('d', edge_weights)
+
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        self.edge_ids = array('l')
+        self.weights = array('d')
+        for neighbours in adjacency:
+            for neighbour, edge_id in neighbours:
+                self.indices.append(neighbour)
+                self.edge_ids.append(edge_id)
+                self.weights.append(edge_weights[edge_id])
+            self.indptr.append(len(self.indices))
+
+        # Traversal cost per CSR entry, see edge_cost()
+        self.costs = array('d', (1.0 + 1.0 / (1.0 + w) for w in self.weights))
+
+    def __contains__(self, table):
+        return table in self.node_ids
+
+    def __len__(self):
+        return len(self.tables)
+
+    @property
+    def edge_count(self):
+        """int: Number of undirected edges."""
+        return len(self.edge_joins)
+
+    def degree(self, table):
+        """
+        Get the number of tables directly joined to a table.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            int: Node degree, 0 for unknown tables
+        """
+        node = self.node_ids.get(table)
+        if node is None:
+            return 0
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def neighbors(self, table):
+        """
+        Get the tables directly joined to a table.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            list: Neighbouring table names
+        """
+        node = self.node_ids.get(table)
+        if node is None:
+            return []
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return [self.tables[i] for i in self.indices[start:end]]
+
+    def neighborhood(self, table, hops=1):
+        """
+        Get all tables within a number of joins of a table (breadth-first).
+
+        Args:
+            table (str): Table at the center of the neighborhood
+            hops (int): Maximum number of joins away from the center
+
+        Returns:
+            list: Table names ordered by distance, center first; empty for unknown tables
+        """
+        center = self.node_ids.get(table.lower())
+        if center is None:
+            return []
+
+        indptr, indices = self.indptr, self.indices
+        visited = {center}
+        order = [center]
+        frontier = [center]
+
+        for _ in range(max(0, hops)):
+            next_frontier = []
+            for node in frontier:
+                for neighbour in indices[indptr[node]:indptr[node + 1]]:
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        order.append(neighbour)
+                        next_frontier.append(neighbour)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return [self.tables[node] for node in order]
+
+    def edge_cost(self, edge_id):
+        """
+        Get the traversal cost of an edge.
+
+        Every hop costs at least 1 so fewer hops always win; frequently
+        used joins are slightly cheaper than rare ones.
+
+        Args:
+            edge_id (int): Undirected edge id
+
+        Returns:
+            float: Edge cost in (1, 1.5]
+        """
+        return 1.0 + 1.0 / (1.0 + self.edge_weights[edge_id])
+
+    def join_path(self, source, target, k=1):
+        """
+        Find the k shortest join paths between two tables (Yen's algorithm).
+
+        Args:
+            source (str): Start table
+            target (str): Destination table
+            k (int): Maximum number of paths to return
+
+        Returns:
+            list: Paths ordered by cost, each a dict with 'tables', 'cost'
+                and 'hops' (from/to tables and the join columns per hop)
+        """
+        source = source.lower()
+        target = target.lower()
+
+        if source not in self.node_ids or target not in self.node_ids:
+            self.logger.warning(f"Unknown table in join path query: {source} -> {target}")
+            return []
+
+        start = self.node_ids[source]
+        goal = self.node_ids[target]
+
+        if start == goal:
+            return [self._describe_path([start], [])]
+
+        # Exact distances to the goal: an admissible A* heuristic for every
+        # spur search below, since banning nodes/edges only makes paths longer
+        heuristic = self._distances_to(goal)
+        if heuristic[start] == float('inf'):
+            return []
+
+        first = self._search(start, goal, set(), set(), heuristic)
+
+        found = [first]
+        candidates = []
+        seen = {tuple(first[1])}
+
+        while len(found) < k:
+            _, prev_nodes, prev_edges = found[-1]
+
+            for i in range(len(prev_nodes) - 1):
+                spur = prev_nodes[i]
+                root_nodes = prev_nodes[:i + 1]
+
+                banned_edges = set()
+                for _, nodes, edges in found:
+                    if nodes[:i + 1] == root_nodes:
+                        banned_edges.add(edges[i])
+                banned_nodes = set(root_nodes[:-1])
+
+                spur_path = self._search(spur, goal, banned_nodes, banned_edges, heuristic)
+                if spur_path is None:
+                    continue
+
+                nodes = root_nodes[:-1] + spur_path[1]
+                if tuple(nodes) in seen:
+                    continue
+                seen.add(tuple(nodes))
+
+                edges = prev_edges[:i] + spur_path[2]
+                cost = sum(self.edge_cost(e) for e in edges)
+                heapq.heappush(candidates, (cost, nodes, edges))
+
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+
+        return [self._describe_path(nodes, edges) for _, nodes, edges in found]
+
+    def _distances_to(self, goal):
+        """
+        Single-source Dijkstra from a node over the whole graph.
+
+        Args:
+            goal (int): Node id
+
+        Returns:
+            list: Shortest distance from every node to goal (inf if unreachable)
+        """
+        indptr, indices, costs = self.indptr, self.indices, self.costs
+
+        dist = [float('inf')] * len(self.tables)
+        dist[goal] = 0.0
+        heap = [(0.0, goal)]
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if cost > dist[node]:
+                continue
+
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[position]
+                new_cost = cost + costs[position]
+                if new_cost < dist[neighbour]:
+                    dist[neighbour] = new_cost
+                    heapq.heappush(heap, (new_cost, neighbour))
+
+        return dist
+
+    def _search(self, start, goal, banned_nodes, banned_edges, heuristic):
+        """
+        A* shortest path between two nodes avoiding banned nodes/edges.
+
+        Args:
+            start (int): Start node id
+            goal (int): Goal node id
+            banned_nodes (set): Node ids that may not be visited
+            banned_edges (set): Undirected edge ids that may not be used
+            heuristic (list): Lower bound of the distance from each node to goal
+
+        Returns:
+            tuple: (cost, node ids, edge ids of traversed edges) or None
+        """
+        indptr, indices, edge_ids, costs = self.indptr, self.indices, self.edge_ids, self.costs
+        infinity = float('inf')
+
+        dist = {start: 0.0}
+        parent = {}
+        heap = [(heuristic[start], start)]
+
+        while heap:
+            estimate, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            cost = dist[node]
+            if estimate > cost + heuristic[node]:
+                continue
+
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[position]
+                if neighbour in banned_nodes or heuristic[neighbour] == infinity:
+                    continue
+                edge_id = edge_ids[position]
+                if edge_id in banned_edges:
+                    continue
+
+                new_cost = cost + costs[position]
+                if new_cost < dist.get(neighbour, infinity):
+                    dist[neighbour] = new_cost
+                    parent[neighbour] = (node, edge_id)
+                    heapq.heappush(heap, (new_cost + heuristic[neighbour], neighbour))
+
+        if goal not in dist:
+            return None
+
+        nodes = [goal]
+        edges = []
+        while nodes[-1] != start:
+            node, edge_id = parent[nodes[-1]]
+            nodes.append(node)
+            edges.append(edge_id)
+        nodes.reverse()
+        edges.reverse()
+
+        return dist[goal], nodes, edges
+
+    def _describe_path(self, nodes, edges):
+        """
+        Convert node/edge ids into a JSON-serializable path description.
+
+        Args:
+            nodes (list): Node ids along the path
+            edges (list): Edge ids along the path
+
+        Returns:
+            dict: Path with table names, total cost and join columns per hop
+        """
+        hops = []
+        for i, edge_id in enumerate(edges):
+            hops.append({
+                'from': self.tables[nodes[i]],
+                'to': self.tables[nodes[i + 1]],
+                'joins': self.edge_joins[edge_id]
+            })
+
+        return {
+            'tables': [self.tables[n] for n in nodes],
+            'cost': round(sum(self.edge_cost(e) for e in edges), 4),
+            'hops': hops
+        }
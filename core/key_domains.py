@@ -0,0 +1,102 @@
+"""
+Key Domain module.
+Infers column equivalence classes (key domains) from relationships.
+"""
+import logging
+from core.union_find import UnionFind
+
+
+class KeyDomainIndex:
+    """
+    Groups (table, column) pairs that are transitively joined together.
+    `a.x = b.y` and `b.y = c.z` put a.x, b.y and c.z in one key domain.
+    """
+
+    def __init__(self):
+        """Initialize an empty key domain index."""
+        self.logger = logging.getLogger(__name__)
+        self._union_find = UnionFind()
+        self._target_refs = {}
+
+    def add_relationship(self, rel):
+        """
+        Add one relationship to the index.
+
+        Args:
+            rel (dict): Normalized relationship
+        """
+        source = (rel['source_table'], rel['source_field'])
+        target = (rel['target_table'], rel['target_field'])
+
+        self._union_find.union(source, target)
+        self._target_refs[target] = self._target_refs.get(target, 0) + 1
+
+    def add_relationships(self, relationships):
+        """
+        Add a list of relationships to the index.
+
+        Args:
+            relationships (list): Normalized relationships
+        """
+        for rel in relationships:
+            self.add_relationship(rel)
+
+    def domain_of(self, table, column):
+        """
+        Get all columns sharing a key domain with the given column.
+
+        Args:
+            table (str): Table name
+            column (str): Column name
+
+        Returns:
+            list: Sorted (table, column) tuples, empty if the column is unknown
+        """
+        node = (table, column)
+        if node not in self._union_find:
+            return []
+
+        root = self._union_find.find(node)
+        return sorted(self._union_find.groups()[root])
+
+    def classes(self, min_size=2):
+        """
+        Get all key domain equivalence classes.
+
+        Args:
+            min_size (int): Minimum number of columns in a class
+
+        Returns:
+            list: Dicts with 'hub' and 'members' ("table.column" strings),
+                largest classes first
+        """
+        classes = []
+
+        for members in self._union_find.groups().values():
+            if len(members) < min_size:
+                continue
+
+            hub = self._select_hub(members)
+            classes.append({
+                'hub': f"{hub[0]}.{hub[1]}",
+                'members': sorted(f"{table}.{column}" for table, column in members)
+            })
+
+        classes.sort(key=lambda cls: (-len(cls['members']), cls['hub']))
+        return classes
+
+    def _select_hub(self, members):
+        """
+        Pick the column the rest of the domain most likely references.
+
+        Args:
+            members (list): (table, column) tuples of one class
+
+        Returns:
+            tuple: Hub (table, column)
+        """
+        # 被引用次数最多的列优先，其次是名为 id 的列
+        return min(
+            members,
+            key=lambda node: (-self._target_refs.get(node, 0), node[1] != 'id', node)
+        )
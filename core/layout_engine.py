@@ -0,0 +1,422 @@
+"""
+Layout Engine module.
+Computes ER diagram node positions once per analysis.
+"""
+import logging
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, force layout falls back to the layered one
+    np = None
+
+
+class LayoutEngine:
+    """
+    Places entity boxes for the ER diagram.
+
+    Modes:
+        - force: Fruchterman-Reingold spring embedding (NumPy) followed by
+          overlap removal
+        - layered: Sugiyama-style layers along the join direction with
+          barycenter crossing reduction
+        - grid: breadth-first ordered grid, the cheap fallback
+        - auto: force for graphs up to FORCE_LIMIT tables when NumPy is
+          installed, layered otherwise
+
+    Positions are the top-left corners of the boxes.
+    """
+
+    MODES = ('auto', 'force', 'layered', 'grid')
+    DEFAULT_SIZE = (160, 50)
+    GAP_X = 80
+    GAP_Y = 60
+    MARGIN = 20
+    FORCE_LIMIT = 500
+
+    def __init__(self, mode='auto', iterations=60, crossing_sweeps=4):
+        """
+        Initialize the layout engine.
+
+        Args:
+            mode (str): Default layout mode
+            iterations (int): Force layout iterations
+            crossing_sweeps (int): Barycenter sweeps of the layered layout
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown layout mode: {mode}")
+
+        self.logger = logging.getLogger(__name__)
+        self.mode = mode
+        self.iterations = iterations
+        self.crossing_sweeps = crossing_sweeps
+
+    def layout(self, entities, relationships, sizes=None, mode=None):
+        """
+        Compute the positions of all entities.
+
+        Args:
+            entities (dict or list): Entities (only the names are used)
+            relationships (list): Normalized relationships
+            sizes (dict): Entity name -> (width, height); DEFAULT_SIZE otherwise
+            mode (str): Layout mode, defaults to the engine's mode
+
+        Returns:
+            dict: 'mode' (the mode actually used), 'positions' (entity name ->
+                [x, y]), 'width' and 'height' of the drawing
+        """
+        mode = mode or self.mode
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown layout mode: {mode}")
+
+        names = list(entities)
+        sizes = {name: tuple((sizes or {}).get(name, self.DEFAULT_SIZE)) for name in names}
+        edges = self._edges(names, relationships)
+
+        if mode == 'auto':
+            mode = 'force' if np is not None and len(names) <= self.FORCE_LIMIT else 'layered'
+        if mode == 'force' and np is None:
+            self.logger.info("NumPy not installed, using the layered layout instead of force")
+            mode = 'layered'
+
+        if mode == 'force':
+            positions = self._force(names, edges, sizes)
+        elif mode == 'layered':
+            positions = self._layered(names, edges, sizes)
+        else:
+            positions = self._grid(self._bfs_order(names, edges), sizes)
+
+        positions = self._normalize(positions, sizes)
+        width = max((x + sizes[name][0] for name, (x, _) in positions.items()), default=0) + self.MARGIN
+        height = max((y + sizes[name][1] for name, (_, y) in positions.items()), default=0) + self.MARGIN
+
+        self.logger.info(f"Computed {mode} layout for {len(names)} tables ({width:.0f}x{height:.0f})")
+
+        return {'mode': mode, 'positions': positions, 'width': round(width, 1), 'height': round(height, 1)}
+
+    def _edges(self, names, relationships):
+        """
+        Collect the distinct directed edges between known entities.
+
+        Args:
+            names (list): Entity names
+            relationships (list): Normalized relationships
+
+        Returns:
+            list: (source, target) name pairs, without self loops
+        """
+        known = set(names)
+        edges = {}
+        for rel in relationships:
+            source, target = rel['source_table'], rel['target_table']
+            if source != target and source in known and target in known:
+                edges[(source, target)] = None
+        return list(edges)
+
+    def _bfs_order(self, names, edges):
+        """
+        Order entities breadth-first, starting from the most connected ones.
+
+        Args:
+            names (list): Entity names
+            edges (list): (source, target) pairs
+
+        Returns:
+            list: Entity names
+        """
+        adjacency = {name: [] for name in names}
+        for source, target in edges:
+            adjacency[source].append(target)
+            adjacency[target].append(source)
+
+        def by_degree(name):
+            return -len(adjacency[name]), name
+
+        order = []
+        visited = set()
+        for start in sorted(names, key=by_degree):
+            if start in visited:
+                continue
+            visited.add(start)
+            queue = [start]
+            head = 0
+            while head < len(queue):
+                node = queue[head]
+                head += 1
+                order.append(node)
+                for neighbour in sorted(adjacency[node], key=by_degree):
+                    if neighbour not in visited:
+                        visited.add(neighbour)
+                        queue.append(neighbour)
+        return order
+
+    def _grid(self, order, sizes, columns=None, origin_y=0.0):
+        """
+        Place entities row by row in a roughly square grid.
+
+        Args:
+            order (list): Entity names in placement order
+            sizes (dict): Entity name -> (width, height)
+            columns (int): Number of columns (square root of the count by default)
+            origin_y (float): Y of the first row
+
+        Returns:
+            dict: Entity name -> (x, y)
+        """
+        if not order:
+            return {}
+
+        columns = columns or max(1, math.ceil(math.sqrt(len(order))))
+        column_widths = [0.0] * columns
+        row_heights = [0.0] * math.ceil(len(order) / columns)
+        for i, name in enumerate(order):
+            width, height = sizes[name]
+            column_widths[i % columns] = max(column_widths[i % columns], width)
+            row_heights[i // columns] = max(row_heights[i // columns], height)
+
+        column_x = [0.0]
+        for width in column_widths[:-1]:
+            column_x.append(column_x[-1] + width + self.GAP_X)
+        row_y = [origin_y]
+        for height in row_heights[:-1]:
+            row_y.append(row_y[-1] + height + self.GAP_Y)
+
+        return {name: (column_x[i % columns], row_y[i // columns]) for i, name in enumerate(order)}
+
+    def _layered(self, names, edges, sizes):
+        """
+        Sugiyama-style layered layout.
+
+        Cycles are broken by reversing DFS back edges, layers come from the
+        longest path, and node order within layers is refined by alternating
+        barycenter sweeps. Long edges get no dummy nodes; very wide layers are
+        wrapped into several rows and unconnected tables go to a grid below.
+
+        Args:
+            names (list): Entity names
+            edges (list): (source, target) pairs
+            sizes (dict): Entity name -> (width, height)
+
+        Returns:
+            dict: Entity name -> (x, y)
+        """
+        successors = {name: [] for name in names}
+        for source, target in edges:
+            successors[source].append(target)
+
+        degree = {name: 0 for name in names}
+        for source, target in edges:
+            degree[source] += 1
+            degree[target] += 1
+        connected = [name for name in self._bfs_order(names, edges) if degree[name]]
+        isolated = [name for name in names if not degree[name]]
+
+        # 1. Break cycles: reverse edges pointing back to a node on the DFS stack
+        dag = {name: [] for name in connected}
+        state = {}
+        for root in connected:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(successors[root]))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[node] = 2
+                    stack.pop()
+                elif state.get(child) == 1:
+                    dag[child].append(node)
+                else:
+                    dag[node].append(child)
+                    if child not in state:
+                        state[child] = 1
+                        stack.append((child, iter(successors[child])))
+
+        # 2. Longest path layering (Kahn's topological order)
+        indegree = {name: 0 for name in connected}
+        for node in connected:
+            for child in dag[node]:
+                indegree[child] += 1
+        layer = {name: 0 for name in connected}
+        ready = [name for name in connected if indegree[name] == 0]
+        head = 0
+        while head < len(ready):
+            node = ready[head]
+            head += 1
+            for child in dag[node]:
+                layer[child] = max(layer[child], layer[node] + 1)
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        layers = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+        for name in connected:
+            layers[layer[name]].append(name)
+
+        # 3. Crossing reduction by barycenter sweeps
+        upper = {name: [] for name in connected}
+        lower = {name: [] for name in connected}
+        for node in connected:
+            for child in dag[node]:
+                lower[node].append(child)
+                upper[child].append(node)
+
+        rank = {}
+        for nodes in layers:
+            for i, name in enumerate(nodes):
+                rank[name] = (i + 0.5) / len(nodes)
+
+        for sweep in range(self.crossing_sweeps):
+            downward = sweep % 2 == 0
+            neighbours = upper if downward else lower
+            for nodes in (layers[1:] if downward else reversed(layers[:-1])):
+                barycenter = {
+                    name: (sum(rank[n] for n in neighbours[name]) / len(neighbours[name])
+                           if neighbours[name] else rank[name])
+                    for name in nodes
+                }
+                nodes.sort(key=lambda name: barycenter[name])
+                for i, name in enumerate(nodes):
+                    rank[name] = (i + 0.5) / len(nodes)
+
+        # 4. Coordinates: wrap wide layers, center every row
+        wrap = max(8, 2 * math.ceil(math.sqrt(len(connected) or 1)))
+        rows = [nodes[i:i + wrap] for nodes in layers for i in range(0, len(nodes), wrap)]
+        row_widths = [sum(sizes[name][0] for name in row) + self.GAP_X * (len(row) - 1) for row in rows]
+        max_width = max(row_widths, default=0)
+
+        positions = {}
+        y = 0.0
+        for row, row_width in zip(rows, row_widths):
+            x = (max_width - row_width) / 2
+            for name in row:
+                positions[name] = (x, y)
+                x += sizes[name][0] + self.GAP_X
+            y += max(sizes[name][1] for name in row) + self.GAP_Y
+
+        positions.update(self._grid(isolated, sizes, columns=min(wrap, len(isolated)) or None, origin_y=y))
+        return positions
+
+    def _force(self, names, edges, sizes):
+        """
+        Fruchterman-Reingold force-directed layout with NumPy.
+
+        Starts from the grid layout (deterministic), cools linearly, then
+        pushes overlapping boxes apart.
+
+        Args:
+            names (list): Entity names
+            edges (list): (source, target) pairs
+            sizes (dict): Entity name -> (width, height)
+
+        Returns:
+            dict: Entity name -> (x, y)
+        """
+        n = len(names)
+        if n <= 1:
+            return self._grid(names, sizes)
+
+        index = {name: i for i, name in enumerate(names)}
+        half = np.array([sizes[name] for name in names], dtype=np.float32) / 2
+        start = self._grid(self._bfs_order(names, edges), sizes)
+        x = np.array([start[name][0] for name in names], dtype=np.float32) + half[:, 0]
+        y = np.array([start[name][1] for name in names], dtype=np.float32) + half[:, 1]
+
+        source = np.array([index[s] for s, _ in edges], dtype=np.int64)
+        target = np.array([index[t] for _, t in edges], dtype=np.int64)
+
+        # Ideal distance: a box plus the gap between boxes
+        k = float(np.mean(half.max(axis=1))) * 2 + self.GAP_X
+        k2 = np.float32(k * k)
+        temperature = max(float(np.ptp(x)), float(np.ptp(y))) / 10 + k
+        cooling = temperature / (self.iterations + 1)
+        center_x, center_y = float(x.mean()), float(y.mean())
+
+        for _ in range(self.iterations):
+            dx = x[:, None] - x[None, :]
+            dy = y[:, None] - y[None, :]
+            repulsion = dx * dx + dy * dy
+            np.maximum(repulsion, 1e-2, out=repulsion)
+            np.divide(k2, repulsion, out=repulsion)
+            # The diagonal has dx = dy = 0 and contributes nothing
+            move_x = (dx * repulsion).sum(axis=1)
+            move_y = (dy * repulsion).sum(axis=1)
+
+            if len(source):
+                edge_x = x[source] - x[target]
+                edge_y = y[source] - y[target]
+                pull = np.sqrt(edge_x * edge_x + edge_y * edge_y) / k
+                np.add.at(move_x, source, -edge_x * pull)
+                np.add.at(move_x, target, edge_x * pull)
+                np.add.at(move_y, source, -edge_y * pull)
+                np.add.at(move_y, target, edge_y * pull)
+
+            # Gravity balances the repulsion, keeping the drawing about as compact as a grid
+            move_x -= x - center_x
+            move_y -= y - center_y
+
+            length = np.maximum(np.sqrt(move_x * move_x + move_y * move_y), 1e-2)
+            scale = np.minimum(length, temperature) / length
+            x += move_x * scale
+            y += move_y * scale
+            temperature = max(temperature - cooling, 1.0)
+
+        x, y = self._remove_overlaps(x, y, half)
+        return {name: (float(x[i] - half[i, 0]), float(y[i] - half[i, 1])) for i, name in enumerate(names)}
+
+    def _remove_overlaps(self, x, y, half, rounds=50):
+        """
+        Push overlapping boxes apart along the axis of least overlap.
+
+        Args:
+            x (numpy.ndarray): Box center x coordinates
+            y (numpy.ndarray): Box center y coordinates
+            half (numpy.ndarray): Half box sizes, shape (n, 2)
+            rounds (int): Maximum number of rounds
+
+        Returns:
+            tuple: Adjusted (x, y)
+        """
+        reach_x = half[:, 0][:, None] + half[:, 0][None, :] + self.GAP_X / 4
+        reach_y = half[:, 1][:, None] + half[:, 1][None, :] + self.GAP_Y / 4
+        # Boxes at the same coordinate are split by index: the lower index moves back
+        tie = np.where(np.triu(np.ones(reach_x.shape, dtype=bool), 1), -1.0, 1.0).astype(np.float32)
+
+        for _ in range(rounds):
+            dx = x[:, None] - x[None, :]
+            dy = y[:, None] - y[None, :]
+            overlap_x = reach_x - np.abs(dx)
+            overlap_y = reach_y - np.abs(dy)
+            overlapping = (overlap_x > 0) & (overlap_y > 0)
+            np.fill_diagonal(overlapping, False)
+            if not overlapping.any():
+                break
+
+            along_x = overlapping & (overlap_x <= overlap_y)
+            along_y = overlapping & ~along_x
+            x = x + np.where(along_x, overlap_x / 2 * np.where(dx == 0, tie, np.sign(dx)), 0).sum(axis=1)
+            y = y + np.where(along_y, overlap_y / 2 * np.where(dy == 0, tie, np.sign(dy)), 0).sum(axis=1)
+
+        return x, y
+
+    def _normalize(self, positions, sizes):
+        """
+        Shift positions so the drawing starts at the margin and round them.
+
+        Args:
+            positions (dict): Entity name -> (x, y)
+            sizes (dict): Entity name -> (width, height)
+
+        Returns:
+            dict: Entity name -> [x, y]
+        """
+        if not positions:
+            return {}
+
+        min_x = min(x for x, _ in positions.values())
+        min_y = min(y for _, y in positions.values())
+        return {
+            name: [round(x - min_x + self.MARGIN, 1), round(y - min_y + self.MARGIN, 1)]
+            for name, (x, y) in positions.items()
+        }
@@ -101,7 +101,8 @@ class Normalizer:
                 'target_table': rel['target_table'].lower(),
                 'target_field': rel['target_field'].lower(),
                 'relationship_type': rel['relationship_type'],
-                'source_file': rel['source_file']
+                'source_file': rel['source_file'],
+                'occurrences': 1
             }
             
             # 对特殊情况进行处理 - 表名缩写
@@ -142,20 +143,25 @@ class Normalizer:
                 current_is_pk = self._is_likely_primary_key(normalized_rel['target_field'])
                 reverse_is_pk = self._is_likely_primary_key(normalized_rel['source_field'])
                 
+                rel_index = relationship_map[reverse_key]
+                
                 # 如果当前关系的目标字段是主键，保留这个方向
                 if current_is_pk and not reverse_is_pk:
-                    # 用当前关系替换已存在的反向关系
-                    rel_index = relationship_map[reverse_key]
+                    # 用当前关系替换已存在的反向关系（保留出现次数）
+                    normalized_rel['occurrences'] += normalized[rel_index]['occurrences']
                     normalized[rel_index] = normalized_rel
                     # 更新映射
                     relationship_map.pop(reverse_key)
                     relationship_map[forward_key] = rel_index
-                # 否则保留已存在的反向关系
+                else:
+                    # 否则保留已存在的反向关系
+                    normalized[rel_index]['occurrences'] += 1
                 continue
             
             # 检查正向关系是否已经存在
             if forward_key in relationship_map:
-                # 正向关系已存在，跳过（重复）
+                # 正向关系已存在，记录出现次数后跳过（重复）
+                normalized[relationship_map[forward_key]]['occurrences'] += 1
                 continue
                 
             # 新关系，添加到结果中
@@ -0,0 +1,228 @@
+"""
+Graph Partitioner module.
+Splits the table graph into size-bounded partitions for diagram rendering.
+"""
+import logging
+from core.union_find import UnionFind
+
+
+class GraphPartitioner:
+    """
+    Partitions a GraphIndex into connected components, then splits large
+    components into size-bounded communities with label propagation.
+    """
+
+    def __init__(self, max_size=40, max_iterations=20):
+        """
+        Initialize the partitioner.
+
+        Args:
+            max_size (int): Maximum number of tables per partition
+            max_iterations (int): Maximum label propagation sweeps per component
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max(1, max_size)
+        self.max_iterations = max_iterations
+
+    def partition(self, graph_index):
+        """
+        Partition the table graph.
+
+        Args:
+            graph_index (GraphIndex): CSR index over the relationships
+
+        Returns:
+            list: Partitions as sorted lists of table names, largest first
+        """
+        union_find = UnionFind()
+        indptr, indices = graph_index.indptr, graph_index.indices
+
+        for node in range(len(graph_index.tables)):
+            union_find.add(node)
+            for neighbour in indices[indptr[node]:indptr[node + 1]]:
+                union_find.union(node, neighbour)
+
+        partitions = []
+        for component in union_find.groups().values():
+            if len(component) <= self.max_size:
+                partitions.append(component)
+            else:
+                partitions.extend(self._split_component(graph_index, component))
+
+        partitions = self._pack_small_partitions(partitions)
+
+        result = [sorted(graph_index.tables[node] for node in nodes) for nodes in partitions]
+        result.sort(key=lambda tables: (-len(tables), tables[0]))
+
+        self.logger.info(f"Partitioned {len(graph_index.tables)} tables into {len(result)} partitions "
+                         f"(max size {self.max_size})")
+        return result
+
+    def _pack_small_partitions(self, partitions):
+        """
+        Pack small partitions together (first-fit decreasing).
+
+        Schemas usually contain many tiny islands (two or three tables joined
+        only with each other); one diagram per island is not useful, so they
+        share diagrams up to max_size tables.
+
+        Args:
+            partitions (list): Partitions as lists of node ids
+
+        Returns:
+            list: Partitions as lists of node ids
+        """
+        small_size = self._small_size()
+        packed = [nodes for nodes in partitions if len(nodes) >= small_size]
+        bins = []
+
+        for nodes in sorted((p for p in partitions if len(p) < small_size), key=len, reverse=True):
+            for bin_nodes in bins:
+                if len(bin_nodes) + len(nodes) <= self.max_size:
+                    bin_nodes.extend(nodes)
+                    break
+            else:
+                bins.append(list(nodes))
+
+        return packed + bins
+
+    def _small_size(self):
+        """
+        Get the size below which a partition counts as a fragment.
+
+        Returns:
+            int: Fragment size threshold
+        """
+        return max(3, self.max_size // 4)
+
+    def cross_partition_edges(self, partitions, relationships):
+        """
+        Count relationships between different partitions.
+
+        Args:
+            partitions (list): Partitions as lists of table names
+            relationships (list): Normalized relationships
+
+        Returns:
+            list: Dicts with 'source', 'target' (partition indexes) and
+                'relationships' (number of relationships between them)
+        """
+        partition_of = {}
+        for index, tables in enumerate(partitions):
+            for table in tables:
+                partition_of[table] = index
+
+        counts = {}
+        for rel in relationships:
+            source = partition_of.get(rel['source_table'])
+            target = partition_of.get(rel['target_table'])
+            if source is None or target is None or source == target:
+                continue
+            key = (min(source, target), max(source, target))
+            counts[key] = counts.get(key, 0) + 1
+
+        return [
+            {'source': source, 'target': target, 'relationships': count}
+            for (source, target), count in sorted(counts.items())
+        ]
+
+    def _split_component(self, graph_index, component):
+        """
+        Split one connected component with size-bounded label propagation.
+
+        Each node repeatedly adopts the label with the largest total edge
+        weight among its neighbours, as long as that community still has
+        room. Nodes are visited by descending degree so hubs seed communities.
+
+        Args:
+            graph_index (GraphIndex): CSR index over the relationships
+            component (list): Node ids of the component
+
+        Returns:
+            list: Communities as lists of node ids
+        """
+        indptr, indices, weights = graph_index.indptr, graph_index.indices, graph_index.weights
+
+        labels = {node: node for node in component}
+        sizes = {node: 1 for node in component}
+        order = sorted(component, key=lambda node: (indptr[node] - indptr[node + 1], node))
+
+        for _ in range(self.max_iterations):
+            changed = False
+
+            for node in order:
+                current = labels[node]
+                scores = {}
+                for position in range(indptr[node], indptr[node + 1]):
+                    label = labels[indices[position]]
+                    scores[label] = scores.get(label, 0.0) + weights[position]
+
+                best = None
+                best_score = 0.0
+                for label, score in scores.items():
+                    if label == current or sizes[label] >= self.max_size:
+                        continue
+                    if best is None or score > best_score or (score == best_score and label < best):
+                        best, best_score = label, score
+
+                # Only move for a strictly better community to avoid oscillation
+                if best is not None and best_score > scores.get(current, 0.0):
+                    sizes[current] -= 1
+                    sizes[best] += 1
+                    labels[node] = best
+                    changed = True
+
+            if not changed:
+                break
+
+        communities = {}
+        for node in component:
+            communities.setdefault(labels[node], []).append(node)
+
+        return self._merge_small_communities(graph_index, communities, labels)
+
+    def _merge_small_communities(self, graph_index, communities, labels):
+        """
+        Fold small communities into their best-connected neighbour with room.
+
+        Label propagation leaves fragments behind once neighbouring
+        communities hit the size cap; merging them keeps the number of
+        diagrams down without exceeding max_size.
+
+        Args:
+            graph_index (GraphIndex): CSR index over the relationships
+            communities (dict): Label to list of node ids
+            labels (dict): Node id to label (updated in place)
+
+        Returns:
+            list: Communities as lists of node ids
+        """
+        indptr, indices, weights = graph_index.indptr, graph_index.indices, graph_index.weights
+        small_size = self._small_size()
+
+        for label in sorted(communities, key=lambda l: (len(communities[l]), l)):
+            members = communities.get(label)
+            if not members or len(members) >= small_size:
+                continue
+
+            scores = {}
+            for node in members:
+                for position in range(indptr[node], indptr[node + 1]):
+                    other = labels[indices[position]]
+                    if other != label:
+                        scores[other] = scores.get(other, 0.0) + weights[position]
+
+            candidates = [
+                (-score, other) for other, score in scores.items()
+                if len(communities[other]) + len(members) <= self.max_size
+            ]
+            if not candidates:
+                continue
+
+            _, target = min(candidates)
+            for node in members:
+                labels[node] = target
+            communities[target].extend(members)
+            del communities[label]
+
+        return list(communities.values())
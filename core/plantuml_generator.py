@@ -2,7 +2,10 @@
 PlantUML Generator module.
 Generates PlantUML diagrams from entity relationships.
 """
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 
 
 class PlantUmlGenerator:
@@ -11,48 +14,83 @@ class PlantUmlGenerator:
     Handles diagram layout optimization.
     """
     
-    def __init__(self):
-        """Initialize the PlantUML generator."""
+    # Layout engine pragma inserted by optimize_layout
+    LAYOUT_PRAGMA = '!pragma layout smetana'
+    
+    def __init__(self, fragment_cache_size=8192, plantuml_client=None):
+        """
+        Initialize the PlantUML generator.
+        
+        Args:
+            fragment_cache_size (int): Maximum number of rendered entity blocks to keep
+            plantuml_client (PlantUmlClient): Client used by generate_svg (optional)
+        """
         self.logger = logging.getLogger(__name__)
+        self.plantuml_client = plantuml_client
+        self.fragment_cache_size = fragment_cache_size
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self._fragments = OrderedDict()
+        # The generator is shared by request threads (diagram, focus, downloads)
+        self._lock = threading.Lock()
     
-    def generate_diagram(self, entities, relationships):
+    def generate_diagram(self, entities, relationships, key_domains=None):
         """
         Generate a PlantUML diagram.
         
         Args:
             entities (dict): Dictionary of entities
             relationships (list): List of relationship dictionaries
+            key_domains (list): Optional key domain classes from KeyDomainIndex.
+                Classes with three or more columns are drawn as one edge per
+                member to the hub column instead of pairwise edges.
             
         Returns:
             str: PlantUML diagram code
         """
-        diagram = []
+        return '\n'.join(self.iter_diagram(entities, relationships, key_domains))
+    
+    def iter_diagram(self, entities, relationships, key_domains=None, optimize=False):
+        """
+        Generate a PlantUML diagram line by line.
+        
+        Entity blocks come from a fragment cache keyed by entity content,
+        so regenerating after a small change only renders changed entities.
         
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): List of relationship dictionaries
+            key_domains (list): Optional key domain classes (see generate_diagram)
+            optimize (bool): Emit the optimize_layout pragma right away
+            
+        Yields:
+            str: Diagram lines without line terminators
+        """
         # Start diagram
-        diagram.append('@startuml')
-        diagram.append('left to right direction')
-        diagram.append('')
+        yield '@startuml'
+        if optimize:
+            yield self.LAYOUT_PRAGMA
+            yield ''
+        yield 'left to right direction'
+        yield ''
         
         # Layout optimization hint
-        diagram.append('skinparam nodesep 80')
-        diagram.append('skinparam ranksep 60')
-        diagram.append('')
+        yield 'skinparam nodesep 80'
+        yield 'skinparam ranksep 60'
+        yield ''
         
         # Define entities
         for entity_name, entity in entities.items():
-            diagram.append(f'entity {entity_name} {{')
-            
-            # Add primary key (if available)
-            if entity['primary_key']:
-                diagram.append(f'  +{entity["primary_key"]}')
-            
-            # Add other fields
-            for field in entity['fields']:
-                if field != entity['primary_key']:
-                    diagram.append(f'  {field}')
-            
-            diagram.append('}')
-            diagram.append('')
+            yield self._entity_fragment(entity_name, entity)
+            yield ''
+        
+        # Columns drawn through a key domain hub
+        hub_of = {}
+        for domain in key_domains or []:
+            if len(domain['members']) < 3:
+                continue
+            for member in domain['members']:
+                hub_of[member] = domain['hub']
         
         # Define relationships
         added_relationships = set()  # To avoid duplicates
@@ -63,6 +101,9 @@ class PlantUmlGenerator:
             
             if rel_id in added_relationships:
                 continue
+            
+            if f"{rel['source_table']}.{rel['source_field']}" in hub_of:
+                continue
                 
             added_relationships.add(rel_id)
             
@@ -70,9 +111,148 @@ class PlantUmlGenerator:
             target = rel['target_table']
             label = f"\"{rel['source_field']} = {rel['target_field']}\""
             
-            diagram.append(f'{source} --> {target} : {label}')
+            yield f'{source} --> {target} : {label}'
+        
+        # One edge per key domain member, pointing at the hub column
+        for domain in key_domains or []:
+            if len(domain['members']) < 3:
+                continue
+            
+            hub_table, hub_field = domain['hub'].split('.', 1)
+            for member in domain['members']:
+                if member == domain['hub']:
+                    continue
+                member_table, member_field = member.split('.', 1)
+                yield f'{member_table} --> {hub_table} : "{member_field} = {hub_field}"'
         
         # End diagram
+        yield '@enduml'
+        
+        self.logger.debug(f"Entity fragment cache: {self.fragment_hits} hits, "
+                          f"{self.fragment_misses} misses, {len(self._fragments)} entries")
+    
+    @staticmethod
+    def iter_chunks(lines):
+        """
+        Yield diagram lines with their separating newlines.
+        
+        The chunks concatenate to '\n'.join(lines) without building the string.
+        
+        Args:
+            lines (iterable): Diagram lines, e.g. from iter_diagram()
+            
+        Yields:
+            str: First line, then '\n' + line for every following line
+        """
+        for i, line in enumerate(lines):
+            yield line if i == 0 else '\n' + line
+    
+    @staticmethod
+    def write_diagram(target, lines):
+        """
+        Stream diagram lines to a file path, a text stream or a socket.
+        
+        Args:
+            target: File path (str), object with write() or socket with sendall()
+            lines (iterable): Diagram lines, e.g. from iter_diagram(); a
+                single string is written as is
+            
+        Returns:
+            int: Number of lines written
+        """
+        if isinstance(target, str):
+            with open(target, 'w', encoding='utf-8') as f:
+                return PlantUmlGenerator.write_diagram(f, lines)
+        
+        if hasattr(target, 'sendall'):
+            def write(text):
+                target.sendall(text.encode('utf-8'))
+        else:
+            write = target.write
+        
+        if isinstance(lines, str):
+            lines = [lines]
+        
+        count = 0
+        for chunk in PlantUmlGenerator.iter_chunks(lines):
+            write(chunk)
+            count += 1
+        
+        return count
+    
+    def _entity_fragment(self, entity_name, entity):
+        """
+        Render (or reuse) the PlantUML block of one entity.
+        
+        Args:
+            entity_name (str): Entity name
+            entity (dict): Entity with 'fields' and 'primary_key'
+            
+        Returns:
+            str: Entity block, lines joined with newlines
+        """
+        primary_key = entity['primary_key']
+        content = '\x1f'.join([entity_name, primary_key or ''] + list(entity['fields']))
+        key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+        
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.fragment_hits += 1
+                return fragment
+            self.fragment_misses += 1
+        
+        block = [f'entity {entity_name} {{']
+        
+        # Add primary key (if available)
+        if primary_key:
+            block.append(f'  +{primary_key}')
+        
+        # Add other fields
+        for field in entity['fields']:
+            if field != primary_key:
+                block.append(f'  {field}')
+        
+        block.append('}')
+        fragment = '\n'.join(block)
+        
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.fragment_cache_size:
+                self._fragments.popitem(last=False)
+        
+        return fragment
+    
+    def generate_overview_diagram(self, partitions, cross_edges):
+        """
+        Generate an overview diagram with one node per partition.
+        
+        Args:
+            partitions (list): Partition dicts with 'id', 'name', 'hub' and 'tables'
+            cross_edges (list): Dicts with 'source', 'target' (partition ids)
+                and 'relationships' (count)
+            
+        Returns:
+            str: PlantUML diagram code
+        """
+        diagram = []
+        
+        diagram.append('@startuml')
+        diagram.append('!pragma layout smetana')
+        diagram.append('left to right direction')
+        diagram.append('')
+        
+        for partition in partitions:
+            label = f"{partition['name']}\\n{len(partition['tables'])} tables\\nhub: {partition['hub']}"
+            diagram.append(f'rectangle "{label}" as {partition["name"]}')
+        
+        diagram.append('')
+        
+        for edge in cross_edges:
+            diagram.append(f'partition_{edge["source"]} -- partition_{edge["target"]} : "{edge["relationships"]}"')
+        
         diagram.append('@enduml')
         
         return '\n'.join(diagram)
@@ -95,39 +275,37 @@ class PlantUmlGenerator:
             # Find the index after @startuml
             for i, line in enumerate(lines):
                 if line.strip() == '@startuml':
-                    lines.insert(i + 1, '!pragma layout smetana')
+                    lines.insert(i + 1, self.LAYOUT_PRAGMA)
                     lines.insert(i + 2, '')
                     break
         
         return '\n'.join(lines)
     
-    def generate_svg(self, diagram):
+    def generate_svg(self, diagram, output_path='output.svg'):
         """
         Generate SVG from PlantUML diagram.
         This requires a PlantUML server to be available.
         
         Args:
             diagram (str): PlantUML diagram code
+            output_path (str): Path of the SVG file to write
             
         Returns:
             str: Path to SVG file
         """
         try:
-            import plantuml
-            
-            # Create a PlantUML server connection
-            # Default to public PlantUML server if no local server is specified
-            server = plantuml.PlantUML(url='http://www.plantuml.com/plantuml/svg/')
+            if self.plantuml_client is None:
+                from utils.plantuml_client import PlantUmlClient
+                
+                # Default to public PlantUML server if no client is configured
+                self.plantuml_client = PlantUmlClient()
             
             # Generate SVG
-            output_path = 'output.svg'
-            server.processes(diagram, outfile=output_path)
-            
-            return output_path
+            return self.plantuml_client.render_to_file(diagram, output_path, 'svg')
             
         except ImportError:
             self.logger.error("plantuml module not installed")
             return None
         except Exception as e:
             self.logger.error(f"Error generating SVG: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
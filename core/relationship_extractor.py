@@ -7,6 +7,7 @@ import logging
 import sqlparse
 from sqlparse.sql import IdentifierList, Identifier, Comparison
 from sqlparse.tokens import Keyword, DML
+from core.column_index import ColumnIndex
 
 
 class RelationshipExtractor:
@@ -15,6 +16,25 @@ class RelationshipExtractor:
     Handles JOIN operations, WHERE conditions, and subqueries.
     """
     
+    # Clause keywords deciding the role of the columns that follow them
+    CLAUSE_PATTERN = re.compile(
+        r'\b(ON|WHERE|HAVING|GROUP\s+BY|ORDER\s+BY|SELECT|FROM|JOIN|SET|VALUES|LIMIT|UNION|FOR\s+UPDATE)\b',
+        re.IGNORECASE
+    )
+    
+    # [qualifier.]column <operator> [qualifier.column]
+    COMPARISON_PATTERN = re.compile(
+        r'(?:([a-zA-Z_]\w*)\s*\.\s*)?([a-zA-Z_]\w*)\s*'
+        r'(<\s*>|!\s*=|<\s*=|>\s*=|=|<|>|\bNOT\s+IN\b|\bIN\b|\bBETWEEN\b|\bNOT\s+LIKE\b|\bLIKE\b)'
+        r'(?:\s*([a-zA-Z_]\w*)\s*\.\s*([a-zA-Z_]\w*))?',
+        re.IGNORECASE
+    )
+    
+    # Leading column of an ORDER BY / GROUP BY item
+    SORT_ITEM_PATTERN = re.compile(r'^\s*(?:([a-zA-Z_]\w*)\s*\.\s*)?([a-zA-Z_]\w*)\b(?!\s*[(.])')
+    
+    RANGE_OPERATORS = {'<', '>', '<=', '>=', 'BETWEEN', 'LIKE'}
+    
     def __init__(self):
         """Initialize the relationship extractor."""
         self.logger = logging.getLogger(__name__)
@@ -33,7 +53,7 @@ class RelationshipExtractor:
         
         try:
             sql = sql_data['sql']
-            file_info = f"{sql_data['relative_path']} (L{sql_data['line_info']})"
+            file_info = self.get_file_info(sql_data)
             
             # 检查SQL是否包含UNION
             if re.search(r'\bUNION\b', sql, re.IGNORECASE):
@@ -80,6 +100,151 @@ class RelationshipExtractor:
         
         return relationships
     
+    def extract_simple_relationships(self, sql_data):
+        """
+        Extract relationships from a single-table statement.
+        
+        Fast path for statements the StatementClassifier put in the simple
+        tier: without JOIN, subqueries or UNION only the WHERE clause can
+        contribute, so the JOIN and subquery passes are skipped.
+        
+        Args:
+            sql_data (dict): SQL data from the parser
+            
+        Returns:
+            list: Extracted relationships
+        """
+        relationships = []
+        
+        try:
+            file_info = self.get_file_info(sql_data)
+            
+            parsed = sqlparse.parse(sql_data['sql'])
+            if not parsed:
+                return relationships
+            
+            stmt = parsed[0]
+            aliases = self.extract_table_aliases(stmt)
+            
+            for rel in self.extract_where_relationships(stmt, aliases):
+                rel['source_file'] = file_info
+                rel['is_potential_fk'] = self._is_potential_foreign_key(rel['source_field'], rel['target_field'])
+                relationships.append(rel)
+                
+        except Exception as e:
+            self.logger.error(f"Error extracting relationships: {str(e)}")
+        
+        return relationships
+    
+    def extract_column_usages(self, sql, default_table=None):
+        """
+        Extract the columns a statement filters, joins, sorts or groups on.
+        
+        A single left-to-right pass over the clause keywords: columns
+        compared in ON/WHERE/HAVING become JOIN_ON (column = column),
+        WHERE_EQ (= / IN) or RANGE (<, >, BETWEEN, LIKE); columns listed
+        in ORDER BY / GROUP BY get those roles.
+        
+        Args:
+            sql (str): Normalized SQL statement
+            default_table (str): Table for unqualified columns, only set for
+                single-table statements
+            
+        Returns:
+            list: Unique (table, column, role) tuples in order of appearance
+        """
+        usages = []
+        
+        try:
+            # 字符串字面量中的内容不参与解析
+            sql = re.sub(r"'(?:[^']|'')*'", '?', sql or '')
+            aliases = self.extract_table_aliases(sql)
+            
+            def resolve(qualifier, column):
+                if qualifier:
+                    return self._resolve_table_name(qualifier, aliases), column.lower()
+                if default_table:
+                    return default_table.lower(), column.lower()
+                return None, None
+            
+            def add(qualifier, column, role):
+                table, column = resolve(qualifier, column)
+                if table and (table, column, role) not in usages:
+                    usages.append((table, column, role))
+            
+            clauses = list(self.CLAUSE_PATTERN.finditer(sql))
+            for i, clause in enumerate(clauses):
+                keyword = re.sub(r'\s+', ' ', clause.group(1).upper())
+                end = clauses[i + 1].start() if i + 1 < len(clauses) else len(sql)
+                body = sql[clause.end():end]
+                
+                if keyword in ('ON', 'WHERE', 'HAVING'):
+                    for match in self.COMPARISON_PATTERN.finditer(body):
+                        qualifier, column, operator, other_qualifier, other_column = match.groups()
+                        operator = re.sub(r'\s+', '', operator).upper()
+                        
+                        if operator == '=' and other_column:
+                            add(qualifier, column, ColumnIndex.ROLE_JOIN_ON)
+                            add(other_qualifier, other_column, ColumnIndex.ROLE_JOIN_ON)
+                        elif operator in ('=', 'IN'):
+                            add(qualifier, column, ColumnIndex.ROLE_WHERE_EQ)
+                        elif operator in self.RANGE_OPERATORS:
+                            add(qualifier, column, ColumnIndex.ROLE_RANGE)
+                
+                elif keyword in ('ORDER BY', 'GROUP BY'):
+                    role = ColumnIndex.ROLE_ORDER_BY if keyword == 'ORDER BY' else ColumnIndex.ROLE_GROUP_BY
+                    for item in self._split_clause_items(body):
+                        match = self.SORT_ITEM_PATTERN.match(item)
+                        if match:
+                            add(match.group(1), match.group(2), role)
+                    
+        except Exception as e:
+            self.logger.error(f"Error extracting column usages: {str(e)}")
+        
+        return usages
+    
+    def _split_clause_items(self, body):
+        """
+        Split an ORDER BY / GROUP BY clause body into its top-level items.
+        
+        Args:
+            body (str): Clause text after the keyword
+            
+        Returns:
+            list: Item strings
+        """
+        items = []
+        depth = 0
+        start = 0
+        
+        for position, char in enumerate(body):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth < 0:
+                    # 子查询的右括号之后不再属于该子句
+                    body = body[:position]
+                    break
+            elif char == ',' and depth == 0:
+                items.append(body[start:position])
+                start = position + 1
+        
+        items.append(body[start:])
+        return items
+    
+    def get_file_info(self, sql_data):
+        """
+        Build the source_file description for a SQL statement.
+        
+        Args:
+            sql_data (dict): SQL data from the parser
+            
+        Returns:
+            str: File name with line information
+        """
+        return f"{sql_data['relative_path']} (L{sql_data['line_info']})"
+    
     def extract_table_aliases(self, stmt):
         """
         Extract table aliases from a SQL statement.
@@ -0,0 +1,270 @@
+"""
+Snapshot Diff module.
+Compares two analysis snapshots (saved results or in-memory results).
+"""
+import hashlib
+import json
+import logging
+from operator import itemgetter
+from core.binary_snapshot import BinarySnapshot, RelationshipColumns
+
+
+class SnapshotDiff:
+    """
+    Diffs relationships, entities and fields between two analysis snapshots.
+
+    Every relationship is reduced to a hashed canonical key: the two
+    "table.field" endpoints sorted, so `a.x = b.y` and `b.y = a.x` are the
+    same relationship. Both snapshots are indexed by key once, which keeps
+    the comparison linear in snapshot size.
+    """
+
+    def __init__(self):
+        """Initialize the snapshot differ."""
+        self.logger = logging.getLogger(__name__)
+
+    def load_snapshot(self, path):
+        """
+        Load a saved snapshot (analysis_results.json or a binary snapshot).
+
+        Binary snapshots are memory-mapped and read lazily.
+
+        Args:
+            path (str): Path to the snapshot file
+
+        Returns:
+            dict or BinarySnapshot: Snapshot with 'entities' and 'relationships'
+        """
+        if BinarySnapshot.is_snapshot(path):
+            return BinarySnapshot.open(path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def diff(self, snapshot_a, snapshot_b):
+        """
+        Compare two snapshots.
+
+        Args:
+            snapshot_a (dict): Older snapshot (saved JSON or analysis results)
+            snapshot_b (dict): Newer snapshot (saved JSON or analysis results)
+
+        Returns:
+            dict: 'relationships' and 'entities' (each with 'added', 'removed'
+                and 'changed') plus summary 'stats'
+        """
+        relationships = self._diff_relationships(
+            self._index_relationships(snapshot_a.get('relationships', [])),
+            self._index_relationships(snapshot_b.get('relationships', []))
+        )
+        entities = self._diff_entities(
+            self._index_entities(snapshot_a.get('entities', {})),
+            self._index_entities(snapshot_b.get('entities', {}))
+        )
+
+        stats = {
+            'relationships_added': len(relationships['added']),
+            'relationships_removed': len(relationships['removed']),
+            'relationships_changed': len(relationships['changed']),
+            'relationships_unchanged': relationships.pop('unchanged'),
+            'entities_added': len(entities['added']),
+            'entities_removed': len(entities['removed']),
+            'entities_changed': len(entities['changed'])
+        }
+
+        self.logger.info(f"Snapshot diff: {stats}")
+
+        return {'relationships': relationships, 'entities': entities, 'stats': stats}
+
+    def relationship_key(self, rel):
+        """
+        Compute the hashed canonical key of a relationship.
+
+        Args:
+            rel (dict): Relationship
+
+        Returns:
+            bytes: 8-byte digest, identical for both directions of a join
+        """
+        source = f"{rel['source_table'].lower()}.{rel['source_field'].lower()}"
+        target = f"{rel['target_table'].lower()}.{rel['target_field'].lower()}"
+        canonical = f"{source}|{target}" if source <= target else f"{target}|{source}"
+        return hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+
+    def _index_relationships(self, relationships):
+        """
+        Index relationships by canonical key, summing duplicate occurrences.
+
+        Args:
+            relationships (list): Relationships of one snapshot
+
+        Returns:
+            dict: Canonical key -> relationship summary
+        """
+        if isinstance(relationships, RelationshipColumns):
+            return self._index_relationship_columns(relationships)
+
+        index = {}
+
+        for rel in relationships:
+            key = self.relationship_key(rel)
+            occurrences = rel.get('occurrences', 1)
+
+            existing = index.get(key)
+            if existing is not None:
+                existing['occurrences'] += occurrences
+                continue
+
+            index[key] = {
+                'source_table': rel['source_table'].lower(),
+                'source_field': rel['source_field'].lower(),
+                'target_table': rel['target_table'].lower(),
+                'target_field': rel['target_field'].lower(),
+                'relationship_type': rel.get('relationship_type', ''),
+                'occurrences': occurrences
+            }
+
+        return index
+
+    def _index_relationship_columns(self, relationships):
+        """
+        Index the relationships of a binary snapshot straight from its columns.
+
+        Names are lower-cased once per string in the string table instead of
+        once per relationship, and no relationship dicts are built for
+        relationships whose key was already seen.
+
+        Args:
+            relationships (RelationshipColumns): Relationships of one snapshot
+
+        Returns:
+            dict: Canonical key -> relationship summary
+        """
+        strings = relationships.strings
+        lowered = [value.lower() for value in strings]
+
+        index = {}
+        blake2b = hashlib.blake2b
+        for source_table, source_field, target_table, target_field, rel_type, occurrences in relationships.rows(
+                'rel_st', 'rel_sf', 'rel_tt', 'rel_tf', 'rel_ty', 'rel_oc'):
+            source = f"{lowered[source_table]}.{lowered[source_field]}"
+            target = f"{lowered[target_table]}.{lowered[target_field]}"
+            canonical = f"{source}|{target}" if source <= target else f"{target}|{source}"
+            key = blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+
+            existing = index.get(key)
+            if existing is not None:
+                existing['occurrences'] += occurrences
+                continue
+
+            index[key] = {
+                'source_table': lowered[source_table],
+                'source_field': lowered[source_field],
+                'target_table': lowered[target_table],
+                'target_field': lowered[target_field],
+                'relationship_type': strings[rel_type],
+                'occurrences': occurrences
+            }
+
+        return index
+
+    def _diff_relationships(self, before, after):
+        """
+        Compare two relationship indexes.
+
+        Args:
+            before (dict): Older canonical key index
+            after (dict): Newer canonical key index
+
+        Returns:
+            dict: 'added', 'removed', 'changed' lists and the 'unchanged' count
+        """
+        added = [rel for key, rel in after.items() if key not in before]
+        removed = [rel for key, rel in before.items() if key not in after]
+        changed = []
+        unchanged = 0
+
+        for key, old in before.items():
+            new = after.get(key)
+            if new is None:
+                continue
+
+            if old['occurrences'] == new['occurrences'] and old['relationship_type'] == new['relationship_type']:
+                unchanged += 1
+                continue
+
+            change = dict(new)
+            change.update({
+                'occurrences_before': old['occurrences'],
+                'occurrences_after': new['occurrences'],
+                'occurrences_delta': new['occurrences'] - old['occurrences'],
+                'relationship_type_before': old['relationship_type']
+            })
+            del change['occurrences']
+            changed.append(change)
+
+        sort_key = itemgetter('source_table', 'source_field', 'target_table', 'target_field')
+        return {
+            'added': sorted(added, key=sort_key),
+            'removed': sorted(removed, key=sort_key),
+            'changed': sorted(changed, key=sort_key),
+            'unchanged': unchanged
+        }
+
+    def _index_entities(self, entities):
+        """
+        Index entities by name.
+
+        Accepts both the analysis results form ({name: entity}) and the
+        exported form ([{'name': ..., ...}]).
+
+        Args:
+            entities (dict or list): Entities of one snapshot
+
+        Returns:
+            dict: Entity name -> (set of fields, primary key)
+        """
+        if hasattr(entities, 'items'):
+            items = entities.items()
+        else:
+            items = ((entity['name'], entity) for entity in entities)
+
+        return {
+            name.lower(): (set(field.lower() for field in entity.get('fields', [])), entity.get('primary_key'))
+            for name, entity in items
+        }
+
+    def _diff_entities(self, before, after):
+        """
+        Compare two entity indexes.
+
+        Args:
+            before (dict): Older entity index
+            after (dict): Newer entity index
+
+        Returns:
+            dict: 'added' and 'removed' entity names, 'changed' entities with
+                their added/removed fields and primary key change
+        """
+        changed = []
+
+        for name in sorted(before.keys() & after.keys()):
+            old_fields, old_primary_key = before[name]
+            new_fields, new_primary_key = after[name]
+
+            if old_fields == new_fields and old_primary_key == new_primary_key:
+                continue
+
+            changed.append({
+                'name': name,
+                'added_fields': sorted(new_fields - old_fields),
+                'removed_fields': sorted(old_fields - new_fields),
+                'primary_key_before': old_primary_key,
+                'primary_key_after': new_primary_key
+            })
+
+        return {
+            'added': sorted(after.keys() - before.keys()),
+            'removed': sorted(before.keys() - after.keys()),
+            'changed': changed
+        }
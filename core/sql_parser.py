@@ -4,6 +4,7 @@ Extracts SQL statements from XML files and handles dynamic tags.
 """
 import os
 import re
+import hashlib
 import logging
 from lxml import etree
 
@@ -83,14 +84,18 @@ class SqlParser:
             
             sql_statements = self.extract_sql_statements(xml_content, file_path)
             
-            for sql_id, sql_content, line_info in sql_statements:
+            for sql_id, sql_content, line_info, statement_type, mapper_namespace, line in sql_statements:
                 normalized_sql = self.normalize_sql(sql_content)
                 
                 results.append({
                     'sql_id': sql_id,
+                    'namespace': mapper_namespace,
+                    'statement_type': statement_type,
                     'sql': normalized_sql,
+                    'fingerprint': self.fingerprint_sql(normalized_sql),
                     'file_path': file_path,
                     'relative_path': relative_path,
+                    'line': line,
                     'line_info': line_info
                 })
                 
@@ -108,7 +113,8 @@ class SqlParser:
             file_path (str): Path to the file (for error reporting)
             
         Returns:
-            list: Tuples of (sql_id, sql_content, line_info)
+            list: Tuples of (sql_id, sql_content, line_info, statement_type, mapper_namespace,
+                start line or None)
         """
         statements = []
         
@@ -120,6 +126,9 @@ class SqlParser:
             # Find namespace
             namespace = root.tag.split('}')[0] + '}' if '}' in root.tag else ''
             
+            # Mapper namespace (<mapper namespace="...">)
+            mapper_namespace = root.get('namespace', '')
+            
             # Extract SQL statements
             for tag in self.SQL_TAGS:
                 xpath_query = f".//{namespace}{tag}"
@@ -128,15 +137,15 @@ class SqlParser:
                 for element in elements:
                     sql_id = element.get('id', 'unknown')
                     
-                    # Get line information
+                    # Get line information (sourceline is None if lxml lost track)
                     line_number = element.sourceline
-                    line_info = f"{line_number}-{line_number + 20}"  # Approximate
+                    line_info = f"{line_number}-{line_number + 20}" if line_number else '?'  # Approximate
                     
                     # Extract SQL content
                     sql_content = etree.tostring(element, encoding='unicode', method='text')
                     cleaned_sql = self.clean_dynamic_tags(sql_content)
                     
-                    statements.append((sql_id, cleaned_sql, line_info))
+                    statements.append((sql_id, cleaned_sql, line_info, tag, mapper_namespace, line_number))
         
         except Exception as e:
             self.logger.error(f"Error extracting SQL from {file_path}: {str(e)}")
@@ -221,6 +230,36 @@ class SqlParser:
         
         return normalized
         
+    def fingerprint_sql(self, sql):
+        """
+        Compute a structural fingerprint of a normalized SQL statement.
+        
+        MyBatis parameters, string/numeric literals and whitespace are
+        stripped, so statements that only differ in those share a fingerprint.
+        
+        Args:
+            sql (str): Normalized SQL statement
+            
+        Returns:
+            str: Hex digest identifying the statement structure
+        """
+        if not sql:
+            return ""
+        
+        # 参数占位符 #{...} / ${...}
+        structure = re.sub(r'[#$]\{[^}]*\}', '?', sql)
+        
+        # 字符串和数值字面量
+        structure = re.sub(r"'(?:[^']|'')*'", '?', structure)
+        structure = re.sub(r'(?<![\w.])\d+(?:\.\d+)?(?![\w.])', '?', structure)
+        
+        # IN ( ?, ?, ? ) 之类的参数列表折叠为单个占位符
+        structure = re.sub(r'\?(?:\s*,\s*\?)+', '?', structure)
+        
+        structure = re.sub(r'\s+', ' ', structure).strip()
+        
+        return hashlib.sha1(structure.encode('utf-8')).hexdigest()
+    
     def extract_subqueries(self, sql, depth=0):
         """
         Extract and process subqueries from SQL statement.
@@ -285,7 +324,7 @@ class SqlParser:
             
             results = []
             
-            for sql_id, sql, line_info in statements:
+            for sql_id, sql, line_info, statement_type, mapper_namespace, line in statements:
                 # 恢复保护的关键字
                 for keyword, replacement in protected_keywords.items():
                     sql = re.sub(r'\b' + replacement + r'\b', keyword, sql, flags=re.IGNORECASE)
@@ -302,9 +341,13 @@ class SqlParser:
                 # 添加到结果集
                 results.append({
                     'sql_id': sql_id,
+                    'namespace': mapper_namespace,
+                    'statement_type': statement_type,
                     'sql': sql,
+                    'fingerprint': self.fingerprint_sql(sql),
                     'absolute_path': file_path,
                     'relative_path': relative_path,
+                    'line': line,
                     'line_info': line_info
                 })
                 
@@ -0,0 +1,120 @@
+"""
+Statement Classifier module.
+Cheaply classifies SQL statements before relationship extraction.
+"""
+import re
+import logging
+
+
+class StatementClassifier:
+    """
+    First-tier classifier for SQL statements.
+    Counts table references and qualified equality predicates with a few
+    regular expressions so trivial statements can skip the full extractor.
+    """
+
+    # No qualified equality predicate: no relationship can be produced
+    TIER_SKIP = 'skip'
+    # Single table reference without JOIN/subquery/UNION: WHERE extraction only
+    TIER_SIMPLE = 'simple'
+    # Multi-table statements: full RelationshipExtractor
+    TIER_FULL = 'full'
+
+    TIERS = (TIER_SKIP, TIER_SIMPLE, TIER_FULL)
+
+    # x.y = z.w, the only shape the extractor turns into a relationship
+    PREDICATE_PATTERN = re.compile(
+        r'[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+\s*=\s*[a-zA-Z0-9_]+\.[a-zA-Z0-9_]+'
+    )
+
+    # Constructs that require the full extractor
+    ESCALATE_PATTERN = re.compile(r'JOIN|\bUNION\b|\(\s*SELECT\b', re.IGNORECASE)
+
+    # FROM list up to the next clause keyword
+    FROM_PATTERN = re.compile(
+        r'\bFROM\s+(.+?)(?=\s+(?:WHERE|JOIN|LEFT|RIGHT|INNER|OUTER|FULL|CROSS|GROUP|ORDER|'
+        r'HAVING|LIMIT|UNION|FOR|ON)\b|\)|$)',
+        re.IGNORECASE
+    )
+
+    # Single-table references introduced by other keywords
+    TABLE_KEYWORD_PATTERN = re.compile(
+        r'\b(?:JOIN|UPDATE|INTO)\s+([a-zA-Z0-9_\.]+)',
+        re.IGNORECASE
+    )
+
+    # FROM inside EXTRACT(... FROM col) / TRIM(... FROM col) is not a table
+    NON_TABLE_FROM_PREFIXES = {
+        'year', 'month', 'day', 'hour', 'minute', 'second',
+        'both', 'leading', 'trailing'
+    }
+
+    IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_\.]*$')
+
+    def __init__(self):
+        """Initialize the statement classifier."""
+        self.logger = logging.getLogger(__name__)
+
+    def classify(self, sql):
+        """
+        Classify a SQL statement into an extraction tier.
+
+        Args:
+            sql (str): Normalized SQL statement
+
+        Returns:
+            str: One of TIER_SKIP, TIER_SIMPLE or TIER_FULL
+        """
+        if not sql or not self.PREDICATE_PATTERN.search(sql):
+            return self.TIER_SKIP
+
+        if self.ESCALATE_PATTERN.search(sql):
+            return self.TIER_FULL
+
+        if len(set(self.table_references(sql))) > 1:
+            return self.TIER_FULL
+
+        return self.TIER_SIMPLE
+
+    def count_predicates(self, sql):
+        """
+        Count qualified equality predicates (x.y = z.w).
+
+        Args:
+            sql (str): Normalized SQL statement
+
+        Returns:
+            int: Number of predicates
+        """
+        return len(self.PREDICATE_PATTERN.findall(sql or ''))
+
+    def table_references(self, sql):
+        """
+        List the tables a statement references, in order of appearance.
+
+        Args:
+            sql (str): Normalized SQL statement
+
+        Returns:
+            list: Lower-cased table names (may contain duplicates)
+        """
+        if not sql:
+            return []
+
+        references = []
+
+        for match in self.FROM_PATTERN.finditer(sql):
+            preceding = sql[max(0, match.start() - 16):match.start()].split()
+            if preceding and preceding[-1].lower() in self.NON_TABLE_FROM_PREFIXES:
+                continue
+
+            # FROM a x, b y -> ['a', 'b']
+            for index, item in enumerate(match.group(1).split(',')):
+                words = item.split()
+                if words and self.IDENTIFIER_PATTERN.match(words[0]):
+                    references.append((match.start(1), index, words[0].lower()))
+
+        for match in self.TABLE_KEYWORD_PATTERN.finditer(sql):
+            references.append((match.start(1), 0, match.group(1).lower()))
+
+        return [table for _, _, table in sorted(references)]
@@ -0,0 +1,119 @@
+"""
+Statement Index module.
+Inverted index from table names to the mapper statements that reference them.
+"""
+import logging
+
+
+class StatementIndex:
+    """
+    Reverse index for impact analysis: table name -> mapper statements.
+
+    Statements are stored once in a list; the index maps each table to the
+    ids (list positions) of the statements referencing it, so a lookup is a
+    single dictionary access.
+    """
+
+    # Statement metadata kept in the index
+    FIELDS = ('namespace', 'sql_id', 'statement_type', 'file', 'line')
+
+    def __init__(self):
+        """Initialize an empty statement index."""
+        self.logger = logging.getLogger(__name__)
+        self.statements = []
+        self.tables = {}
+
+    def __contains__(self, table):
+        return table.lower() in self.tables
+
+    def __len__(self):
+        return len(self.tables)
+
+    def add_statement(self, sql_data, tables):
+        """
+        Add a parsed statement and the tables it references.
+
+        Args:
+            sql_data (dict): SQL data from the parser
+            tables (list): Table names referenced by the statement
+
+        Returns:
+            int: Statement id
+        """
+        statement_id = len(self.statements)
+        self.statements.append({
+            'namespace': sql_data.get('namespace', ''),
+            'sql_id': sql_data.get('sql_id', 'unknown'),
+            'statement_type': sql_data.get('statement_type', ''),
+            'file': sql_data.get('file_path') or sql_data.get('absolute_path') or sql_data.get('relative_path', ''),
+            'line': sql_data.get('line', 0)
+        })
+
+        for table in dict.fromkeys(t.lower() for t in tables):
+            self.tables.setdefault(table, []).append(statement_id)
+
+        return statement_id
+
+    def lookup(self, table):
+        """
+        Get all statements referencing a table.
+
+        Args:
+            table (str): Table name
+
+        Returns:
+            list: Statement metadata dicts, empty for unknown tables
+        """
+        return [self.statements[i] for i in self.tables.get(table.lower(), [])]
+
+    def statement(self, statement_id):
+        """
+        Get the metadata of one statement.
+
+        Args:
+            statement_id (int): Statement id
+
+        Returns:
+            dict: Statement metadata
+        """
+        return self.statements[statement_id]
+
+    def table_names(self):
+        """
+        Get all indexed table names.
+
+        Returns:
+            list: Sorted table names
+        """
+        return sorted(self.tables)
+
+    def to_dict(self):
+        """
+        Convert the index into a JSON-serializable dictionary.
+
+        Returns:
+            dict: 'statements' (metadata list) and 'tables' (table -> statement ids)
+        """
+        return {
+            'statements': self.statements,
+            'tables': {table: self.tables[table] for table in sorted(self.tables)}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Restore an index saved with to_dict().
+
+        Args:
+            data (dict): Serialized index
+
+        Returns:
+            StatementIndex: Restored index
+        """
+        index = cls()
+        index.statements = [
+            {field: statement.get(field) for field in cls.FIELDS}
+            for statement in data.get('statements', [])
+        ]
+        index.tables = {table: list(ids) for table, ids in data.get('tables', {}).items()}
+        return index
@@ -0,0 +1,251 @@
+"""
+SVG Renderer module.
+Renders ER diagrams to SVG locally, without a PlantUML server.
+"""
+import logging
+from xml.sax.saxutils import escape, quoteattr
+from core.layout_engine import LayoutEngine
+
+
+class SvgRenderer:
+    """
+    Pure Python ER diagram renderer.
+
+    Entities are drawn as boxes (name header plus one line per field) and
+    relationships as arrows between box borders. Output is produced as a
+    stream of SVG fragments, so large diagrams can be written without
+    building the whole document in memory.
+    """
+
+    CHAR_WIDTH = 7.2       # monospace 12px
+    LINE_HEIGHT = 16
+    HEADER_HEIGHT = 24
+    PADDING = 8
+    MIN_WIDTH = 100
+    MARGIN = 20
+
+    STYLE = (
+        '.entity rect.box{fill:#fefece;stroke:#a80036;stroke-width:1}'
+        '.entity rect.header{fill:#f3e6a8;stroke:#a80036;stroke-width:1}'
+        '.entity text{font-family:monospace;font-size:12px;fill:#000}'
+        '.entity text.name{font-weight:bold}'
+        '.entity text.pk{text-decoration:underline}'
+        '.relationship line{stroke:#a80036;stroke-width:1}'
+        '.relationship text{font-family:sans-serif;font-size:10px;fill:#555}'
+    )
+
+    def __init__(self):
+        """Initialize the SVG renderer."""
+        self.logger = logging.getLogger(__name__)
+        self.layout_engine = LayoutEngine(mode='grid')
+
+    def box_size(self, entity_name, entity):
+        """
+        Compute the size of an entity box.
+
+        Args:
+            entity_name (str): Entity name
+            entity (dict): Entity with 'fields' and 'primary_key'
+
+        Returns:
+            tuple: (width, height)
+        """
+        longest = max([len(entity_name)] + [len(field) + 2 for field in entity['fields']])
+        width = max(self.MIN_WIDTH, longest * self.CHAR_WIDTH + 2 * self.PADDING)
+        height = self.HEADER_HEIGHT + len(entity['fields']) * self.LINE_HEIGHT + self.PADDING
+        return width, height
+
+    def grid_layout(self, entities, relationships):
+        """
+        Place entity boxes on a grid, keeping joined tables close together.
+
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+
+        Returns:
+            dict: Entity name -> [x, y] of the box's top-left corner
+        """
+        return self.layout_engine.layout(entities, relationships, self.box_sizes(entities), mode='grid')['positions']
+
+    def box_sizes(self, entities):
+        """
+        Compute the box sizes of all entities.
+
+        Args:
+            entities (dict): Dictionary of entities
+
+        Returns:
+            dict: Entity name -> (width, height)
+        """
+        return {name: self.box_size(name, entity) for name, entity in entities.items()}
+
+    def render(self, entities, relationships, positions=None):
+        """
+        Render an ER diagram to an SVG string.
+
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+            positions (dict): Entity name -> (x, y) top-left corner, as computed
+                by LayoutEngine; a grid layout is used when omitted
+
+        Returns:
+            str: SVG document
+        """
+        return ''.join(self.iter_svg(entities, relationships, positions))
+
+    def write_svg(self, target, entities, relationships, positions=None):
+        """
+        Stream an ER diagram as SVG to a file path or text stream.
+
+        Args:
+            target: File path (str) or object with write()
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+            positions (dict): Entity name -> (x, y) top-left corner
+
+        Returns:
+            int: Number of characters written
+        """
+        if isinstance(target, str):
+            with open(target, 'w', encoding='utf-8') as f:
+                return self.write_svg(f, entities, relationships, positions)
+
+        written = 0
+        for chunk in self.iter_svg(entities, relationships, positions):
+            target.write(chunk)
+            written += len(chunk)
+        return written
+
+    def iter_svg(self, entities, relationships, positions=None):
+        """
+        Render an ER diagram as a stream of SVG fragments.
+
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+            positions (dict): Entity name -> (x, y) top-left corner, as computed
+                by LayoutEngine; a grid layout is used when omitted
+
+        Yields:
+            str: SVG fragments
+        """
+        if positions is None:
+            positions = self.grid_layout(entities, relationships)
+
+        boxes = {}
+        for name, entity in entities.items():
+            if name not in positions:
+                continue
+            x, y = positions[name]
+            width, height = self.box_size(name, entity)
+            boxes[name] = (x, y, width, height)
+
+        width = max((x + w for x, _, w, _ in boxes.values()), default=0) + self.MARGIN
+        height = max((y + h for _, y, _, h in boxes.values()), default=0) + self.MARGIN
+        min_x = min((x for x, _, _, _ in boxes.values()), default=0) - self.MARGIN
+        min_y = min((y for _, y, _, _ in boxes.values()), default=0) - self.MARGIN
+
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width - min_x:.0f}" height="{height - min_y:.0f}" '
+               f'viewBox="{min_x:.0f} {min_y:.0f} {width - min_x:.0f} {height - min_y:.0f}">\n')
+        yield (f'<defs><style>{self.STYLE}</style>'
+               '<marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+               'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="#a80036"/></marker></defs>\n')
+
+        # Relationships first, so entity boxes are drawn on top of the lines
+        yield '<g class="relationships">\n'
+        drawn = set()
+        for rel in relationships:
+            source, target = rel['source_table'], rel['target_table']
+            rel_id = (source, rel['source_field'], target, rel['target_field'])
+            if rel_id in drawn or source not in boxes or target not in boxes or source == target:
+                continue
+            drawn.add(rel_id)
+            yield self._relationship(boxes[source], boxes[target], f"{rel['source_field']} = {rel['target_field']}")
+        yield '</g>\n'
+
+        yield '<g class="entities">\n'
+        for name, entity in entities.items():
+            if name in boxes:
+                yield self._entity(name, entity, boxes[name])
+        yield '</g>\n'
+        yield '</svg>\n'
+
+    def _entity(self, name, entity, box):
+        """
+        Render one entity box.
+
+        Args:
+            name (str): Entity name
+            entity (dict): Entity with 'fields' and 'primary_key'
+            box (tuple): (x, y, width, height)
+
+        Returns:
+            str: SVG group
+        """
+        x, y, width, height = box
+        parts = [
+            f'<g class="entity" id={quoteattr("entity-" + name)}>',
+            f'<rect class="box" x="{x:.1f}" y="{y:.1f}" width="{width:.1f}" height="{height:.1f}"/>',
+            f'<rect class="header" x="{x:.1f}" y="{y:.1f}" width="{width:.1f}" height="{self.HEADER_HEIGHT}"/>',
+            f'<text class="name" x="{x + width / 2:.1f}" y="{y + 16:.1f}" text-anchor="middle">{escape(name)}</text>'
+        ]
+
+        primary_key = entity['primary_key']
+        fields = ([primary_key] if primary_key in entity['fields'] else []) + \
+            [field for field in entity['fields'] if field != primary_key]
+
+        for i, field in enumerate(fields):
+            text_y = y + self.HEADER_HEIGHT + (i + 1) * self.LINE_HEIGHT - 3
+            css_class = ' class="pk"' if field == primary_key else ''
+            parts.append(f'<text{css_class} x="{x + self.PADDING:.1f}" y="{text_y:.1f}">{escape(field)}</text>')
+
+        parts.append('</g>\n')
+        return ''.join(parts)
+
+    def _relationship(self, source_box, target_box, label):
+        """
+        Render one relationship arrow between two boxes.
+
+        Args:
+            source_box (tuple): (x, y, width, height) of the source entity
+            target_box (tuple): (x, y, width, height) of the target entity
+            label (str): Join columns
+
+        Returns:
+            str: SVG group
+        """
+        x1, y1 = self._border_point(source_box, target_box)
+        x2, y2 = self._border_point(target_box, source_box)
+
+        return (f'<g class="relationship"><line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                f'marker-end="url(#arrow)"/>'
+                f'<text x="{(x1 + x2) / 2:.1f}" y="{(y1 + y2) / 2 - 3:.1f}" text-anchor="middle">'
+                f'{escape(label)}</text></g>\n')
+
+    def _border_point(self, box, towards):
+        """
+        Find where the line from a box center towards another box leaves the box.
+
+        Args:
+            box (tuple): (x, y, width, height)
+            towards (tuple): (x, y, width, height) of the other box
+
+        Returns:
+            tuple: (x, y) on the border of box
+        """
+        x, y, width, height = box
+        cx, cy = x + width / 2, y + height / 2
+        tx, ty = towards[0] + towards[2] / 2, towards[1] + towards[3] / 2
+        dx, dy = tx - cx, ty - cy
+
+        if dx == 0 and dy == 0:
+            return cx, cy
+
+        scale = min(
+            (width / 2) / abs(dx) if dx else float('inf'),
+            (height / 2) / abs(dy) if dy else float('inf')
+        )
+        return cx + dx * scale, cy + dy * scale
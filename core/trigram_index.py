@@ -0,0 +1,211 @@
+"""
+Trigram Index module.
+Substring search over the normalized SQL of all mapper statements.
+"""
+import logging
+import re
+from array import array
+
+
+class TrigramIndex:
+    """
+    Trigram full-text index over statement texts.
+
+    Texts are lower-cased and stripped of whitespace before indexing, so
+    `count(*)`, `COUNT ( * )` and `count (*)` all match each other. Every
+    trigram maps to the sorted ids of the statements containing it; a query
+    intersects the postings of its trigrams (rarest first) and verifies the
+    few remaining candidates with a substring check.
+    """
+
+    SNIPPET_CONTEXT = 40
+
+    def __init__(self, statement_index=None):
+        """
+        Initialize an empty trigram index.
+
+        Args:
+            statement_index (StatementIndex): Index resolving statement ids to
+                statement metadata
+        """
+        self.logger = logging.getLogger(__name__)
+        self.statement_index = statement_index
+        self.texts = {}
+        self._keys = {}
+        self._postings = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, statement_id, text):
+        """
+        Index the text of a statement.
+
+        Statement ids must be added in increasing order.
+
+        Args:
+            statement_id (int): Statement id
+            text (str): Normalized SQL
+        """
+        key = self._normalize(text)
+        self.texts[statement_id] = text
+        self._keys[statement_id] = key
+
+        for trigram in set(key[i:i + 3] for i in range(len(key) - 2)):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[trigram] = array('l')
+            postings.append(statement_id)
+
+    def search(self, query, limit=50):
+        """
+        Find the statements containing a text fragment.
+
+        Args:
+            query (str): Fragment to search (case and whitespace insensitive)
+            limit (int): Maximum number of hits (None for all)
+
+        Returns:
+            list: Hits with the statement metadata (or 'statement_id' when no
+                StatementIndex is attached) and a 'snippet' around the match
+        """
+        key = self._normalize(query)
+        if not key:
+            return []
+
+        hits = []
+        for statement_id in self._candidates(key):
+            if key not in self._keys[statement_id]:
+                continue
+            hits.append(self._describe(statement_id, key))
+            if limit is not None and len(hits) >= limit:
+                break
+
+        return hits
+
+    def to_dict(self):
+        """
+        Convert the index into a JSON-serializable dictionary.
+
+        Only the statement texts are stored; postings are rebuilt in linear
+        time by from_dict(), which keeps saved results small.
+
+        Returns:
+            dict: 'texts' (statement id -> normalized SQL)
+        """
+        return {'texts': {str(statement_id): text for statement_id, text in sorted(self.texts.items())}}
+
+    @classmethod
+    def from_dict(cls, data, statement_index=None):
+        """
+        Restore an index saved with to_dict().
+
+        Args:
+            data (dict): Serialized index
+            statement_index (StatementIndex): Index resolving statement ids
+
+        Returns:
+            TrigramIndex: Restored index
+        """
+        index = cls(statement_index)
+        texts = sorted((int(statement_id), text) for statement_id, text in data.get('texts', {}).items())
+        for statement_id, text in texts:
+            index.add(statement_id, text)
+        return index
+
+    def _candidates(self, key):
+        """
+        Get the statements that may contain a normalized query.
+
+        Args:
+            key (str): Normalized query
+
+        Returns:
+            iterable: Candidate statement ids in increasing order
+        """
+        if len(key) < 3:
+            # Too short for a trigram: scan every statement
+            return sorted(self._keys)
+
+        trigrams = set(key[i:i + 3] for i in range(len(key) - 2))
+        postings = []
+        for trigram in trigrams:
+            ids = self._postings.get(trigram)
+            if ids is None:
+                return []
+            postings.append(ids)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+
+        return sorted(candidates)
+
+    def _describe(self, statement_id, key):
+        """
+        Build the search hit of a statement.
+
+        Args:
+            statement_id (int): Statement id
+            key (str): Normalized query
+
+        Returns:
+            dict: Statement metadata plus a snippet of the matched text
+        """
+        if self.statement_index is None:
+            hit = {'statement_id': statement_id}
+        else:
+            hit = dict(self.statement_index.statement(statement_id))
+        hit['snippet'] = self._snippet(statement_id, key)
+        return hit
+
+    def _snippet(self, statement_id, key):
+        """
+        Cut the text around the first match of a normalized query.
+
+        Args:
+            statement_id (int): Statement id
+            key (str): Normalized query
+
+        Returns:
+            str: Snippet of the original text
+        """
+        text = self.texts[statement_id]
+        offset = self._keys[statement_id].find(key)
+
+        # Map offsets in the whitespace-free key back to the original text
+        start = end = None
+        seen = 0
+        for position, char in enumerate(text):
+            if char.isspace():
+                continue
+            if seen == offset:
+                start = position
+            if seen == offset + len(key) - 1:
+                end = position + 1
+                break
+            seen += 1
+
+        if start is None or end is None:
+            return text[:2 * self.SNIPPET_CONTEXT]
+
+        snippet_start = max(0, start - self.SNIPPET_CONTEXT)
+        snippet_end = min(len(text), end + self.SNIPPET_CONTEXT)
+        prefix = '...' if snippet_start > 0 else ''
+        suffix = '...' if snippet_end < len(text) else ''
+        return f"{prefix}{text[snippet_start:snippet_end]}{suffix}"
+
+    def _normalize(self, text):
+        """
+        Normalize text for indexing and querying.
+
+        Args:
+            text (str): Text
+
+        Returns:
+            str: Lower-cased text without whitespace
+        """
+        return re.sub(r'\s+', '', (text or '').lower())
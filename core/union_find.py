@@ -0,0 +1,118 @@
+"""
+Union-Find module.
+Disjoint-set structure used for key domains and graph partitioning.
+"""
+
+
+class UnionFind:
+    """
+    Disjoint-set forest with union by size and path halving.
+    Elements are added lazily the first time they are seen.
+    """
+
+    def __init__(self):
+        """Initialize an empty disjoint-set forest."""
+        self._parent = {}
+        self._size = {}
+
+    def __contains__(self, item):
+        return item in self._parent
+
+    def __len__(self):
+        return len(self._parent)
+
+    def add(self, item):
+        """
+        Add an element as its own singleton set.
+
+        Args:
+            item: Hashable element
+        """
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+
+    def find(self, item):
+        """
+        Find the representative of an element's set.
+
+        Args:
+            item: Hashable element
+
+        Returns:
+            Representative element
+        """
+        self.add(item)
+        parent = self._parent
+
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+
+        return item
+
+    def union(self, first, second):
+        """
+        Merge the sets containing two elements.
+
+        Args:
+            first: Hashable element
+            second: Hashable element
+
+        Returns:
+            Representative of the merged set
+        """
+        root_a = self.find(first)
+        root_b = self.find(second)
+
+        if root_a == root_b:
+            return root_a
+
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+
+        return root_a
+
+    def connected(self, first, second):
+        """
+        Check whether two elements are in the same set.
+
+        Args:
+            first: Hashable element
+            second: Hashable element
+
+        Returns:
+            bool: True if both elements share a representative
+        """
+        if first not in self._parent or second not in self._parent:
+            return False
+        return self.find(first) == self.find(second)
+
+    def set_size(self, item):
+        """
+        Get the size of the set containing an element.
+
+        Args:
+            item: Hashable element
+
+        Returns:
+            int: Number of elements in the set
+        """
+        return self._size[self.find(item)]
+
+    def groups(self):
+        """
+        Group all elements by set.
+
+        Returns:
+            dict: Mapping of representative to list of members
+        """
+        groups = {}
+
+        for item in self._parent:
+            groups.setdefault(self.find(item), []).append(item)
+
+        return groups
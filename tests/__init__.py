@@ -1 +1,15 @@
- 
\ No newline at end of file
+"""
+Shared test helpers.
+"""
+
+
+def make_relationship(source_table, source_field, target_table, target_field, occurrences=1):
+    """Build a normalized relationship dict as produced by the Normalizer."""
+    return {
+        'source_table': source_table,
+        'source_field': source_field,
+        'target_table': target_table,
+        'target_field': target_field,
+        'relationship_type': 'JOIN',
+        'occurrences': occurrences
+    }
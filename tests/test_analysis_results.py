@@ -0,0 +1,44 @@
+"""
+Unit tests for AnalysisResults.
+"""
+import unittest
+from core.analysis_results import AnalysisResults
+
+
+class TestAnalysisResults(unittest.TestCase):
+    """Test cases for AnalysisResults."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calls = []
+
+        def diagram_lines(results):
+            self.calls.append(1)
+            return iter(['@startuml'] + [f'entity {name}' for name in results['entities']] + ['@enduml'])
+
+        self.results = AnalysisResults(diagram_lines, {'entities': {'orders': {}}, 'relationships': []})
+
+    def test_diagram_generated_on_access(self):
+        """Test that the diagram is built from the current results and not stored."""
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.results['diagram'], '@startuml\nentity orders\n@enduml')
+        self.assertNotIn('diagram', list(self.results))
+
+        self.results['entities']['customer'] = {}
+        self.assertIn('entity customer', self.results.get('diagram'))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_behaves_like_dict(self):
+        """Test lookups of other keys and an explicitly set diagram."""
+        self.assertIn('diagram', self.results)
+        self.assertIsNone(self.results.get('layout'))
+        with self.assertRaises(KeyError):
+            self.results['layout']
+
+        self.results['diagram'] = '@startuml\n@enduml'
+        self.assertEqual(self.results['diagram'], '@startuml\n@enduml')
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
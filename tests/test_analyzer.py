@@ -0,0 +1,78 @@
+"""
+Unit tests for Analyzer.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from core.analyzer import Analyzer
+from core.column_index import ColumnIndex
+from utils.exporter import Exporter
+
+
+MAPPER = """<?xml version="1.0" encoding="UTF-8"?>
+<mapper namespace="com.example.OrderMapper">
+  <select id="findByCustomer" resultType="map">
+    SELECT o.id FROM orders o
+    JOIN customer c ON o.customer_id = c.id
+    WHERE c.status = #{status}
+  </select>
+  <update id="updateStatus">
+    UPDATE orders SET status = #{status} WHERE id = #{id}
+  </update>
+</mapper>
+"""
+
+
+class TestAnalyzer(unittest.TestCase):
+    """Test cases for Analyzer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, 'OrderMapper.xml'), 'w', encoding='utf-8') as f:
+            f.write(MAPPER)
+        self.analyzer = Analyzer()
+        self.results = self.analyzer.analyze_directory(self.temp_dir, column_usages=True)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_results_restores_indexes(self):
+        """Test that lookups on saved results match those on a fresh analysis."""
+        path = Exporter(output_dir=self.temp_dir).export_json(self.results)
+        loaded = self.analyzer.load_results(path)
+
+        self.assertEqual(loaded['entities'], self.results['entities'])
+        self.assertEqual(loaded['diagram'], self.results['diagram'])
+        self.assertEqual(self.analyzer.find_statements(loaded, 'orders'),
+                         self.analyzer.find_statements(self.results, 'orders'))
+        self.assertEqual(len(self.analyzer.find_statements(loaded, 'orders')), 2)
+        self.assertEqual(
+            self.analyzer.find_column_usages(loaded, 'orders', 'customer_id', [ColumnIndex.ROLE_JOIN_ON]),
+            self.analyzer.find_column_usages(self.results, 'orders', 'customer_id', [ColumnIndex.ROLE_JOIN_ON])
+        )
+        self.assertTrue(self.analyzer.find_column_usages(loaded, 'orders', 'customer_id'))
+        self.assertEqual(len(self.analyzer.search_statements(loaded, 'c.status')), 1)
+        self.assertEqual(self.analyzer.search_statements(loaded, 'c.status'),
+                         self.analyzer.search_statements(self.results, 'c.status'))
+        self.assertEqual(self.analyzer.find_join_paths(loaded, 'orders', 'customer'),
+                         self.analyzer.find_join_paths(self.results, 'orders', 'customer'))
+
+    def test_column_usages_opt_in(self):
+        """Test that column usages are only extracted when requested."""
+        analyzer = Analyzer()
+        results = analyzer.analyze_directory(self.temp_dir)
+
+        self.assertIsNone(results['column_index'])
+        self.assertEqual(analyzer.find_column_usages(results, 'orders', 'customer_id'), [])
+        self.assertEqual(results['relationships'], self.results['relationships'])
+
+        # Cached statements get their column usages on the next run that needs them
+        results = analyzer.analyze_directory(self.temp_dir, column_usages=True)
+        self.assertEqual(results['column_index'].to_dict(), self.results['column_index'].to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
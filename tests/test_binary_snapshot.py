@@ -0,0 +1,119 @@
+"""
+Unit tests for BinarySnapshot.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from core.binary_snapshot import BinarySnapshot
+from core.snapshot_diff import SnapshotDiff
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Test cases for BinarySnapshot."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.results = {
+            'entities': {
+                'orders': {'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+                'customer': {'fields': ['id', 'név'], 'primary_key': 'id'},
+                'audit_log': {'fields': [], 'primary_key': None}
+            },
+            'relationships': [
+                {
+                    'source_table': 'orders', 'source_field': 'customer_id',
+                    'target_table': 'customer', 'target_field': 'id',
+                    'relationship_type': 'JOIN', 'source_file': 'OrderMapper.xml (L3-9)',
+                    'occurrences': 2, 'is_potential_fk': True
+                },
+                {
+                    'source_table': 'customer', 'source_field': 'id',
+                    'target_table': 'orders', 'target_field': 'customer_id',
+                    'relationship_type': 'WHERE', 'source_file': 'OrderMapper.xml (L3-9)',
+                    'occurrences': 1
+                }
+            ],
+            'stats': {'total_entities': 3, 'total_relationships': 2},
+            'table_rankings': [{'table': 'orders', 'degree': 2}]
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, results, name='results.snap'):
+        path = os.path.join(self.temp_dir, name)
+        BinarySnapshot.write(path, results)
+        return path
+
+    def test_round_trip(self):
+        """Test that relationships, entities and meta values survive a round trip."""
+        path = self.write(self.results)
+
+        with BinarySnapshot.open(path) as snapshot:
+            self.assertEqual(list(snapshot['relationships']), self.results['relationships'])
+            self.assertEqual(snapshot['relationships'][1], self.results['relationships'][1])
+            self.assertEqual(len(snapshot['relationships']), 2)
+            self.assertEqual(dict(snapshot['entities'].items()), self.results['entities'])
+            self.assertEqual(snapshot['entities']['customer']['fields'], ['id', 'név'])
+            self.assertEqual(snapshot['stats'], self.results['stats'])
+            self.assertEqual(snapshot.get('table_rankings'), self.results['table_rankings'])
+            self.assertIsNone(snapshot.get('layout'))
+
+    def test_strings_stored_once(self):
+        """Test that repeated names share one string table entry."""
+        path = self.write(self.results)
+
+        with BinarySnapshot.open(path) as snapshot:
+            strings = list(snapshot.strings)
+            self.assertEqual(len(strings), len(set(strings)))
+            self.assertEqual(strings.count('OrderMapper.xml (L3-9)'), 1)
+
+    def test_sections_aligned(self):
+        """Test that every section starts on an 8-byte boundary."""
+        path = self.write(self.results)
+
+        with BinarySnapshot.open(path) as snapshot:
+            self.assertTrue(all(offset % 8 == 0 for offset, _ in snapshot._sections.values()))
+
+    def test_empty_results(self):
+        """Test a snapshot without entities or relationships."""
+        path = self.write({'entities': {}, 'relationships': [], 'stats': {}})
+
+        with BinarySnapshot.open(path) as snapshot:
+            self.assertEqual(len(snapshot['relationships']), 0)
+            self.assertEqual(list(snapshot['entities']), [])
+
+    def test_rejects_other_files(self):
+        """Test that non-snapshot buffers are rejected."""
+        with self.assertRaises(ValueError):
+            BinarySnapshot(b'{"entities": [], "relationships": []}')
+
+    def test_diff_matches_json(self):
+        """Test that diffing binary snapshots gives the same result as JSON."""
+        newer = json.loads(json.dumps(self.results))
+        newer['relationships'][0]['occurrences'] = 5
+        newer['relationships'].append({
+            'source_table': 'orders', 'source_field': 'id',
+            'target_table': 'audit_log', 'target_field': 'order_id',
+            'relationship_type': 'JOIN', 'source_file': 'AuditMapper.xml (L1-4)', 'occurrences': 1
+        })
+        newer['entities']['audit_log']['fields'] = ['order_id']
+
+        snapshot_diff = SnapshotDiff()
+        expected = snapshot_diff.diff(self.results, newer)
+
+        old_snapshot = snapshot_diff.load_snapshot(self.write(self.results, 'old.snap'))
+        new_snapshot = snapshot_diff.load_snapshot(self.write(newer, 'new.snap'))
+        self.assertIsInstance(old_snapshot, BinarySnapshot)
+        self.assertEqual(snapshot_diff.diff(old_snapshot, new_snapshot), expected)
+        self.assertEqual(snapshot_diff.diff(self.results, new_snapshot), expected)
+        old_snapshot.close()
+        new_snapshot.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Unit tests for CentralityAnalyzer.
+"""
+import unittest
+from core.centrality import CentralityAnalyzer
+from core.graph_index import GraphIndex
+from tests import make_relationship
+
+
+class TestCentralityAnalyzer(unittest.TestCase):
+    """Test cases for CentralityAnalyzer."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = CentralityAnalyzer()
+        self.index = GraphIndex([
+            make_relationship('order_item', 'order_id', 'orders', 'id', 3),
+            make_relationship('order_item', 'product_id', 'product', 'id'),
+            make_relationship('stock', 'product_id', 'product', 'id'),
+            make_relationship('shipment', 'order_id', 'orders', 'id'),
+            make_relationship('payment', 'order_id', 'orders', 'id', 2),
+            make_relationship('invoice', 'order_id', 'orders', 'id')
+        ])
+    
+    def test_rank_hub_first(self):
+        """Test the most joined table is ranked first."""
+        rankings = self.analyzer.rank(self.index)
+        
+        self.assertEqual(len(rankings), 7)
+        self.assertEqual(rankings[0]['table'], 'orders')
+        self.assertEqual(rankings[0]['degree'], 4)
+        self.assertEqual(rankings[0]['weighted_degree'], 7)
+        self.assertAlmostEqual(sum(r['pagerank'] for r in rankings), 1.0, places=4)
+    
+    def test_python_fallback_matches(self):
+        """Test the pure Python implementation agrees with the default one."""
+        rankings = self.analyzer.rank(self.index)
+        degrees, weighted_degrees, pagerank = self.analyzer._compute_python(self.index)
+        
+        for ranking in rankings:
+            node = self.index.node_ids[ranking['table']]
+            self.assertEqual(ranking['degree'], degrees[node])
+            self.assertAlmostEqual(ranking['weighted_degree'], weighted_degrees[node])
+            self.assertAlmostEqual(ranking['pagerank'], pagerank[node], places=5)
+    
+    def test_rank_empty_graph(self):
+        """Test an empty graph produces no rankings."""
+        self.assertEqual(self.analyzer.rank(GraphIndex([])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Unit tests for ColumnIndex.
+"""
+import unittest
+from core.column_index import ColumnIndex
+from core.statement_index import StatementIndex
+
+
+class TestColumnIndex(unittest.TestCase):
+    """Test cases for ColumnIndex."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.statements = StatementIndex()
+        self.index = ColumnIndex(self.statements)
+        
+        first = self.statements.add_statement({'sql_id': 'listOrders', 'statement_type': 'select'}, ['orders'])
+        self.index.add_usages(first, [
+            ('orders', 'customer_id', ColumnIndex.ROLE_WHERE_EQ),
+            ('orders', 'created_at', ColumnIndex.ROLE_ORDER_BY),
+            ('orders', 'created_at', ColumnIndex.ROLE_ORDER_BY)
+        ])
+        
+        second = self.statements.add_statement({'sql_id': 'recentOrders', 'statement_type': 'select'}, ['orders'])
+        self.index.add_usages(second, [
+            ('orders', 'created_at', ColumnIndex.ROLE_RANGE),
+            ('Orders', 'Created_At', ColumnIndex.ROLE_ORDER_BY)
+        ])
+    
+    def test_lookup(self):
+        """Test postings resolve to statements and are de-duplicated."""
+        usages = self.index.lookup('orders', 'created_at')
+        
+        self.assertEqual(
+            [(u['sql_id'], u['role']) for u in usages],
+            [('listOrders', 'ORDER_BY'), ('recentOrders', 'RANGE'), ('recentOrders', 'ORDER_BY')]
+        )
+        self.assertEqual(len(self.index.lookup('orders', 'created_at', [ColumnIndex.ROLE_RANGE])), 1)
+        self.assertEqual(self.index.lookup('orders', 'unknown'), [])
+        self.assertIn(('orders', 'customer_id'), self.index)
+    
+    def test_summary(self):
+        """Test per-column role counts, most used first."""
+        summary = self.index.summary('orders')
+        
+        self.assertEqual(summary[0]['column'], 'created_at')
+        self.assertEqual(summary[0]['ORDER_BY'], 2)
+        self.assertEqual(summary[0]['total'], 3)
+        self.assertEqual(summary[1]['WHERE_EQ'], 1)
+    
+    def test_round_trip(self):
+        """Test the index survives serialization."""
+        restored = ColumnIndex.from_dict(self.index.to_dict(), self.statements)
+        
+        self.assertEqual(restored.lookup('orders', 'created_at'), self.index.lookup('orders', 'created_at'))
+        self.assertEqual(restored.summary(), self.index.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Unit tests for ArtifactCompressor.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from utils.compression import ArtifactCompressor
+
+
+class TestArtifactCompressor(unittest.TestCase):
+    """Test cases for ArtifactCompressor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.compressor = ArtifactCompressor(min_size=1024, encodings=['gzip'])
+        self.path = os.path.join(self.temp_dir, 'analysis_results.json')
+        self.data = b'{"source_table":"orders","target_table":"customer"},' * 500
+        with open(self.path, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_compress_file(self):
+        """Test that the gzip variant is written next to the file and decompresses to it."""
+        variants = self.compressor.compress_file(self.path)
+
+        self.assertEqual(variants, {'gzip': self.path + '.gz'})
+        with gzip.open(variants['gzip'], 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertLess(os.path.getsize(variants['gzip']), len(self.data) // 10)
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(self.temp_dir)))
+
+    def test_skipped_files(self):
+        """Test that small and already compressed files get no variants."""
+        small = os.path.join(self.temp_dir, 'diagram.puml')
+        image = os.path.join(self.temp_dir, 'diagram.png')
+        with open(small, 'wb') as f:
+            f.write(b'@startuml\n@enduml\n')
+        shutil.copy(self.path, image)
+
+        self.assertEqual(self.compressor.compress_file(small), {})
+        self.assertEqual(self.compressor.compress_file(image), {})
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['analysis_results.json', 'diagram.png', 'diagram.puml'])
+
+    def test_negotiate(self):
+        """Test Accept-Encoding parsing with quality values and wildcards."""
+        negotiate = self.compressor.negotiate
+        self.assertEqual(negotiate('gzip, deflate'), 'gzip')
+        self.assertEqual(negotiate('br;q=1.0, gzip;q=0.8', ['gzip', 'br']), 'br')
+        self.assertEqual(negotiate('gzip;q=0.5, br', ['br', 'gzip']), 'br')
+        self.assertEqual(negotiate('br, zstd', ['br', 'zstd']), 'br')
+        self.assertEqual(negotiate('*'), 'gzip')
+        self.assertEqual(negotiate('x-gzip'), 'gzip')
+        self.assertIsNone(negotiate('gzip;q=0'))
+        self.assertIsNone(negotiate('*, gzip;q=0'))
+        self.assertIsNone(negotiate('identity'))
+        self.assertIsNone(negotiate(''))
+
+    def test_select_variant(self):
+        """Test that the variant is served only when accepted and not stale."""
+        self.assertEqual(self.compressor.select(self.path, 'gzip'), (self.path, None))
+
+        self.compressor.compress_file(self.path)
+        self.assertEqual(self.compressor.select(self.path, 'gzip, br'), (self.path + '.gz', 'gzip'))
+        self.assertEqual(self.compressor.select(self.path, 'br'), (self.path, None))
+
+        stat = os.stat(self.path)
+        os.utime(self.path + '.gz', ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+        self.assertEqual(self.compressor.select(self.path, 'gzip'), (self.path, None))
+
+    def test_compress_bytes(self):
+        """Test on-the-fly compression of a response body."""
+        body = self.compressor.compress_bytes(self.data, 'gzip')
+        self.assertEqual(gzip.decompress(body), self.data)
+        self.assertEqual(body, self.compressor.compress_bytes(self.data, 'gzip'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Unit tests for ExportPipeline.
+"""
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from utils.exporter import Exporter
+from utils.export_pipeline import ExportPipeline
+
+
+class TestExportPipeline(unittest.TestCase):
+    """Test cases for ExportPipeline."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.output_dir = tempfile.mkdtemp()
+        self.exporter = Exporter(output_dir=self.output_dir)
+        self.results = {
+            'entities': {
+                'orders': {'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+                'customer': {'fields': ['id'], 'primary_key': 'id'}
+            },
+            'relationships': [
+                {
+                    'source_table': 'orders', 'source_field': 'customer_id',
+                    'target_table': 'customer', 'target_field': 'id',
+                    'relationship_type': 'JOIN', 'source_file': 'OrderMapper.xml (L3-9)',
+                    'occurrences': 2, 'is_potential_fk': True
+                },
+                {
+                    'source_table': 'customer', 'source_field': 'id',
+                    'target_table': 'orders', 'target_field': 'customer_id',
+                    'relationship_type': 'WHERE', 'source_file': 'CustomerMapper.xml (L5-8)',
+                    'occurrences': 1
+                }
+            ],
+            'key_domains': [],
+            'table_rankings': [{'table': 'customer', 'degree': 2, 'weighted_degree': 3, 'pagerank': 0.5}],
+            'stats': {'total_entities': 2, 'total_relationships': 2, 'hub_tables': []},
+            'diagram': '@startuml\nentity orders\n@enduml'
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.output_dir)
+
+    def read(self, name):
+        with open(os.path.join(self.output_dir, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_single_pass_matches_individual_exports(self):
+        """Test that the pipeline writes the same files as the individual exports."""
+        paths = ExportPipeline(self.exporter).run(
+            self.results,
+            {'plantuml': None, 'svg': None, 'csv': None, 'json': None, 'markdown': None}
+        )
+        self.assertTrue(all(paths.values()))
+        piped = {fmt: self.read(os.path.basename(path)) for fmt, path in paths.items()}
+
+        self.exporter.export_plantuml(self.results['diagram'])
+        self.exporter.export_native_svg(self.results['entities'], self.results['relationships'])
+        self.exporter.export_csv(self.results['relationships'])
+        self.exporter.export_json(self.results)
+        self.exporter.export_markdown(self.results)
+        for fmt, path in paths.items():
+            self.assertEqual(piped[fmt], self.read(os.path.basename(path)), fmt)
+
+    def test_json_is_compact_and_complete(self):
+        """Test that the streamed JSON parses and uses compact separators."""
+        self.results['layout'] = {'mode': 'grid', 'positions': {'orders': [20, 20]}, 'width': 200, 'height': 90}
+        ExportPipeline(self.exporter).run(self.results, {'json': 'out.json'})
+        text = self.read('out.json')
+        data = json.loads(text)
+
+        self.assertNotIn('\n', text)
+        self.assertNotIn(', ', text.split('"relationships"')[1][:80])
+        self.assertEqual(data['relationships'], self.results['relationships'])
+        self.assertEqual([e['name'] for e in data['entities']], ['orders', 'customer'])
+        self.assertEqual(data['layout']['mode'], 'grid')
+        self.assertEqual(data['stats']['total_relationships'], 2)
+
+    def test_ndjson_one_record_per_line(self):
+        """Test that NDJSON has one tagged entity or relationship per line."""
+        paths = ExportPipeline(self.exporter).run(self.results, {'ndjson': None})
+        records = [json.loads(line) for line in self.read('analysis_results.ndjson').splitlines()]
+
+        self.assertTrue(paths['ndjson'].endswith('analysis_results.ndjson'))
+        self.assertEqual([r['type'] for r in records], ['entity', 'entity', 'relationship', 'relationship', 'stats'])
+        self.assertEqual(records[0], {'type': 'entity', 'name': 'orders',
+                                      'fields': ['customer_id', 'id'], 'primary_key': 'id'})
+        self.assertEqual({k: v for k, v in records[2].items() if k != 'type'}, self.results['relationships'][0])
+        self.assertEqual(records[-1]['total_relationships'], 2)
+
+        self.exporter.export_ndjson(self.results, 'single.ndjson')
+        self.assertEqual(self.read('single.ndjson'), self.read('analysis_results.ndjson'))
+
+    def test_stream_to_open_stream(self):
+        """Test writing a format to an open stream such as stdout."""
+        pipeline = ExportPipeline(self.exporter)
+        pipeline.run(self.results, {'json': None})
+
+        stream = io.StringIO()
+        pipeline.stream(self.results, 'json', stream)
+        self.assertEqual(stream.getvalue(), self.read('analysis_results.json'))
+
+        stream = io.StringIO()
+        pipeline.stream(self.results, 'plantuml', stream, diagram=iter(['@startuml', '@enduml']))
+        self.assertEqual(stream.getvalue(), '@startuml\n@enduml\n')
+
+        with self.assertRaises(ValueError):
+            pipeline.stream(self.results, 'png', io.StringIO())
+        self.assertEqual(os.listdir(self.output_dir), ['analysis_results.json'])
+
+    def test_relationships_iterated_once(self):
+        """Test that several record formats share one pass over the relationships."""
+        passes = []
+        relationships = self.results['relationships']
+
+        class CountingList(list):
+            def __iter__(self):
+                passes.append(1)
+                return super().__iter__()
+
+        self.results['relationships'] = CountingList(relationships)
+        ExportPipeline(self.exporter).run(self.results, {'csv': None, 'json': None, 'markdown': None})
+        self.assertEqual(len(passes), 1)
+
+        with open(os.path.join(self.output_dir, 'relationships.csv'), newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][-1], 'Yes')
+
+    def test_rendering_runs_concurrently(self):
+        """Test that slow formats overlap instead of running one after another."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(*args, **kwargs):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.2)
+            with lock:
+                active.pop()
+            return 'done'
+
+        self.exporter.export_plantuml = slow
+        self.exporter.export_native_svg = slow
+        self.exporter.export_html = slow
+
+        start = time.perf_counter()
+        paths = ExportPipeline(self.exporter).run(self.results, {'plantuml': None, 'svg': None, 'html': None, 'csv': None})
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(paths['html'], 'done')
+        self.assertEqual(max(peak), 3)
+        self.assertLess(elapsed, 0.5)
+
+    def test_failed_writer_does_not_stop_others(self):
+        """Test that one failing format is reported as None while the rest are written."""
+        del self.results['relationships'][1]['source_file']
+        paths = ExportPipeline(self.exporter).run(self.results, {'csv': None, 'json': None, 'markdown': None})
+
+        self.assertIsNone(paths['csv'])
+        self.assertIsNone(paths['markdown'])
+        self.assertEqual(os.listdir(self.output_dir), ['analysis_results.json'])
+        self.assertEqual(len(json.loads(self.read('analysis_results.json'))['relationships']), 2)
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with self.assertRaises(ValueError):
+            ExportPipeline(self.exporter).run(self.results, {'xlsx': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for ExtractionCache.
+"""
+import unittest
+from core.extraction_cache import ExtractionCache
+
+
+class TestExtractionCache(unittest.TestCase):
+    """Test cases for ExtractionCache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = ExtractionCache(max_size=2)
+        self.relationship = {
+            'source_table': 'user',
+            'source_field': 'department_id',
+            'target_table': 'department',
+            'target_field': 'id',
+            'relationship_type': 'JOIN',
+            'source_file': 'UserMapper.xml (L10-30)'
+        }
+    
+    def test_get_and_put(self):
+        """Test cached entries drop the statement-specific source file."""
+        self.assertIsNone(self.cache.get('fp1'))
+        
+        self.cache.put('fp1', [self.relationship])
+        cached = self.cache.get('fp1')
+        
+        self.assertEqual(len(cached), 1)
+        self.assertNotIn('source_file', cached[0])
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+    
+    def test_lookup_column_usages(self):
+        """Test column usages are cached alongside relationships."""
+        self.cache.put('fp1', [self.relationship], [('user', 'id', 'WHERE_EQ')])
+        relationships, column_usages = self.cache.lookup('fp1')
+        
+        self.assertEqual(relationships[0]['target_table'], 'department')
+        self.assertEqual(column_usages, (('user', 'id', 'WHERE_EQ'),))
+    
+    def test_lru_eviction(self):
+        """Test the least recently used fingerprint is evicted first."""
+        self.cache.put('fp1', [])
+        self.cache.put('fp2', [])
+        self.cache.get('fp1')
+        self.cache.put('fp3', [])
+        
+        self.assertIsNotNone(self.cache.get('fp1'))
+        self.assertIsNone(self.cache.get('fp2'))
+        self.assertEqual(self.cache.stats()['size'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Unit tests for GraphIndex.
+"""
+import unittest
+from core.graph_index import GraphIndex
+from tests import make_relationship
+
+
+class TestGraphIndex(unittest.TestCase):
+    """Test cases for GraphIndex."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = GraphIndex([
+            make_relationship('order_item', 'order_id', 'orders', 'id', 3),
+            make_relationship('order_item', 'product_id', 'product', 'id'),
+            make_relationship('stock', 'product_id', 'product', 'id'),
+            make_relationship('stock', 'warehouse_id', 'warehouse', 'id'),
+            make_relationship('shipment', 'order_id', 'orders', 'id'),
+            make_relationship('shipment', 'warehouse_id', 'warehouse', 'id'),
+            make_relationship('region', 'id', 'warehouse', 'region_id')
+        ])
+    
+    def test_csr_structure(self):
+        """Test the CSR arrays describe an undirected graph."""
+        self.assertEqual(len(self.index), 7)
+        self.assertEqual(self.index.edge_count, 7)
+        self.assertEqual(len(self.index.indptr), 8)
+        self.assertEqual(len(self.index.indices), 14)
+        self.assertEqual(sorted(self.index.neighbors('warehouse')), ['region', 'shipment', 'stock'])
+        self.assertEqual(self.index.degree('orders'), 2)
+    
+    def test_shortest_join_path(self):
+        """Test the cheapest path prefers frequently used joins."""
+        paths = self.index.join_path('order_item', 'warehouse', k=1)
+        
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(paths[0]['tables'], ['order_item', 'orders', 'shipment', 'warehouse'])
+        self.assertEqual(paths[0]['hops'][0]['joins'][0]['source_field'], 'order_id')
+    
+    def test_k_shortest_join_paths(self):
+        """Test alternative paths are returned in cost order."""
+        paths = self.index.join_path('order_item', 'warehouse', k=5)
+        
+        self.assertEqual(len(paths), 2)
+        self.assertEqual(paths[1]['tables'], ['order_item', 'product', 'stock', 'warehouse'])
+        self.assertLessEqual(paths[0]['cost'], paths[1]['cost'])
+    
+    def test_neighborhood(self):
+        """Test k-hop neighborhoods expand breadth-first from the center."""
+        self.assertEqual(self.index.neighborhood('region', 0), ['region'])
+        self.assertEqual(self.index.neighborhood('region', 1), ['region', 'warehouse'])
+        self.assertEqual(
+            sorted(self.index.neighborhood('region', 2)),
+            ['region', 'shipment', 'stock', 'warehouse']
+        )
+        self.assertEqual(self.index.neighborhood('missing', 2), [])
+    
+    def test_unknown_or_unreachable_tables(self):
+        """Test queries on unknown tables return no paths."""
+        self.assertEqual(self.index.join_path('order_item', 'missing'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Unit tests for HtmlReport.
+"""
+import io
+import json
+import re
+import unittest
+from core.statement_index import StatementIndex
+from utils.html_report import HtmlReport
+
+
+class TestHtmlReport(unittest.TestCase):
+    """Test cases for HtmlReport."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        table_index = StatementIndex()
+        table_index.add_statement({'namespace': 'com.example.OrderMapper', 'sql_id': 'findAll',
+                                   'statement_type': 'select', 'file_path': 'OrderMapper.xml', 'line': 3},
+                                  ['orders', 'customer'])
+        self.results = {
+            'entities': {
+                'orders': {'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+                'customer': {'fields': ['id'], 'primary_key': 'id'},
+                'x</script>': {'fields': ['id'], 'primary_key': 'id'}
+            },
+            'relationships': [{
+                'source_table': 'orders', 'source_field': 'customer_id',
+                'target_table': 'customer', 'target_field': 'id',
+                'relationship_type': 'JOIN', 'source_file': 'OrderMapper.xml (L3-9)', 'occurrences': 1
+            }],
+            'table_rankings': [{'table': 'customer', 'degree': 1, 'weighted_degree': 1, 'pagerank': 0.5}],
+            'table_index': table_index,
+            'stats': {'total_entities': 3, 'total_relationships': 1, 'hub_tables': []}
+        }
+    
+    def render(self):
+        return ''.join(HtmlReport().iter_html(self.results))
+    
+    def test_embedded_data(self):
+        """Test that the embedded data decodes and covers tables, fields and statements."""
+        page = self.render()
+        payload = re.search(r'<script type="application/json" id="report-data">(.*?)</script>', page, re.S).group(1)
+        data = json.loads(payload)
+        
+        strings = data['graph']['strings']
+        names = [strings[i] for i in data['graph']['nodes']]
+        self.assertEqual(names, ['orders', 'customer', 'x</script>'])
+        self.assertEqual(strings[data['fields'][0][0]], 'id')
+        self.assertEqual(data['statements'][0][:2], ['com.example.OrderMapper', 'findAll'])
+        self.assertEqual(data['table_statements'][str(names.index('customer'))], [0])
+        self.assertEqual(data['partition_of'], [1, 1, 1])
+    
+    def test_diagrams_are_inert_until_opened(self):
+        """Test that each partition diagram is embedded as plain text SVG."""
+        page = self.render()
+        
+        self.assertEqual(page.count('<script type="text/plain" id="diagram-1"><svg'), 1)
+        self.assertNotIn('<?xml', page)
+        # The only closing script tags are the ones of the report itself
+        self.assertEqual(page.count('</script>'), 3)
+    
+    def test_write(self):
+        """Test that the report can be streamed to a file object path."""
+        buffer = io.StringIO()
+        for chunk in HtmlReport().iter_html(self.results, title='A & B'):
+            buffer.write(chunk)
+        self.assertIn('<title>A &amp; B</title>', buffer.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
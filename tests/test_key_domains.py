@@ -0,0 +1,61 @@
+"""
+Unit tests for KeyDomainIndex.
+"""
+import unittest
+from core.key_domains import KeyDomainIndex
+from core.plantuml_generator import PlantUmlGenerator
+
+
+class TestKeyDomainIndex(unittest.TestCase):
+    """Test cases for KeyDomainIndex."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        # a.x = b.y AND b.y = c.z, plus one unrelated pair
+        self.relationships = [
+            {'source_table': 'order_item', 'source_field': 'order_id',
+             'target_table': 'orders', 'target_field': 'id'},
+            {'source_table': 'shipment', 'source_field': 'order_id',
+             'target_table': 'order_item', 'target_field': 'order_id'},
+            {'source_table': 'user', 'source_field': 'department_id',
+             'target_table': 'department', 'target_field': 'id'}
+        ]
+        self.index = KeyDomainIndex()
+        self.index.add_relationships(self.relationships)
+    
+    def test_transitive_domain(self):
+        """Test transitively joined columns share one class."""
+        classes = self.index.classes()
+        
+        self.assertEqual(len(classes), 2)
+        self.assertEqual(classes[0]['members'], ['order_item.order_id', 'orders.id', 'shipment.order_id'])
+        self.assertEqual(
+            self.index.domain_of('shipment', 'order_id'),
+            [('order_item', 'order_id'), ('orders', 'id'), ('shipment', 'order_id')]
+        )
+    
+    def test_hub_selection(self):
+        """Test the most referenced column becomes the hub, preferring id on ties."""
+        classes = self.index.classes()
+        
+        self.assertEqual(classes[0]['hub'], 'orders.id')
+        self.assertEqual(classes[1]['hub'], 'department.id')
+    
+    def test_hub_edges_in_diagram(self):
+        """Test the diagram draws member-to-hub edges for large classes."""
+        entities = {
+            'orders': {'fields': ['id'], 'primary_key': 'id'},
+            'order_item': {'fields': ['order_id'], 'primary_key': None},
+            'shipment': {'fields': ['order_id'], 'primary_key': None}
+        }
+        diagram = PlantUmlGenerator().generate_diagram(
+            entities, self.relationships[:2], self.index.classes()
+        )
+        
+        self.assertIn('order_item --> orders : "order_id = id"', diagram)
+        self.assertIn('shipment --> orders : "order_id = id"', diagram)
+        self.assertNotIn('shipment --> order_item', diagram)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for LayoutEngine.
+"""
+import unittest
+from core import layout_engine
+from core.layout_engine import LayoutEngine
+
+
+class TestLayoutEngine(unittest.TestCase):
+    """Test cases for LayoutEngine."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.engine = LayoutEngine()
+        self.entities = ['orders', 'customer', 'order_item', 'product', 'audit_log']
+        self.relationships = [
+            {'source_table': 'orders', 'target_table': 'customer'},
+            {'source_table': 'order_item', 'target_table': 'orders'},
+            {'source_table': 'order_item', 'target_table': 'product'},
+            # Cycle back to the start
+            {'source_table': 'customer', 'target_table': 'order_item'}
+        ]
+        self.sizes = {name: (100 + 10 * i, 60 + 20 * i) for i, name in enumerate(self.entities)}
+    
+    def assert_no_overlap(self, positions):
+        boxes = [(x, y) + self.sizes[name] for name, (x, y) in positions.items()]
+        for i, (x1, y1, w1, h1) in enumerate(boxes):
+            for x2, y2, w2, h2 in boxes[i + 1:]:
+                self.assertTrue(x1 + w1 <= x2 or x2 + w2 <= x1 or y1 + h1 <= y2 or y2 + h2 <= y1)
+    
+    def test_all_modes_place_every_entity_without_overlap(self):
+        """Test that every mode positions all entities without overlapping boxes."""
+        modes = ['grid', 'layered'] + (['force'] if layout_engine.np is not None else [])
+        for mode in modes:
+            layout = self.engine.layout(self.entities, self.relationships, self.sizes, mode)
+            
+            self.assertEqual(layout['mode'], mode)
+            self.assertEqual(set(layout['positions']), set(self.entities))
+            self.assertEqual(min(x for x, _ in layout['positions'].values()), LayoutEngine.MARGIN)
+            self.assert_no_overlap(layout['positions'])
+    
+    def test_layered_puts_referencing_tables_above(self):
+        """Test that layers follow the join direction and isolated tables go last."""
+        relationships = [
+            {'source_table': 'order_item', 'target_table': 'orders'},
+            {'source_table': 'orders', 'target_table': 'customer'}
+        ]
+        positions = self.engine.layout(self.entities, relationships, self.sizes, 'layered')['positions']
+        
+        self.assertLess(positions['order_item'][1], positions['orders'][1])
+        self.assertLess(positions['orders'][1], positions['customer'][1])
+        self.assertGreater(positions['audit_log'][1], positions['customer'][1])
+    
+    def test_layout_is_deterministic(self):
+        """Test that repeated layouts give identical positions."""
+        first = self.engine.layout(self.entities, self.relationships, self.sizes)
+        second = self.engine.layout(self.entities, self.relationships, self.sizes)
+        self.assertEqual(first, second)
+    
+    def test_auto_falls_back_without_numpy(self):
+        """Test that force layout degrades to the layered one without NumPy."""
+        original = layout_engine.np
+        layout_engine.np = None
+        try:
+            layout = self.engine.layout(self.entities, self.relationships, self.sizes, 'force')
+        finally:
+            layout_engine.np = original
+        
+        self.assertEqual(layout['mode'], 'layered')
+    
+    def test_unknown_mode(self):
+        """Test that unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            LayoutEngine(mode='spiral')
+
+
+if __name__ == '__main__':
+    unittest.main()
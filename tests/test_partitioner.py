@@ -0,0 +1,54 @@
+"""
+Unit tests for GraphPartitioner.
+"""
+import unittest
+from core.graph_index import GraphIndex
+from core.partitioner import GraphPartitioner
+
+
+def _chain(prefix, length):
+    """Build relationships linking prefix_0 - prefix_1 - ... - prefix_{length-1}."""
+    return [
+        {'source_table': f'{prefix}_{i}', 'source_field': f'{prefix}_{i + 1}_id',
+         'target_table': f'{prefix}_{i + 1}', 'target_field': 'id'}
+        for i in range(length - 1)
+    ]
+
+
+class TestGraphPartitioner(unittest.TestCase):
+    """Test cases for GraphPartitioner."""
+    
+    def test_connected_components(self):
+        """Test disconnected groups end up in different partitions."""
+        relationships = _chain('a', 5) + _chain('b', 5)
+        partitions = GraphPartitioner(max_size=5).partition(GraphIndex(relationships))
+        
+        self.assertEqual(len(partitions), 2)
+        self.assertEqual(partitions[0], ['a_0', 'a_1', 'a_2', 'a_3', 'a_4'])
+    
+    def test_size_bound(self):
+        """Test large components are split without exceeding the size bound."""
+        relationships = _chain('a', 30)
+        partitions = GraphPartitioner(max_size=8).partition(GraphIndex(relationships))
+        
+        self.assertTrue(all(len(tables) <= 8 for tables in partitions))
+        self.assertEqual(sum(len(tables) for tables in partitions), 30)
+    
+    def test_small_islands_are_packed(self):
+        """Test tiny components share a partition."""
+        relationships = _chain('a', 2) + _chain('b', 2) + _chain('c', 2)
+        partitions = GraphPartitioner(max_size=8).partition(GraphIndex(relationships))
+        
+        self.assertEqual(len(partitions), 1)
+    
+    def test_cross_partition_edges(self):
+        """Test relationships between partitions are counted per pair."""
+        relationships = _chain('a', 4)
+        partitions = [['a_0', 'a_1'], ['a_2', 'a_3']]
+        edges = GraphPartitioner().cross_partition_edges(partitions, relationships)
+        
+        self.assertEqual(edges, [{'source': 0, 'target': 1, 'relationships': 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
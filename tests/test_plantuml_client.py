@@ -0,0 +1,101 @@
+"""
+Unit tests for PlantUmlClient.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.plantuml_client import PlantUmlClient, PlantUmlClientError
+
+
+class FakePlantUmlHandler(BaseHTTPRequestHandler):
+    """Answers every request with its path, failing the first N with 503."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.paths.append(self.path)
+            fail = server.failures > 0
+            server.failures -= 1
+        
+        time.sleep(server.delay)
+        body = self.path.encode('utf-8')
+        self.send_response(503 if fail else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPlantUmlClient(unittest.TestCase):
+    """Test cases for PlantUmlClient."""
+    
+    def setUp(self):
+        """Start a fake PlantUML server."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakePlantUmlHandler)
+        self.server.lock = threading.Lock()
+        self.server.paths = []
+        self.server.failures = 0
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        
+        self.url = f"http://127.0.0.1:{self.server.server_port}/plantuml/svg/"
+        self.client = PlantUmlClient(self.url, timeout=5, retries=2, pool_size=4)
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Stop the fake server."""
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_format_is_chosen_per_request(self):
+        """Test that the configured format segment is replaced by the requested one."""
+        svg = self.client.render('@startuml\n@enduml', 'svg')
+        png = self.client.render('@startuml\n@enduml', 'png')
+        
+        self.assertTrue(svg.startswith(b'/plantuml/svg/'))
+        self.assertTrue(png.startswith(b'/plantuml/png/'))
+    
+    def test_connections_are_reused(self):
+        """Test that sequential renders share one keep-alive connection."""
+        for _ in range(5):
+            self.client.render('@startuml\n@enduml')
+        
+        self.assertEqual(self.client.connections_opened, 1)
+    
+    def test_retries_server_errors(self):
+        """Test that 5xx responses are retried, then reported."""
+        self.server.failures = 1
+        self.assertTrue(self.client.render('@startuml\n@enduml'))
+        
+        self.server.failures = 10
+        with self.assertRaises(PlantUmlClientError):
+            self.client.render('@startuml\n@enduml')
+        self.assertEqual(len(self.server.paths), 2 + 3)
+    
+    def test_render_many_runs_concurrently(self):
+        """Test that concurrent renders take about as long as one render."""
+        self.server.delay = 0.3
+        jobs = [(f"@startuml\nclass T{i}\n@enduml", 'svg', os.path.join(self.temp_dir, f"{i}.svg"))
+                for i in range(4)]
+        
+        start = time.perf_counter()
+        paths = self.client.render_many(jobs)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(paths, [job[2] for job in jobs])
+        self.assertTrue(all(os.path.exists(path) for path in paths))
+        self.assertLess(elapsed, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit tests for PlantUmlGenerator.
+"""
+import io
+import threading
+import unittest
+from core.plantuml_generator import PlantUmlGenerator
+
+
+class TestPlantUmlGenerator(unittest.TestCase):
+    """Test cases for PlantUmlGenerator."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.generator = PlantUmlGenerator()
+        self.entities = {
+            'orders': {'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+            'customer': {'fields': ['id'], 'primary_key': 'id'}
+        }
+        self.relationships = [{
+            'source_table': 'orders',
+            'source_field': 'customer_id',
+            'target_table': 'customer',
+            'target_field': 'id'
+        }]
+    
+    def test_iter_diagram_matches_optimized_diagram(self):
+        """Test streamed lines equal the optimized diagram string."""
+        diagram = self.generator.optimize_layout(
+            self.generator.generate_diagram(self.entities, self.relationships)
+        )
+        lines = self.generator.iter_diagram(self.entities, self.relationships, optimize=True)
+        
+        self.assertEqual('\n'.join(lines), diagram)
+        self.assertIn('entity orders {\n  +id\n  customer_id\n}', diagram)
+    
+    def test_fragment_cache(self):
+        """Test unchanged entities reuse their rendered block."""
+        self.generator.generate_diagram(self.entities, self.relationships)
+        self.assertEqual(self.generator.fragment_misses, 2)
+        
+        self.entities['orders']['fields'].append('promo_code')
+        diagram = self.generator.generate_diagram(self.entities, self.relationships)
+        
+        self.assertEqual(self.generator.fragment_hits, 1)
+        self.assertEqual(self.generator.fragment_misses, 3)
+        self.assertIn('  promo_code', diagram)
+    
+    def test_fragment_cache_shared_by_threads(self):
+        """Test concurrent generation with a small, constantly evicting cache."""
+        generator = PlantUmlGenerator(fragment_cache_size=8)
+        errors = []
+        
+        def generate(offset):
+            entities = {f'table_{offset + i}': {'fields': ['id'], 'primary_key': 'id'} for i in range(20)}
+            try:
+                for _ in range(50):
+                    generator.generate_diagram(entities, [])
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=generate, args=(i * 5,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(generator._fragments), 8)
+        self.assertEqual(generator.fragment_hits + generator.fragment_misses, 8 * 50 * 20)
+    
+    def test_write_diagram(self):
+        """Test streaming to a text stream."""
+        stream = io.StringIO()
+        count = self.generator.write_diagram(stream, self.generator.iter_diagram(self.entities, self.relationships))
+        
+        self.assertEqual(stream.getvalue(), self.generator.generate_diagram(self.entities, self.relationships))
+        self.assertGreater(count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
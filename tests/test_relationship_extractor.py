@@ -112,6 +112,27 @@ class TestRelationshipExtractor(unittest.TestCase):
         self.assertEqual(aliases.get('d'), 'department')
         self.assertEqual(aliases.get('ur'), 'user_role')
         self.assertEqual(aliases.get('r'), 'role')
+    
+    def test_extract_column_usages(self):
+        """Test column roles are recorded per clause."""
+        sql = ("SELECT o.id FROM orders o JOIN customer c ON o.customer_id = c.id "
+               "WHERE o.status = #{status} AND o.created_at > = #{since} AND o.note = 'a.b = c.d' "
+               "GROUP BY o.region ORDER BY DATE ( o.created_at ) , o.id DESC")
+        usages = self.extractor.extract_column_usages(sql)
+        
+        self.assertEqual(usages, [
+            ('orders', 'customer_id', 'JOIN_ON'),
+            ('customer', 'id', 'JOIN_ON'),
+            ('orders', 'status', 'WHERE_EQ'),
+            ('orders', 'created_at', 'RANGE'),
+            ('orders', 'note', 'WHERE_EQ'),
+            ('orders', 'region', 'GROUP_BY'),
+            ('orders', 'id', 'ORDER_BY')
+        ])
+        
+        # Unqualified columns are attributed to the only table
+        usages = self.extractor.extract_column_usages("UPDATE orders SET status = 1 WHERE id IN ( 1 , 2 )", 'orders')
+        self.assertEqual(usages, [('orders', 'id', 'WHERE_EQ')])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+"""
+Unit tests for RenderCache.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from utils.exporter import Exporter
+from utils.render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    """Test cases for RenderCache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = RenderCache(os.path.join(self.temp_dir, 'cache'), max_bytes=100)
+    
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _rendered(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def test_key_depends_on_renderer_and_format(self):
+        """Test that the key covers source, renderer and format."""
+        key = self.cache.key('@startuml', 'plantuml', 'svg')
+        
+        self.assertEqual(key, self.cache.key('@startuml', 'plantuml', 'svg'))
+        self.assertNotEqual(key, self.cache.key('@startuml', 'plantuml', 'png'))
+        self.assertNotEqual(key, self.cache.key('@startuml', 'native', 'svg'))
+        self.assertNotEqual(key, self.cache.key('@startuml\n', 'plantuml', 'svg'))
+    
+    def test_fetch_and_store(self):
+        """Test a miss, a store and a following hit."""
+        key = self.cache.key('a', 'native', 'svg')
+        output_path = os.path.join(self.temp_dir, 'out.svg')
+        
+        self.assertFalse(self.cache.fetch(key, output_path))
+        self.cache.store(key, self._rendered('rendered.svg', '<svg/>'))
+        self.assertTrue(self.cache.fetch(key, output_path))
+        
+        with open(output_path) as f:
+            self.assertEqual(f.read(), '<svg/>')
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest entries are evicted beyond max_bytes."""
+        keys = [self.cache.key(str(i), 'native', 'svg') for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.store(key, self._rendered(f"{i}.svg", 'x' * 40))
+            os.utime(os.path.join(self.cache.cache_dir, key), (time.time() + i, time.time() + i))
+        
+        self.cache.store(self.cache.key('3', 'native', 'svg'), self._rendered('3.svg', 'x' * 40))
+        
+        self.assertFalse(self.cache.fetch(keys[0], os.path.join(self.temp_dir, 'out.svg')))
+        self.assertLessEqual(self.cache.stats()['bytes'], 100)
+    
+    def test_exporter_skips_renderer_on_hit(self):
+        """Test that the exporter serves unchanged diagrams from the cache."""
+        exporter = Exporter(output_dir=os.path.join(self.temp_dir, 'out'),
+                            render_cache=RenderCache(os.path.join(self.temp_dir, 'cache2')))
+        calls = []
+        original = exporter.svg_renderer.iter_svg
+        exporter.svg_renderer.iter_svg = lambda *args: calls.append(args) or original(*args)
+        entities = {'orders': {'fields': ['id'], 'primary_key': 'id'}}
+        
+        first = exporter.export_native_svg(entities, [], 'a.svg')
+        second = exporter.export_native_svg(entities, [], 'b.svg')
+        
+        self.assertEqual(len(calls), 1)
+        with open(first) as a, open(second) as b:
+            self.assertEqual(a.read(), b.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Unit tests for RunStore.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from utils.run_store import RunStore
+
+
+class TestRunStore(unittest.TestCase):
+    """Test cases for RunStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.mapper_dir = os.path.join(self.temp_dir, 'mappers')
+        os.makedirs(os.path.join(self.mapper_dir, 'sub'))
+        self.write_mapper('OrderMapper.xml', '<mapper namespace="order"/>')
+        self.write_mapper(os.path.join('sub', 'UserMapper.xml'), '<mapper namespace="user"/>')
+        self.store = RunStore(os.path.join(self.temp_dir, 'runs'))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def write_mapper(self, name, content):
+        with open(os.path.join(self.mapper_dir, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def fill_run(self, run_id, size, age=0):
+        path = self.store.run_dir(run_id)
+        with open(os.path.join(path, 'relationships.csv'), 'wb') as f:
+            f.write(b'x' * size)
+        used = time.time() - age
+        os.utime(path, (used, used))
+        return path
+
+    def test_fingerprint_stable_for_unchanged_input(self):
+        """Test that unchanged input and settings give the same fingerprint."""
+        first = self.store.fingerprint(self.mapper_dir, {'max_depth': 3})
+        self.assertEqual(first, self.store.fingerprint(self.mapper_dir + os.sep, {'max_depth': 3}))
+        self.assertNotEqual(first, self.store.fingerprint(self.mapper_dir, {'max_depth': 4}))
+
+    def test_fingerprint_changes_with_files(self):
+        """Test that changed, added and ignored files are handled."""
+        first = self.store.fingerprint(self.mapper_dir)
+
+        self.write_mapper('notes.txt', 'not a mapper')
+        self.assertEqual(first, self.store.fingerprint(self.mapper_dir))
+
+        self.write_mapper('OrderMapper.xml', '<mapper namespace="order2"/>')
+        second = self.store.fingerprint(self.mapper_dir)
+        self.assertNotEqual(first, second)
+
+        self.write_mapper('ItemMapper.xml', '<mapper/>')
+        self.assertNotEqual(second, self.store.fingerprint(self.mapper_dir))
+
+    def test_run_dir_reused(self):
+        """Test that a run directory is created once and kept with its files."""
+        run_id = self.store.fingerprint(self.mapper_dir)
+        path = self.fill_run(run_id, 10)
+
+        self.assertEqual(self.store.run_dir(run_id), path)
+        self.assertTrue(os.path.exists(os.path.join(path, 'relationships.csv')))
+        self.assertEqual(self.store.stats()['runs'], 1)
+
+    def test_invalid_run_id(self):
+        """Test that run ids cannot escape the store."""
+        for run_id in ('', '..', 'abc/../def', 'ABC'):
+            with self.assertRaises(ValueError):
+                self.store.path(run_id)
+
+    def test_evicts_least_recently_used_over_size(self):
+        """Test that the oldest runs go first once the size cap is exceeded."""
+        self.store.max_bytes = 250
+        self.fill_run('aa', 100, age=30)
+        self.fill_run('bb', 100, age=20)
+        self.fill_run('cc', 100, age=10)
+
+        self.assertEqual(self.store.evict(), ['aa'])
+        self.assertEqual(sorted(os.listdir(self.store.root_dir)), ['bb', 'cc'])
+
+    def test_evicts_expired_runs_except_kept(self):
+        """Test age-based eviction and that kept runs survive."""
+        self.store.max_age = 60
+        self.fill_run('aa', 10, age=120)
+        self.fill_run('bb', 10, age=120)
+        self.fill_run('cc', 10)
+
+        self.assertEqual(self.store.evict(keep=['bb']), ['aa'])
+        self.assertEqual(self.store.stats()['runs'], 2)
+
+    def test_touch_keeps_used_run(self):
+        """Test that touching a run protects it from age-based eviction."""
+        self.store.max_age = 60
+        self.fill_run('aa', 10, age=120)
+        self.fill_run('bb', 10, age=120)
+
+        self.assertTrue(self.store.touch('aa'))
+        self.assertFalse(self.store.touch('cc'))
+        self.assertEqual(self.store.evict(), ['bb'])
+        self.assertFalse(os.path.exists(os.path.join(self.store.root_dir, 'cc')))
+
+
+if __name__ == '__main__':
+    unittest.main()
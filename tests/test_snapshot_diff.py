@@ -0,0 +1,86 @@
+"""
+Unit tests for SnapshotDiff.
+"""
+import unittest
+from core.snapshot_diff import SnapshotDiff
+from tests import make_relationship
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    """Test cases for SnapshotDiff."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.differ = SnapshotDiff()
+        
+        # Saved JSON form: entities as a list
+        self.old = {
+            'entities': [
+                {'name': 'orders', 'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+                {'name': 'customer', 'fields': ['id'], 'primary_key': 'id'},
+                {'name': 'order_item', 'fields': ['order_id'], 'primary_key': None}
+            ],
+            'relationships': [
+                make_relationship('orders', 'customer_id', 'customer', 'id', 2),
+                make_relationship('order_item', 'order_id', 'orders', 'id', 3)
+            ]
+        }
+        
+        # Analysis results form: entities as a dict
+        self.new = {
+            'entities': {
+                'orders': {'fields': ['id', 'promo_code'], 'primary_key': 'id'},
+                'order_item': {'fields': ['order_id'], 'primary_key': None},
+                'promo': {'fields': ['code'], 'primary_key': None}
+            },
+            'relationships': [
+                # Same join written in the other direction
+                make_relationship('orders', 'id', 'order_item', 'order_id', 5),
+                make_relationship('orders', 'promo_code', 'promo', 'code')
+            ]
+        }
+    
+    def test_relationship_changes(self):
+        """Test added, removed and changed relationships."""
+        diff = self.differ.diff(self.old, self.new)
+        relationships = diff['relationships']
+        
+        self.assertEqual([r['target_table'] for r in relationships['added']], ['promo'])
+        self.assertEqual([r['target_table'] for r in relationships['removed']], ['customer'])
+        self.assertEqual(len(relationships['changed']), 1)
+        self.assertEqual(relationships['changed'][0]['occurrences_before'], 3)
+        self.assertEqual(relationships['changed'][0]['occurrences_after'], 5)
+        self.assertEqual(relationships['changed'][0]['occurrences_delta'], 2)
+        self.assertEqual(diff['stats']['relationships_unchanged'], 0)
+    
+    def test_entity_changes(self):
+        """Test added/removed entities and field changes."""
+        entities = self.differ.diff(self.old, self.new)['entities']
+        
+        self.assertEqual(entities['added'], ['promo'])
+        self.assertEqual(entities['removed'], ['customer'])
+        self.assertEqual(entities['changed'], [{
+            'name': 'orders',
+            'added_fields': ['promo_code'],
+            'removed_fields': ['customer_id'],
+            'primary_key_before': 'id',
+            'primary_key_after': 'id'
+        }])
+    
+    def test_identical_snapshots(self):
+        """Test a snapshot has no differences with itself."""
+        stats = self.differ.diff(self.old, self.old)['stats']
+        
+        self.assertEqual(stats['relationships_unchanged'], 2)
+        self.assertEqual(sum(count for name, count in stats.items() if name != 'relationships_unchanged'), 0)
+    
+    def test_canonical_key(self):
+        """Test both directions of a join share a key."""
+        self.assertEqual(
+            self.differ.relationship_key(make_relationship('a', 'x', 'b', 'y')),
+            self.differ.relationship_key(make_relationship('B', 'Y', 'A', 'X'))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
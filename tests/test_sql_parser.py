@@ -68,6 +68,15 @@ class TestSqlParser(unittest.TestCase):
         self.assertEqual(results[1]['sql_id'], 'getUsersByDepartment')
         self.assertIn('FROM user', results[1]['sql'])
     
+    def test_statement_metadata(self):
+        """Test mapper namespace, statement type and line are recorded."""
+        results = self.parser.parse_xml_file(self.temp_file_path)
+        
+        self.assertEqual(results[0]['namespace'], 'com.example.UserMapper')
+        self.assertEqual(results[0]['statement_type'], 'select')
+        self.assertEqual(results[0]['line'], 4)
+        self.assertEqual(results[1]['line'], 15)
+    
     def test_clean_dynamic_tags(self):
         """Test cleaning dynamic tags from SQL."""
         # SQL with dynamic tags
@@ -110,6 +119,15 @@ class TestSqlParser(unittest.TestCase):
         # Check extraneous whitespace removed
         self.assertNotIn('  ', normalized_sql)
     
+    def test_fingerprint_sql(self):
+        """Test structural fingerprints ignore parameters, literals and whitespace."""
+        base = self.parser.normalize_sql("SELECT * FROM user u WHERE u.id = #{id} AND u.name = 'a'")
+        variant = self.parser.normalize_sql("SELECT *  FROM user u WHERE u.id = 42 AND u.name = 'bob'")
+        other = self.parser.normalize_sql("SELECT * FROM user u WHERE u.dept_id = #{id}")
+        
+        self.assertEqual(self.parser.fingerprint_sql(base), self.parser.fingerprint_sql(variant))
+        self.assertNotEqual(self.parser.fingerprint_sql(base), self.parser.fingerprint_sql(other))
+    
     def test_parse_directory(self):
         """Test parsing a directory of XML files."""
         results = self.parser.parse_directory(self.temp_dir.name)
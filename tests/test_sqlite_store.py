@@ -0,0 +1,134 @@
+"""
+Unit tests for SqliteStore.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from core.column_index import ColumnIndex
+from core.statement_index import StatementIndex
+from utils.sqlite_store import SqliteStore
+
+
+class TestSqliteStore(unittest.TestCase):
+    """Test cases for SqliteStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = SqliteStore(os.path.join(self.temp_dir, 'analysis.db'))
+
+        table_index = StatementIndex()
+        find_id = table_index.add_statement({'namespace': 'com.example.OrderMapper', 'sql_id': 'findAll',
+                                             'statement_type': 'select', 'file_path': 'OrderMapper.xml',
+                                             'line': 3}, ['orders', 'customer'])
+        table_index.add_statement({'namespace': 'com.example.OrderMapper', 'sql_id': 'insert',
+                                   'statement_type': 'insert', 'file_path': 'OrderMapper.xml',
+                                   'line': 12}, ['orders'])
+        column_index = ColumnIndex(table_index)
+        column_index.add_usage(find_id, 'orders', 'customer_id', ColumnIndex.ROLE_JOIN_ON)
+        column_index.add_usage(find_id, 'orders', 'status', ColumnIndex.ROLE_WHERE_EQ)
+
+        self.results = {
+            'entities': {
+                'orders': {'fields': ['customer_id', 'id', 'status'], 'primary_key': 'id'},
+                'customer': {'fields': ['id'], 'primary_key': 'id'},
+                'order_item': {'fields': ['order_id'], 'primary_key': None}
+            },
+            'relationships': [
+                {
+                    'source_table': 'orders', 'source_field': 'customer_id',
+                    'target_table': 'customer', 'target_field': 'id',
+                    'relationship_type': 'JOIN', 'source_file': 'OrderMapper.xml (L3-9)',
+                    'occurrences': 2, 'is_potential_fk': True
+                },
+                {
+                    'source_table': 'order_item', 'source_field': 'order_id',
+                    'target_table': 'orders', 'target_field': 'id',
+                    'relationship_type': 'WHERE', 'source_file': 'ItemMapper.xml (L5-8)',
+                    'occurrences': 1
+                }
+            ],
+            'table_index': table_index,
+            'column_index': column_index,
+            'stats': {'total_entities': 3, 'total_relationships': 2}
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_and_query(self):
+        """Test that a saved run answers table, field and relationship queries."""
+        run_id = self.store.save(self.results, '/mappers')
+
+        self.assertEqual(self.store.latest_run(), run_id)
+        self.assertEqual([t['name'] for t in self.store.tables()], ['customer', 'order_item', 'orders'])
+        self.assertEqual(self.store.tables('order%')[1]['field_count'], 3)
+        self.assertEqual(self.store.fields('ORDERS'), ['customer_id', 'id', 'status'])
+
+        relationships = self.store.relationships('orders')
+        self.assertEqual(relationships, self.results['relationships'])
+        self.assertEqual(len(self.store.relationships('orders', 'customer_id')), 1)
+        self.assertEqual(self.store.relationships('orders', 'missing'), [])
+
+    def test_statements_and_column_usages(self):
+        """Test the statement and column usage lookups."""
+        self.store.save(self.results)
+
+        self.assertEqual([s['sql_id'] for s in self.store.statements('orders')], ['findAll', 'insert'])
+        self.assertEqual([s['sql_id'] for s in self.store.statements('customer')], ['findAll'])
+
+        usages = self.store.column_usages('orders', 'customer_id')
+        self.assertEqual(usages[0]['role'], ColumnIndex.ROLE_JOIN_ON)
+        self.assertEqual(usages[0]['line'], 3)
+        self.assertEqual(self.store.column_usages('orders', 'status', roles=[ColumnIndex.ROLE_JOIN_ON]), [])
+
+    def test_runs_and_fingerprint_reuse(self):
+        """Test that queries use the latest run and fingerprints are saved once."""
+        first = self.store.save(self.results, fingerprint='abc')
+        self.assertEqual(self.store.save(self.results, fingerprint='abc'), first)
+
+        del self.results['entities']['order_item']
+        second = self.store.save(self.results, fingerprint='def')
+        self.assertEqual([run['id'] for run in self.store.runs()], [second, first])
+        self.assertEqual(len(self.store.tables()), 2)
+        self.assertEqual(len(self.store.tables(run_id=first)), 3)
+
+        self.store.delete_run(second)
+        self.assertEqual(self.store.latest_run(), first)
+
+    def test_indexes_used(self):
+        """Test that table lookups are index searches, not scans."""
+        template = self.results['relationships'][1]
+        self.results['relationships'] = [
+            dict(template, source_table=f'table_{i}', target_table=f'table_{i % 50}') for i in range(2000)
+        ]
+        self.store.save(self.results)
+        plan = self.store.connection.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM relationships WHERE run_id = 1 AND target_table = ?', ('orders',)
+        ).fetchall()
+        self.assertIn('idx_relationships_target', plan[0]['detail'])
+
+    def test_query_is_read_only(self):
+        """Test raw queries and that they cannot modify the store."""
+        self.store.save(self.results)
+
+        columns, rows = self.store.query('SELECT COUNT(*) AS n FROM relationships')
+        self.assertEqual(columns, ['n'])
+        self.assertEqual(rows, [(2,)])
+
+        with self.assertRaises(sqlite3.Error):
+            self.store.query('DELETE FROM relationships')
+        self.assertEqual(len(self.store.relationships('orders')), 2)
+
+    def test_empty_store(self):
+        """Test that querying an empty store reports the missing run."""
+        with self.assertRaises(LookupError):
+            self.store.tables()
+
+
+if __name__ == '__main__':
+    unittest.main()
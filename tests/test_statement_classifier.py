@@ -0,0 +1,56 @@
+"""
+Unit tests for StatementClassifier.
+"""
+import unittest
+from core.statement_classifier import StatementClassifier
+
+
+class TestStatementClassifier(unittest.TestCase):
+    """Test cases for StatementClassifier."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.classifier = StatementClassifier()
+    
+    def test_classify_trivial_statements(self):
+        """Test statements without qualified predicates are skipped."""
+        self.assertEqual(
+            self.classifier.classify('UPDATE user SET name = #{name} WHERE id = #{id}'),
+            StatementClassifier.TIER_SKIP
+        )
+        self.assertEqual(
+            self.classifier.classify('id , name , department_id'),
+            StatementClassifier.TIER_SKIP
+        )
+    
+    def test_classify_simple_statement(self):
+        """Test single-table statements with a qualified predicate use the fast path."""
+        self.assertEqual(
+            self.classifier.classify('SELECT o.id FROM order o WHERE o.user_id = u.id'),
+            StatementClassifier.TIER_SIMPLE
+        )
+    
+    def test_classify_multi_table_statements(self):
+        """Test JOINs and multi-table FROM lists are escalated."""
+        self.assertEqual(
+            self.classifier.classify('SELECT u.id FROM user u JOIN department d ON u.department_id = d.id'),
+            StatementClassifier.TIER_FULL
+        )
+        self.assertEqual(
+            self.classifier.classify('SELECT u.id FROM user u , department d WHERE u.department_id = d.id'),
+            StatementClassifier.TIER_FULL
+        )
+    
+    def test_table_references(self):
+        """Test table references are collected in order of appearance."""
+        sql = 'SELECT u.id FROM user u , department d JOIN role r ON r.id = u.role_id'
+        
+        self.assertEqual(self.classifier.table_references(sql), ['user', 'department', 'role'])
+        self.assertEqual(
+            self.classifier.table_references('SELECT EXTRACT ( YEAR FROM created_at ) FROM orders'),
+            ['orders']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Unit tests for StatementIndex.
+"""
+import unittest
+from core.statement_index import StatementIndex
+
+
+def _statement(sql_id, statement_type='select', line=1):
+    return {
+        'sql_id': sql_id,
+        'namespace': 'com.example.OrderMapper',
+        'statement_type': statement_type,
+        'file_path': '/mappers/OrderMapper.xml',
+        'relative_path': 'OrderMapper.xml',
+        'line': line
+    }
+
+
+class TestStatementIndex(unittest.TestCase):
+    """Test cases for StatementIndex."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = StatementIndex()
+        self.index.add_statement(_statement('getOrderItems', line=3), ['orders', 'order_item', 'orders'])
+        self.index.add_statement(_statement('insertOrder', 'insert', 23), ['ORDERS'])
+        self.index.add_statement(_statement('getProduct', line=30), ['product'])
+    
+    def test_lookup(self):
+        """Test every statement referencing a table is returned once."""
+        statements = self.index.lookup('Orders')
+        
+        self.assertEqual([s['sql_id'] for s in statements], ['getOrderItems', 'insertOrder'])
+        self.assertEqual(statements[1]['statement_type'], 'insert')
+        self.assertEqual(statements[1]['line'], 23)
+        self.assertEqual(statements[1]['file'], '/mappers/OrderMapper.xml')
+        self.assertEqual(self.index.lookup('unknown'), [])
+        self.assertIn('order_item', self.index)
+        self.assertEqual(len(self.index), 3)
+    
+    def test_round_trip(self):
+        """Test the index survives serialization."""
+        restored = StatementIndex.from_dict(self.index.to_dict())
+        
+        self.assertEqual(restored.table_names(), self.index.table_names())
+        self.assertEqual(restored.lookup('orders'), self.index.lookup('orders'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Unit tests for SvgRenderer.
+"""
+import io
+import unittest
+import xml.dom.minidom
+from core.svg_renderer import SvgRenderer
+
+
+class TestSvgRenderer(unittest.TestCase):
+    """Test cases for SvgRenderer."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.renderer = SvgRenderer()
+        self.entities = {
+            'orders': {'fields': ['customer_id', 'id'], 'primary_key': 'id'},
+            'customer': {'fields': ['id', 'name'], 'primary_key': 'id'},
+            'a<b': {'fields': ['x&y'], 'primary_key': 'x&y'}
+        }
+        self.relationships = [{
+            'source_table': 'orders',
+            'source_field': 'customer_id',
+            'target_table': 'customer',
+            'target_field': 'id'
+        }] * 2
+    
+    def test_render_is_valid_svg(self):
+        """Test that the output is well-formed and escapes names."""
+        svg = self.renderer.render(self.entities, self.relationships)
+        document = xml.dom.minidom.parseString(svg)
+        
+        self.assertEqual(document.documentElement.tagName, 'svg')
+        self.assertEqual(len(document.getElementsByTagName('rect')), 6)
+        # Duplicate relationships are drawn once
+        self.assertEqual(len(document.getElementsByTagName('line')), 1)
+        self.assertIn('a&lt;b', svg)
+        self.assertIn('customer_id = id', svg)
+    
+    def test_grid_layout_does_not_overlap(self):
+        """Test that grid positions keep boxes apart."""
+        positions = self.renderer.grid_layout(self.entities, self.relationships)
+        self.assertEqual(set(positions), set(self.entities))
+        
+        boxes = [(x, y) + self.renderer.box_size(name, self.entities[name]) for name, (x, y) in positions.items()]
+        for i, (x1, y1, w1, h1) in enumerate(boxes):
+            for x2, y2, w2, h2 in boxes[i + 1:]:
+                self.assertTrue(x1 + w1 <= x2 or x2 + w2 <= x1 or y1 + h1 <= y2 or y2 + h2 <= y1)
+    
+    def test_explicit_positions(self):
+        """Test that given positions are used and unplaced entities are skipped."""
+        svg = self.renderer.render(self.entities, self.relationships,
+                                   positions={'orders': (0, 0), 'customer': (300, 0)})
+        
+        self.assertIn('<rect class="box" x="300.0" y="0.0"', svg)
+        self.assertNotIn('a&lt;b', svg)
+    
+    def test_write_svg(self):
+        """Test that streamed output matches the rendered string."""
+        buffer = io.StringIO()
+        written = self.renderer.write_svg(buffer, self.entities, self.relationships)
+        
+        self.assertEqual(buffer.getvalue(), self.renderer.render(self.entities, self.relationships))
+        self.assertEqual(written, len(buffer.getvalue()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Unit tests for TrigramIndex.
+"""
+import unittest
+from core.trigram_index import TrigramIndex
+from core.statement_index import StatementIndex
+
+
+class TestTrigramIndex(unittest.TestCase):
+    """Test cases for TrigramIndex."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.statements = StatementIndex()
+        self.index = TrigramIndex(self.statements)
+        
+        sqls = [
+            ('lockStock', "SELECT s.qty FROM stock s WHERE s.id = #{id} FOR UPDATE"),
+            ('countOrders', "SELECT COUNT ( * ) FROM orders WHERE created_at > #{since}"),
+            ('touchOrder', "UPDATE orders SET updated_at = now ( ) WHERE id = #{id}")
+        ]
+        for sql_id, sql in sqls:
+            statement_id = self.statements.add_statement({'sql_id': sql_id}, [])
+            self.index.add(statement_id, sql)
+    
+    def test_search(self):
+        """Test case and whitespace insensitive substring search."""
+        self.assertEqual([h['sql_id'] for h in self.index.search('for update')], ['lockStock'])
+        self.assertEqual([h['sql_id'] for h in self.index.search('count(*)')], ['countOrders'])
+        self.assertEqual([h['sql_id'] for h in self.index.search('_AT')], ['countOrders', 'touchOrder'])
+        self.assertEqual(self.index.search('for delete'), [])
+        self.assertEqual(len(self.index.search('orders', limit=1)), 1)
+    
+    def test_snippet(self):
+        """Test hits carry the original text around the match."""
+        hit = self.index.search('now()')[0]
+        
+        self.assertIn('now ( )', hit['snippet'])
+    
+    def test_short_query(self):
+        """Test queries shorter than a trigram fall back to a scan."""
+        self.assertEqual([h['sql_id'] for h in self.index.search('id')], ['lockStock', 'touchOrder'])
+    
+    def test_round_trip(self):
+        """Test the index survives serialization."""
+        restored = TrigramIndex.from_dict(self.index.to_dict(), self.statements)
+        
+        self.assertEqual(restored.search('orders'), self.index.search('orders'))
+
+
+if __name__ == '__main__':
+    unittest.main()
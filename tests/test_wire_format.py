@@ -0,0 +1,68 @@
+"""
+Unit tests for CompactGraphEncoder.
+"""
+import json
+import unittest
+from utils.wire_format import CompactGraphEncoder
+
+
+class TestCompactGraphEncoder(unittest.TestCase):
+    """Test cases for CompactGraphEncoder."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.encoder = CompactGraphEncoder()
+        self.entities = {'orders': {}, 'customer': {}, 'product': {}}
+        self.relationships = [
+            {'source_table': 'orders', 'source_field': 'customer_id', 'target_table': 'customer',
+             'target_field': 'id', 'relationship_type': 'JOIN', 'source_file': 'OrderMapper.xml (L3-9)',
+             'occurrences': 2},
+            {'source_table': 'orders', 'source_field': 'product_id', 'target_table': 'product',
+             'target_field': 'id', 'relationship_type': 'WHERE', 'source_file': 'OrderMapper.xml (L3-9)',
+             'occurrences': 1, 'is_potential_fk': True}
+        ]
+        self.layout = {'mode': 'grid', 'positions': {'orders': [20, 20], 'customer': [300, 20], 'product': [20, 200]}}
+    
+    def test_round_trip(self):
+        """Test that decoding restores relationships, evidence and positions."""
+        graph = self.encoder.encode(self.entities, self.relationships, self.layout)
+        evidence = self.encoder.encode_evidence(self.relationships)
+        decoded = self.encoder.decode(json.loads(json.dumps(graph)), evidence)
+        
+        self.assertEqual(decoded['entities'], ['orders', 'customer', 'product'])
+        self.assertEqual(decoded['relationships'], self.relationships)
+        self.assertEqual(decoded['positions'], self.layout['positions'])
+    
+    def test_strings_are_stored_once(self):
+        """Test that repeated names share one string table entry."""
+        graph = self.encoder.encode(self.entities, self.relationships)
+        
+        self.assertEqual(graph['strings'].count('id'), 1)
+        self.assertEqual(len(graph['edges']), 2 * CompactGraphEncoder.EDGE_STRIDE)
+        self.assertIsNone(graph['positions'])
+        self.assertNotIn('OrderMapper.xml (L3-9)', graph['strings'])
+    
+    def test_evidence_range(self):
+        """Test that evidence can be fetched for a slice of relationships."""
+        evidence = self.encoder.encode_evidence(self.relationships, start=1, count=5)
+        
+        self.assertEqual(evidence['start'], 1)
+        self.assertEqual(evidence['strings'], ['OrderMapper.xml (L3-9)'])
+        self.assertEqual(evidence['files'], [0])
+    
+    def test_payload_is_smaller(self):
+        """Test that a large graph encodes to a fraction of the verbose form."""
+        relationships = [
+            {'source_table': f"table_{i % 300}", 'source_field': f"column_{i % 40}_id",
+             'target_table': f"table_{(i * 7) % 300}", 'target_field': 'id', 'relationship_type': 'JOIN',
+             'source_file': f"mapper/Module{i % 50}Mapper.xml (L{i}-{i + 20})", 'occurrences': 1}
+            for i in range(5000)
+        ]
+        verbose = json.dumps(relationships, separators=(',', ':'))
+        compact = json.dumps(self.encoder.encode({}, relationships), separators=(',', ':'))
+        
+        self.assertLess(len(compact) * 5, len(verbose))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+Compression module.
+Precompressed variants of exported files and Accept-Encoding negotiation.
+"""
+import os
+import gzip
+import shutil
+import logging
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, gzip is always available
+    zstandard = None
+
+
+class ArtifactCompressor:
+    """
+    Writes compressed copies of exported files and picks the one to serve.
+
+    Each export (e.g. analysis_results.json) gets sibling variants such as
+    analysis_results.json.gz, written once when the file is generated so
+    downloads only stream bytes from disk. gzip is always produced; Brotli
+    ('br') and Zstandard ('zstd') are added when the brotli / zstandard
+    packages are installed. The same encoders compress API responses on
+    the fly at a faster level.
+    """
+
+    # 服务端偏好顺序：压缩率高的优先
+    PREFERENCE = ('br', 'zstd', 'gzip')
+    SUFFIXES = {'br': '.br', 'zstd': '.zst', 'gzip': '.gz'}
+
+    # Precompressed once per file, so a slow high level pays off;
+    # responses are compressed per request and use a fast level
+    FILE_LEVELS = {'br': 9, 'zstd': 12, 'gzip': 9}
+    RESPONSE_LEVELS = {'br': 4, 'zstd': 3, 'gzip': 5}
+
+    # Already compressed formats gain nothing
+    SKIP_EXTENSIONS = ('.png', '.gz', '.br', '.zst')
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, min_size=1024, encodings=None):
+        """
+        Initialize the compressor.
+
+        Args:
+            min_size (int): Files smaller than this are not precompressed
+            encodings (list): Encodings to use (default: every available one)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.min_size = min_size
+        available = [encoding for encoding in self.PREFERENCE if self.is_available(encoding)]
+        self.encodings = available if encodings is None else [e for e in available if e in encodings]
+
+    @staticmethod
+    def is_available(encoding):
+        """
+        Check whether an encoding can be produced here.
+
+        Args:
+            encoding (str): 'gzip', 'br' or 'zstd'
+
+        Returns:
+            bool: True if the encoder is installed
+        """
+        if encoding == 'br':
+            return brotli is not None
+        if encoding == 'zstd':
+            return zstandard is not None
+        return encoding == 'gzip'
+
+    def variant_path(self, path, encoding):
+        """
+        Get the path of a compressed variant.
+
+        Args:
+            path (str): Original file
+            encoding (str): Content encoding
+
+        Returns:
+            str: Variant file path
+        """
+        return path + self.SUFFIXES[encoding]
+
+    def compress_file(self, path):
+        """
+        Write the compressed variants of a file next to it.
+
+        Variants are written to a temporary file first and renamed, so a
+        concurrent download never sees a partial variant.
+
+        Args:
+            path (str): File to compress
+
+        Returns:
+            dict: Encoding -> variant path (empty if the file was skipped)
+        """
+        if path.lower().endswith(self.SKIP_EXTENSIONS) or os.path.getsize(path) < self.min_size:
+            return {}
+
+        variants = {}
+        for encoding in self.encodings:
+            variant = self.variant_path(path, encoding)
+            temp_path = variant + '.tmp'
+            try:
+                with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+                    self._compress_stream(src, dst, encoding)
+                os.replace(temp_path, variant)
+                variants[encoding] = variant
+            except Exception as e:
+                self.logger.error(f"Error compressing {path} ({encoding}): {str(e)}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        if variants:
+            original = os.path.getsize(path)
+            sizes = ', '.join(f"{encoding} {os.path.getsize(p) * 100 // original}%" for encoding, p in variants.items())
+            self.logger.info(f"Compressed {os.path.basename(path)} ({sizes})")
+        return variants
+
+    def compress_bytes(self, data, encoding):
+        """
+        Compress a response body.
+
+        Args:
+            data (bytes): Uncompressed body
+            encoding (str): Content encoding
+
+        Returns:
+            bytes: Compressed body
+        """
+        level = self.RESPONSE_LEVELS[encoding]
+        if encoding == 'br':
+            return brotli.compress(data, quality=level)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=level).compress(data)
+        return gzip.compress(data, compresslevel=level, mtime=0)
+
+    def negotiate(self, accept_encoding, encodings=None):
+        """
+        Pick the content encoding for a request.
+
+        Args:
+            accept_encoding (str): Accept-Encoding request header
+            encodings (list): Candidate encodings (default: self.encodings)
+
+        Returns:
+            str: Preferred acceptable encoding, or None for identity
+        """
+        accepted = {}
+        for part in (accept_encoding or '').split(','):
+            name, _, params = part.strip().partition(';')
+            name = name.strip().lower()
+            if not name:
+                continue
+            quality = 1.0
+            for param in params.split(';'):
+                key, _, value = param.strip().partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            accepted['gzip' if name == 'x-gzip' else name] = quality
+
+        best = None
+        best_quality = 0.0
+        for encoding in self.encodings if encodings is None else encodings:
+            quality = accepted.get(encoding, accepted.get('*', 0.0))
+            # 权重相同时保留服务端偏好顺序
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def select(self, path, accept_encoding):
+        """
+        Pick the file to serve for a request.
+
+        Only variants at least as new as the original are considered, so a
+        regenerated file is never answered with a stale variant.
+
+        Args:
+            path (str): Original file
+            accept_encoding (str): Accept-Encoding request header
+
+        Returns:
+            tuple: (path to serve, content encoding or None)
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return path, None
+
+        candidates = []
+        for encoding in self.PREFERENCE:
+            try:
+                if os.stat(self.variant_path(path, encoding)).st_mtime_ns >= mtime:
+                    candidates.append(encoding)
+            except OSError:
+                continue
+
+        encoding = self.negotiate(accept_encoding, candidates)
+        if encoding is None:
+            return path, None
+        return self.variant_path(path, encoding), encoding
+
+    def _compress_stream(self, src, dst, encoding):
+        """Compress one file into another chunk by chunk."""
+        level = self.FILE_LEVELS[encoding]
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=level)
+            for chunk in iter(lambda: src.read(self.CHUNK_SIZE), b''):
+                dst.write(compressor.process(chunk))
+            dst.write(compressor.finish())
+        elif encoding == 'zstd':
+            zstandard.ZstdCompressor(level=level).copy_stream(src, dst, read_size=self.CHUNK_SIZE)
+        else:
+            # mtime=0 与空文件名让相同内容得到相同的压缩结果
+            with gzip.GzipFile(filename='', mode='wb', fileobj=dst, compresslevel=level, mtime=0) as out:
+                shutil.copyfileobj(src, out, self.CHUNK_SIZE)
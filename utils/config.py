@@ -33,8 +33,19 @@ class Config:
         self.defaults = {
             'DEBUG_MODE': 'False',
             'MAX_DEPTH': '3',
+            'EXTRACTION_CACHE_SIZE': '4096',
             'OUTPUT_DIR': './output',
             'PLANTUML_SERVER': 'http://www.plantuml.com/plantuml/svg/',
+            'PLANTUML_TIMEOUT': '30',
+            'PLANTUML_RETRIES': '2',
+            'PLANTUML_POOL_SIZE': '4',
+            'SVG_RENDERER': 'native',
+            'LAYOUT_MODE': 'auto',
+            'RENDER_CACHE_DIR': '',
+            'RENDER_CACHE_MAX_MB': '256',
+            'RUN_STORE_MAX_MB': '1024',
+            'RUN_STORE_MAX_AGE_HOURS': '168',
+            'COMPRESS_MIN_KB': '64',
             'HOST': '0.0.0.0',
             'PORT': '5000'
         }
@@ -0,0 +1,432 @@
+"""
+Export Pipeline module.
+Writes every requested output format from a single pass over the results.
+"""
+import os
+import csv
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from core.plantuml_generator import PlantUmlGenerator
+
+# 记录型输出使用 1 MB 缓冲区，减少大结果集的系统调用次数
+BUFFER_SIZE = 1 << 20
+
+_COMPACT = (',', ':')
+
+
+class CsvRecordWriter:
+    """Writes relationships as CSV rows."""
+
+    HEADER = ['Source Table', 'Source Field', 'Target Table', 'Target Field', 'Source File', 'FK Relationship']
+    newline = ''
+
+    def __init__(self, stream, results=None):
+        self.writer = csv.writer(stream)
+
+    def begin(self):
+        self.writer.writerow(self.HEADER)
+
+    def write(self, rel):
+        self.writer.writerow([
+            rel['source_table'],
+            rel['source_field'],
+            rel['target_table'],
+            rel['target_field'],
+            rel['source_file'],
+            'Yes' if rel.get('is_potential_fk', False) else 'No'
+        ])
+
+    def end(self):
+        pass
+
+
+class JsonRecordWriter:
+    """
+    Writes analysis results as compact JSON.
+
+    The relationships array is streamed record by record; the remaining
+    sections are serialized once after it, so the document never has to be
+    built in memory.
+    """
+
+    newline = None
+
+    def __init__(self, stream, results):
+        self.stream = stream
+        self.results = results
+        self.first = True
+
+    def begin(self):
+        entities = [
+            {
+                'name': entity_name,
+                'fields': entity_data['fields'],
+                'primary_key': entity_data['primary_key']
+            }
+            for entity_name, entity_data in self.results['entities'].items()
+        ]
+        self.stream.write('{"entities":')
+        self.stream.write(json.dumps(entities, separators=_COMPACT))
+        self.stream.write(',"relationships":[')
+
+    def write(self, rel):
+        if not self.first:
+            self.stream.write(',')
+        self.first = False
+        self.stream.write(json.dumps(rel, separators=_COMPACT))
+
+    def end(self):
+        self.stream.write(']')
+        for key, value in self.sections(self.results):
+            self.stream.write(f',{json.dumps(key)}:')
+            self.stream.write(json.dumps(value, separators=_COMPACT))
+        self.stream.write('}')
+
+    @staticmethod
+    def sections(results):
+        """
+        Yield the (key, value) sections that follow the relationships.
+
+        Args:
+            results (dict): Analysis results
+
+        Yields:
+            tuple: Section name and JSON-serializable value
+        """
+        yield 'key_domains', results.get('key_domains', [])
+        yield 'table_rankings', results.get('table_rankings', [])
+        yield 'stats', results['stats']
+
+        for key in ('table_index', 'column_index', 'search_index'):
+            if results.get(key) is not None:
+                yield key, results[key].to_dict()
+
+        if results.get('layout') is not None:
+            yield 'layout', results['layout']
+
+
+class NdjsonRecordWriter:
+    """
+    Writes analysis results as newline-delimited JSON.
+
+    Each line is one self-contained object tagged with a 'type': first one
+    'entity' line per table, then one 'relationship' line per relationship
+    and finally a single 'stats' line, so consumers such as jq can process
+    the output line by line in constant memory.
+    """
+
+    newline = None
+
+    def __init__(self, stream, results):
+        self.stream = stream
+        self.results = results
+
+    def begin(self):
+        for entity_name, entity_data in self.results['entities'].items():
+            self._line({
+                'type': 'entity',
+                'name': entity_name,
+                'fields': entity_data['fields'],
+                'primary_key': entity_data['primary_key']
+            })
+
+    def write(self, rel):
+        self._line({'type': 'relationship', **rel})
+
+    def end(self):
+        self._line({'type': 'stats', **self.results['stats']})
+
+    def _line(self, record):
+        self.stream.write(json.dumps(record, separators=_COMPACT))
+        self.stream.write('\n')
+
+
+class MarkdownRecordWriter:
+    """Writes the Markdown report; relationships become table rows."""
+
+    newline = None
+
+    def __init__(self, stream, results):
+        self.stream = stream
+        self.results = results
+
+    def begin(self):
+        f = self.stream
+        results = self.results
+
+        # Write title
+        f.write("# Database Table Relationships\n\n")
+
+        # Write PlantUML diagram
+        f.write("## Entity Relationship Diagram\n\n")
+        f.write("```plantuml\n")
+        f.write(results['diagram'])
+        f.write("\n```\n\n")
+
+        # Write hub tables
+        hub_tables = results['stats'].get('hub_tables', [])
+        if hub_tables:
+            f.write("## Hub Tables\n\n")
+            f.write("| Rank | Table | Degree | Weighted Degree | PageRank |\n")
+            f.write("|------|-------|--------|-----------------|----------|\n")
+
+            for rank, hub in enumerate(hub_tables, 1):
+                f.write(f"| {rank} | {hub['table']} | {hub['degree']} | {hub['weighted_degree']:g} | {hub['pagerank']:.4f} |\n")
+
+            f.write("\n")
+
+        # Write entities
+        f.write("## Entities\n\n")
+        for entity_name, entity_data in results['entities'].items():
+            f.write(f"### {entity_name}\n\n")
+
+            if entity_data['primary_key']:
+                f.write(f"- Primary Key: **{entity_data['primary_key']}**\n")
+
+            f.write("- Fields:\n")
+            for field in entity_data['fields']:
+                if entity_data['primary_key'] == field:
+                    f.write(f"  - **{field}** (PK)\n")
+                else:
+                    f.write(f"  - {field}\n")
+
+            f.write("\n")
+
+        # Write relationships
+        f.write("## Relationships\n\n")
+        f.write("| Source Table | Source Field | Target Table | Target Field | Type | Source File |\n")
+        f.write("|-------------|-------------|-------------|-------------|------|------------|\n")
+
+    def write(self, rel):
+        fk_indicator = " (FK)" if rel.get('is_potential_fk', False) else ""
+        self.stream.write(f"| {rel['source_table']} | {rel['source_field']}{fk_indicator} | {rel['target_table']} | {rel['target_field']} | {rel['relationship_type']} | {rel['source_file']} |\n")
+
+    def end(self):
+        pass
+
+
+class ExportPipeline:
+    """
+    Fans analysis results out to several export formats at once.
+
+    Record formats (CSV, JSON, NDJSON, Markdown) share one iteration over the
+    relationships, each writing through its own buffered stream. Formats
+    that render the whole graph (PlantUML, SVG/PNG, column usage, HTML,
+    binary snapshot) run on a thread pool while the records are written, so
+    the total time approaches that of the slowest format rather than the sum.
+    """
+
+    RECORD_WRITERS = {
+        'csv': CsvRecordWriter,
+        'json': JsonRecordWriter,
+        'ndjson': NdjsonRecordWriter,
+        'markdown': MarkdownRecordWriter
+    }
+
+    DEFAULT_FILENAMES = {
+        'plantuml': 'diagram.puml',
+        'svg': 'diagram.svg',
+        'png': 'diagram.png',
+        'csv': 'relationships.csv',
+        'json': 'analysis_results.json',
+        'ndjson': 'analysis_results.ndjson',
+        'markdown': 'relationships.md',
+        'column_usage': 'column_usage.csv',
+        'html': 'report.html',
+        'snapshot': 'analysis_results.snap'
+    }
+
+    LABELS = {
+        'plantuml': 'PlantUML',
+        'svg': 'SVG',
+        'png': 'PNG',
+        'csv': 'CSV',
+        'json': 'JSON',
+        'ndjson': 'NDJSON',
+        'markdown': 'Markdown',
+        'column_usage': 'Column usage CSV',
+        'html': 'HTML report',
+        'snapshot': 'Binary snapshot'
+    }
+
+    def __init__(self, exporter, svg_renderer='native', max_workers=4):
+        """
+        Initialize the pipeline.
+
+        Args:
+            exporter (Exporter): Exporter providing the output directory and
+                the rendering exports
+            svg_renderer (str): 'native' or 'plantuml'
+            max_workers (int): Threads for the rendering formats
+        """
+        self.logger = logging.getLogger(__name__)
+        self.exporter = exporter
+        self.svg_renderer = svg_renderer
+        self.max_workers = max_workers
+
+    def run(self, results, filenames, diagram=None, positions=None, partitioned=None):
+        """
+        Export results to every requested format.
+
+        Args:
+            results (dict): Analysis results
+            filenames (dict): Format -> output filename; None uses the
+                default filename (see DEFAULT_FILENAMES)
+            diagram (str or iterable): PlantUML source for the .puml file,
+                e.g. PlantUmlGenerator.iter_diagram (results['diagram'] by default)
+            positions (dict): Layout positions for the native SVG renderer
+            partitioned (dict): Output of Analyzer.partition() for the HTML report
+
+        Returns:
+            dict: Format -> path of the exported file (None on failure)
+        """
+        unknown = set(filenames) - set(self.DEFAULT_FILENAMES)
+        if unknown:
+            raise ValueError(f"Unknown export formats: {', '.join(sorted(unknown))}")
+        filenames = {fmt: name or self.DEFAULT_FILENAMES[fmt] for fmt, name in filenames.items()}
+
+        paths = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            jobs = {
+                fmt: executor.submit(render)
+                for fmt, render in self._render_jobs(results, filenames, diagram, positions, partitioned).items()
+            }
+
+            # 记录型格式在主线程中共享一次遍历，与渲染任务并行
+            paths.update(self._write_records(results, filenames))
+
+            for fmt, job in jobs.items():
+                if fmt == 'images':
+                    paths.update(job.result())
+                else:
+                    paths[fmt] = job.result()
+
+        return {fmt: paths.get(fmt) for fmt in filenames}
+
+    def stream(self, results, fmt, stream, diagram=None):
+        """
+        Write one format to an already open text stream (e.g. sys.stdout).
+
+        Args:
+            results (dict): Analysis results
+            fmt (str): 'plantuml' or a record format (see RECORD_WRITERS)
+            stream (io.TextIOBase): Destination stream; it is flushed, not closed
+            diagram (str or iterable): PlantUML source for 'plantuml'
+                (results['diagram'] by default)
+
+        Raises:
+            ValueError: If the format cannot be streamed
+        """
+        if fmt == 'plantuml':
+            PlantUmlGenerator.write_diagram(stream, results['diagram'] if diagram is None else diagram)
+            stream.write('\n')
+        elif fmt in self.RECORD_WRITERS:
+            writer = self.RECORD_WRITERS[fmt](stream, results)
+            writer.begin()
+            for rel in results['relationships']:
+                writer.write(rel)
+            writer.end()
+        else:
+            raise ValueError(f"Format cannot be written to a stream: {fmt}")
+        stream.flush()
+
+    def _render_jobs(self, results, filenames, diagram, positions, partitioned):
+        """
+        Build the callables for the formats that are not record streams.
+
+        Returns:
+            dict: Format (or 'images' for PlantUML server renders) -> callable
+        """
+        exporter = self.exporter
+        jobs = {}
+
+        if 'plantuml' in filenames:
+            source = results['diagram'] if diagram is None else diagram
+            jobs['plantuml'] = lambda: exporter.export_plantuml(source, filenames['plantuml'])
+
+        images = {}
+        if 'svg' in filenames:
+            if self.svg_renderer == 'native':
+                jobs['svg'] = lambda: exporter.export_native_svg(
+                    results['entities'], results['relationships'], filenames['svg'], positions
+                )
+            else:
+                images['svg'] = filenames['svg']
+        if 'png' in filenames:
+            images['png'] = filenames['png']
+        if images:
+            # export_images 已经并发请求 PlantUML 服务器
+            jobs['images'] = lambda: exporter.export_images(results['diagram'], images)
+
+        if 'column_usage' in filenames:
+            if results.get('column_index') is not None:
+                jobs['column_usage'] = lambda: exporter.export_column_usage(
+                    results['column_index'], filenames['column_usage']
+                )
+
+        if 'html' in filenames:
+            jobs['html'] = lambda: exporter.export_html(results, partitioned, filenames['html'])
+
+        if 'snapshot' in filenames:
+            jobs['snapshot'] = lambda: exporter.export_snapshot(results, filenames['snapshot'])
+
+        return jobs
+
+    def _write_records(self, results, filenames):
+        """
+        Write all record formats in one pass over the relationships.
+
+        A writer that fails is closed, its partial file removed and the
+        writer dropped; the others continue.
+
+        Returns:
+            dict: Format -> path (None on failure)
+        """
+        active = []
+        paths = {}
+
+        for fmt, writer_class in self.RECORD_WRITERS.items():
+            if fmt not in filenames:
+                continue
+            output_path = os.path.join(self.exporter.output_dir, filenames[fmt])
+            stream = None
+            try:
+                stream = open(output_path, 'w', newline=writer_class.newline,
+                              encoding='utf-8', buffering=BUFFER_SIZE)
+                writer = writer_class(stream, results)
+                writer.begin()
+                active.append((fmt, writer, stream, output_path))
+            except Exception as e:
+                self._fail(fmt, stream, output_path, e, paths)
+
+        for rel in results['relationships']:
+            for entry in list(active):
+                try:
+                    entry[1].write(rel)
+                except Exception as e:
+                    active.remove(entry)
+                    self._fail(entry[0], entry[2], entry[3], e, paths)
+
+        for fmt, writer, stream, output_path in active:
+            try:
+                writer.end()
+                stream.close()
+                paths[fmt] = output_path
+                self.logger.info(f"Exported {self.LABELS[fmt]} to {output_path}")
+            except Exception as e:
+                self._fail(fmt, stream, output_path, e, paths)
+
+        return paths
+
+    def _fail(self, fmt, stream, output_path, error, paths):
+        """Record a failed record format, close its stream and remove the partial file."""
+        self.logger.error(f"Error exporting {self.LABELS[fmt]}: {str(error)}")
+        paths[fmt] = None
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if os.path.exists(output_path):
+            os.remove(output_path)
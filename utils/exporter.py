@@ -6,7 +6,14 @@ import os
 import csv
 import json
 import logging
-import plantuml
+from core.plantuml_generator import PlantUmlGenerator
+from core.svg_renderer import SvgRenderer
+from core.binary_snapshot import BinarySnapshot
+from utils.plantuml_client import PlantUmlClient
+from utils.html_report import HtmlReport
+from utils.export_pipeline import (
+    BUFFER_SIZE, CsvRecordWriter, JsonRecordWriter, NdjsonRecordWriter, MarkdownRecordWriter
+)
 
 
 class Exporter:
@@ -15,19 +22,26 @@ class Exporter:
     Supports PNG, SVG, CSV, and JSON formats.
     """
     
-    def __init__(self, output_dir='./output'):
+    def __init__(self, output_dir='./output', render_cache=None, plantuml_client=None):
         """
         Initialize the exporter.
         
         Args:
             output_dir (str): Directory to store exported files
+            render_cache (RenderCache): Cache of rendered SVG/PNG files (optional)
+            plantuml_client (PlantUmlClient): Client for the PlantUML server;
+                defaults to the public server
         """
         self.logger = logging.getLogger(__name__)
         self.output_dir = output_dir
+        self.render_cache = render_cache
+        self.plantuml_client = plantuml_client or PlantUmlClient()
         
         # Create output directory if it doesn't exist
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        
+        self.svg_renderer = SvgRenderer()
     
     def export_csv(self, relationships, filename='relationships.csv'):
         """
@@ -42,26 +56,51 @@ class Exporter:
         """
         output_path = os.path.join(self.output_dir, filename)
         
+        try:
+            self._write_records(CsvRecordWriter, {'relationships': relationships}, output_path)
+            
+            self.logger.info(f"Exported CSV to {output_path}")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting CSV: {str(e)}")
+            return None
+    
+    def export_column_usage(self, column_index, filename='column_usage.csv'):
+        """
+        Export column usages (one row per column, role and statement) to CSV.
+        
+        Args:
+            column_index (ColumnIndex): Column usage index
+            filename (str): Output filename
+            
+        Returns:
+            str: Path to exported file
+        """
+        output_path = os.path.join(self.output_dir, filename)
+        
         try:
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(['Source Table', 'Source Field', 'Target Table', 'Target Field', 'Source File', 'FK Relationship'])
+                writer.writerow(['Table', 'Column', 'Role', 'Namespace', 'Statement', 'Statement Type', 'File', 'Line'])
                 
-                for rel in relationships:
+                for table, column, role, statement in column_index.rows():
                     writer.writerow([
-                        rel['source_table'],
-                        rel['source_field'],
-                        rel['target_table'],
-                        rel['target_field'],
-                        rel['source_file'],
-                        'Yes' if rel.get('is_potential_fk', False) else 'No'
+                        table,
+                        column,
+                        role,
+                        statement.get('namespace', ''),
+                        statement.get('sql_id', statement.get('statement_id')),
+                        statement.get('statement_type', ''),
+                        statement.get('file', ''),
+                        statement.get('line', '')
                     ])
             
-            self.logger.info(f"Exported CSV to {output_path}")
+            self.logger.info(f"Exported column usage CSV to {output_path}")
             return output_path
             
         except Exception as e:
-            self.logger.error(f"Error exporting CSV: {str(e)}")
+            self.logger.error(f"Error exporting column usage CSV: {str(e)}")
             return None
     
     def export_json(self, results, filename='analysis_results.json'):
@@ -78,24 +117,8 @@ class Exporter:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            # Prepare JSON-serializable data
-            export_data = {
-                'entities': [],
-                'relationships': results['relationships'],
-                'stats': results['stats']
-            }
-            
-            # Convert entities to a list format for JSON
-            for entity_name, entity_data in results['entities'].items():
-                entity_json = {
-                    'name': entity_name,
-                    'fields': entity_data['fields'],
-                    'primary_key': entity_data['primary_key']
-                }
-                export_data['entities'].append(entity_json)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2)
+            # Compact separators; relationships are streamed one record at a time
+            self._write_records(JsonRecordWriter, results, output_path)
             
             self.logger.info(f"Exported JSON to {output_path}")
             return output_path
@@ -104,12 +127,36 @@ class Exporter:
             self.logger.error(f"Error exporting JSON: {str(e)}")
             return None
     
+    def export_ndjson(self, results, filename='analysis_results.ndjson'):
+        """
+        Export analysis results as NDJSON (one entity or relationship per line).
+        
+        Args:
+            results (dict): Analysis results including entities and relationships
+            filename (str): Output filename
+            
+        Returns:
+            str: Path to exported file
+        """
+        output_path = os.path.join(self.output_dir, filename)
+        
+        try:
+            self._write_records(NdjsonRecordWriter, results, output_path)
+            
+            self.logger.info(f"Exported NDJSON to {output_path}")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting NDJSON: {str(e)}")
+            return None
+    
     def export_plantuml(self, diagram, filename='diagram.puml'):
         """
         Export diagram to PlantUML file.
         
         Args:
-            diagram (str): PlantUML diagram code
+            diagram (str or iterable): PlantUML diagram code, or diagram lines
+                (e.g. PlantUmlGenerator.iter_diagram) streamed to the file
             filename (str): Output filename
             
         Returns:
@@ -118,8 +165,7 @@ class Exporter:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(diagram)
+            PlantUmlGenerator.write_diagram(output_path, diagram)
             
             self.logger.info(f"Exported PlantUML to {output_path}")
             return output_path
@@ -128,6 +174,30 @@ class Exporter:
             self.logger.error(f"Error exporting PlantUML: {str(e)}")
             return None
     
+    def export_partitions(self, partitioned, prefix='diagram'):
+        """
+        Export one PlantUML file per partition plus the overview diagram.
+        
+        Args:
+            partitioned (dict): Output of Analyzer.partition
+            prefix (str): Filename prefix
+            
+        Returns:
+            list: Paths to exported files (overview first)
+        """
+        paths = []
+        
+        overview_path = self.export_plantuml(partitioned['overview'], f"{prefix}_overview.puml")
+        if overview_path:
+            paths.append(overview_path)
+        
+        for partition in partitioned['partitions']:
+            path = self.export_plantuml(partition['diagram'], f"{prefix}_part_{partition['id']:03d}.puml")
+            if path:
+                paths.append(path)
+        
+        return paths
+    
     def export_svg(self, diagram, filename='diagram.svg'):
         """
         Export diagram to SVG.
@@ -142,12 +212,47 @@ class Exporter:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            # Create a PlantUML server connection
-            # Default to public PlantUML server if no local server is specified
-            server = plantuml.PlantUML(url='http://www.plantuml.com/plantuml/svg/')
+            self._render_cached(
+                output_path, diagram, 'plantuml', 'svg',
+                lambda: self.plantuml_client.render_to_file(diagram, output_path, 'svg')
+            )
+            
+            self.logger.info(f"Exported SVG to {output_path}")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting SVG: {str(e)}")
+            return None
+    
+    def export_native_svg(self, entities, relationships, filename='diagram.svg', positions=None):
+        """
+        Export the ER diagram to SVG with the built-in renderer.
+        Works offline; no PlantUML server is contacted.
+        
+        Args:
+            entities (dict): Dictionary of entities
+            relationships (list): Normalized relationships
+            filename (str): Output filename
+            positions (dict): Entity name -> (x, y) top-left corner (optional)
+            
+        Returns:
+            str: Path to exported file
+        """
+        output_path = os.path.join(self.output_dir, filename)
+        
+        try:
+            # 原生渲染器只使用表名、字段和关联字段，缓存键也只基于这些内容
+            source = json.dumps([
+                {name: [entity['fields'], entity['primary_key']] for name, entity in entities.items()},
+                [[rel['source_table'], rel['source_field'], rel['target_table'], rel['target_field']]
+                 for rel in relationships],
+                positions
+            ], sort_keys=True)
             
-            # Generate SVG
-            server.processes(diagram, outfile=output_path)
+            self._render_cached(
+                output_path, source, 'native', 'svg',
+                lambda: self.svg_renderer.write_svg(output_path, entities, relationships, positions)
+            )
             
             self.logger.info(f"Exported SVG to {output_path}")
             return output_path
@@ -170,11 +275,10 @@ class Exporter:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            # Create a PlantUML server connection for PNG
-            server = plantuml.PlantUML(url='http://www.plantuml.com/plantuml/png/')
-            
-            # Generate PNG
-            server.processes(diagram, outfile=output_path)
+            self._render_cached(
+                output_path, diagram, 'plantuml', 'png',
+                lambda: self.plantuml_client.render_to_file(diagram, output_path, 'png')
+            )
             
             self.logger.info(f"Exported PNG to {output_path}")
             return output_path
@@ -183,6 +287,132 @@ class Exporter:
             self.logger.error(f"Error exporting PNG: {str(e)}")
             return None
     
+    def export_images(self, diagram, filenames):
+        """
+        Render a diagram to several formats concurrently on the PlantUML server.
+        Cached renderings are reused; the rest are rendered in parallel, so the
+        export takes as long as the slowest format.
+        
+        Args:
+            diagram (str): PlantUML diagram code
+            filenames (dict): Format ('svg', 'png') -> output filename
+            
+        Returns:
+            dict: Format -> path to exported file (None on failure)
+        """
+        paths = {}
+        jobs = []
+        
+        for fmt, filename in filenames.items():
+            output_path = os.path.join(self.output_dir, filename)
+            key = None
+            if self.render_cache is not None:
+                key = self.render_cache.key(diagram, 'plantuml', fmt)
+                if self.render_cache.fetch(key, output_path):
+                    paths[fmt] = output_path
+                    continue
+            jobs.append((fmt, output_path, key))
+        
+        rendered = self.plantuml_client.render_many((diagram, fmt, output_path) for fmt, output_path, _ in jobs)
+        
+        for (fmt, output_path, key), path in zip(jobs, rendered):
+            if path and key is not None:
+                self.render_cache.store(key, path)
+            paths[fmt] = path
+        
+        for fmt, path in paths.items():
+            if path:
+                self.logger.info(f"Exported {fmt.upper()} to {path}")
+        
+        return paths
+    
+    def _render_cached(self, output_path, source, renderer, fmt, render):
+        """
+        Produce a rendered file, reusing a cached rendering of the same source.
+        
+        Args:
+            output_path (str): Destination file
+            source (str): Diagram source the rendering depends on
+            renderer (str): Renderer name
+            fmt (str): Output format
+            render (callable): Renders the diagram to output_path
+        """
+        if self.render_cache is None:
+            render()
+            return
+        
+        key = self.render_cache.key(source, renderer, fmt)
+        if self.render_cache.fetch(key, output_path):
+            return
+        
+        render()
+        self.render_cache.store(key, output_path)
+    
+    def _write_records(self, writer_class, results, output_path):
+        """
+        Write one record format (see utils.export_pipeline) to a buffered file.
+        
+        Args:
+            writer_class (type): Record writer class
+            results (dict): Analysis results
+            output_path (str): Output file path
+        """
+        with open(output_path, 'w', newline=writer_class.newline,
+                  encoding='utf-8', buffering=BUFFER_SIZE) as f:
+            writer = writer_class(f, results)
+            writer.begin()
+            for rel in results['relationships']:
+                writer.write(rel)
+            writer.end()
+    
+    def export_snapshot(self, results, filename='analysis_results.snap'):
+        """
+        Export a binary columnar snapshot (memory-mapped when loaded for diff).
+        
+        Args:
+            results (dict): Analysis results
+            filename (str): Output filename
+            
+        Returns:
+            str: Path to exported file
+        """
+        output_path = os.path.join(self.output_dir, filename)
+        
+        try:
+            size = BinarySnapshot.write(output_path, results)
+            
+            self.logger.info(f"Exported binary snapshot to {output_path} ({size} bytes)")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting binary snapshot: {str(e)}")
+            return None
+    
+    def export_html(self, results, partitioned=None, filename='report.html'):
+        """
+        Export a self-contained HTML report that opens without a server.
+        
+        Args:
+            results (dict): Analysis results
+            partitioned (dict): Output of Analyzer.partition(); one diagram is
+                embedded per partition (all tables form one when omitted)
+            filename (str): Output filename
+            
+        Returns:
+            str: Path to exported file
+        """
+        output_path = os.path.join(self.output_dir, filename)
+        
+        try:
+            HtmlReport().write(output_path, results, partitioned)
+            
+            self.logger.info(f"Exported HTML report to {output_path}")
+            return output_path
+            
+        except Exception as e:
+            self.logger.error(f"Error exporting HTML report: {str(e)}")
+            return None
+    
     def export_markdown(self, results, filename='relationships.md'):
         """
         Export analysis results to Markdown.
@@ -197,41 +427,7 @@ class Exporter:
         output_path = os.path.join(self.output_dir, filename)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # Write title
-                f.write("# Database Table Relationships\n\n")
-                
-                # Write PlantUML diagram
-                f.write("## Entity Relationship Diagram\n\n")
-                f.write("```plantuml\n")
-                f.write(results['diagram'])
-                f.write("\n```\n\n")
-                
-                # Write entities
-                f.write("## Entities\n\n")
-                for entity_name, entity_data in results['entities'].items():
-                    f.write(f"### {entity_name}\n\n")
-                    
-                    if entity_data['primary_key']:
-                        f.write(f"- Primary Key: **{entity_data['primary_key']}**\n")
-                    
-                    f.write("- Fields:\n")
-                    for field in entity_data['fields']:
-                        if entity_data['primary_key'] == field:
-                            f.write(f"  - **{field}** (PK)\n")
-                        else:
-                            f.write(f"  - {field}\n")
-                    
-                    f.write("\n")
-                
-                # Write relationships
-                f.write("## Relationships\n\n")
-                f.write("| Source Table | Source Field | Target Table | Target Field | Type | Source File |\n")
-                f.write("|-------------|-------------|-------------|-------------|------|------------|\n")
-                
-                for rel in results['relationships']:
-                    fk_indicator = " (FK)" if rel.get('is_potential_fk', False) else ""
-                    f.write(f"| {rel['source_table']} | {rel['source_field']}{fk_indicator} | {rel['target_table']} | {rel['target_field']} | {rel['relationship_type']} | {rel['source_file']} |\n")
+            self._write_records(MarkdownRecordWriter, results, output_path)
             
             self.logger.info(f"Exported Markdown to {output_path}")
             return output_path
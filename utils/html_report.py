@@ -0,0 +1,432 @@
+"""
+HTML Report module.
+Builds a self-contained offline HTML report of analysis results.
+"""
+import html
+import json
+import logging
+from core.layout_engine import LayoutEngine
+from core.svg_renderer import SvgRenderer
+from utils.wire_format import CompactGraphEncoder
+
+
+class HtmlReport:
+    """
+    Single-file HTML report that works without a server.
+
+    All data is embedded once as compact JSON (string table plus integer
+    arrays, see CompactGraphEncoder). Partition diagrams are pre-rendered SVG
+    kept in inert `<script type="text/plain">` blocks, so the browser does not
+    parse them until a partition or one of its tables is opened. Table and
+    column names are searched through an embedded token index.
+    """
+
+    def __init__(self):
+        """Initialize the report builder."""
+        self.logger = logging.getLogger(__name__)
+        self.encoder = CompactGraphEncoder()
+        self.svg_renderer = SvgRenderer()
+        self.layout_engine = LayoutEngine()
+
+    def iter_html(self, results, partitioned=None, title='MyBatis SQL Relationship Report'):
+        """
+        Generate the report as a stream of HTML fragments.
+
+        Args:
+            results (dict): Analysis results
+            partitioned (dict): Output of Analyzer.partition(); all tables form
+                one partition when omitted
+            title (str): Report title
+
+        Yields:
+            str: HTML fragments
+        """
+        entities = results['entities']
+        relationships = results['relationships']
+        partitions = partitioned['partitions'] if partitioned else [{
+            'id': 1,
+            'name': 'partition_1',
+            'hub': (results.get('table_rankings') or [{'table': next(iter(entities), '')}])[0]['table'],
+            'tables': list(entities),
+            'relationships': relationships
+        }]
+
+        data = self._build_data(results, partitions, partitioned)
+        payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        # 避免 JSON 中的 "</script>" 提前结束脚本块
+        payload = payload.replace('</', '<\\/')
+
+        yield REPORT_HEAD.replace('{title}', html.escape(title))
+        yield f'<script type="application/json" id="report-data">{payload}</script>\n'
+
+        for partition in partitions:
+            yield f'<script type="text/plain" id="diagram-{partition["id"]}">'
+            yield from self._partition_svg(entities, partition)
+            yield '</script>\n'
+
+        yield REPORT_TAIL
+
+        self.logger.info(f"Built HTML report with {len(entities)} tables and {len(partitions)} partition diagrams")
+
+    def write(self, output_path, results, partitioned=None, title='MyBatis SQL Relationship Report'):
+        """
+        Write the report to a file.
+
+        Args:
+            output_path (str): Destination file
+            results (dict): Analysis results
+            partitioned (dict): Output of Analyzer.partition() (optional)
+            title (str): Report title
+
+        Returns:
+            str: Path to the report
+        """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_html(results, partitioned, title):
+                f.write(chunk)
+        return output_path
+
+    def _build_data(self, results, partitions, partitioned):
+        """
+        Build the embedded report data.
+
+        Args:
+            results (dict): Analysis results
+            partitions (list): Partitions to describe
+            partitioned (dict): Output of Analyzer.partition() (optional)
+
+        Returns:
+            dict: JSON-serializable report data
+        """
+        entities = results['entities']
+        relationships = results['relationships']
+        graph = self.encoder.encode(entities, relationships)
+
+        strings = graph['strings']
+        string_ids = {value: i for i, value in enumerate(strings)}
+        node_ids = {strings[string_id]: i for i, string_id in enumerate(graph['nodes'])}
+
+        def intern(value):
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        # Fields per node: [primary key or -1, field, ...]
+        fields = []
+        search = {}
+        for string_id in graph['nodes']:
+            name = strings[string_id]
+            node = node_ids[name]
+            search.setdefault(string_id, set()).add(node)
+            entity = entities.get(name, {'fields': [], 'primary_key': None})
+            primary_key = entity['primary_key']
+            field_ids = [intern(field) for field in entity['fields']]
+            fields.append([intern(primary_key) if primary_key else -1] + field_ids)
+            for field_id in field_ids:
+                search.setdefault(field_id, set()).add(node)
+
+        partition_of = [0] * len(graph['nodes'])
+        partition_data = []
+        for partition in partitions:
+            tables = [node_ids[table] for table in partition['tables'] if table in node_ids]
+            for node in tables:
+                partition_of[node] = partition['id']
+            partition_data.append({
+                'id': partition['id'],
+                'name': partition['name'],
+                'hub': node_ids.get(partition['hub'], -1),
+                'tables': tables,
+                'relationships': len(partition['relationships'])
+            })
+
+        statements = []
+        table_statements = {}
+        table_index = results.get('table_index')
+        if table_index is not None:
+            statements = [
+                [statement.get(field) for field in ('namespace', 'sql_id', 'statement_type', 'file', 'line')]
+                for statement in table_index.statements
+            ]
+            for table in table_index.table_names():
+                if table in node_ids:
+                    table_statements[node_ids[table]] = table_index.tables[table]
+
+        return {
+            'graph': graph,
+            'evidence': self.encoder.encode_evidence(relationships),
+            'fields': fields,
+            'partition_of': partition_of,
+            'partitions': partition_data,
+            'cross_edges': partitioned['cross_edges'] if partitioned else [],
+            'hubs': [
+                [node_ids[hub['table']], hub['degree'], hub['weighted_degree'], round(hub['pagerank'], 6)]
+                for hub in results['stats'].get('hub_tables', []) if hub['table'] in node_ids
+            ],
+            'statements': statements,
+            'table_statements': table_statements,
+            'search': sorted([string_id, sorted(nodes)] for string_id, nodes in search.items()),
+            'stats': {
+                key: value for key, value in results['stats'].items()
+                if isinstance(value, (int, float, str))
+            }
+        }
+
+    def _partition_svg(self, entities, partition):
+        """
+        Render the diagram of one partition.
+
+        Args:
+            entities (dict): Dictionary of all entities
+            partition (dict): Partition with 'tables' and 'relationships'
+
+        Yields:
+            str: SVG fragments (without the XML declaration)
+        """
+        partition_entities = {table: entities[table] for table in partition['tables'] if table in entities}
+        layout = self.layout_engine.layout(
+            partition_entities, partition['relationships'], self.svg_renderer.box_sizes(partition_entities)
+        )
+
+        for chunk in self.svg_renderer.iter_svg(partition_entities, partition['relationships'], layout['positions']):
+            if not chunk.startswith('<?xml'):
+                yield chunk
+
+
+REPORT_HEAD = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+body{margin:0;font-family:-apple-system,"Segoe UI",Arial,sans-serif;font-size:14px;color:#222;display:flex;height:100vh}
+#sidebar{width:300px;border-right:1px solid #ddd;display:flex;flex-direction:column;background:#fafafa}
+#sidebar h1{font-size:16px;margin:12px}
+#search{margin:0 12px 8px;padding:6px;border:1px solid #ccc;border-radius:4px}
+#nav{overflow:auto;flex:1;padding:0 12px 12px}
+#nav summary{cursor:pointer;padding:3px 0}
+#nav a{display:block;padding:2px 0 2px 12px;color:#0b5cad;text-decoration:none;cursor:pointer}
+#nav a:hover{text-decoration:underline}
+#main{flex:1;overflow:auto;padding:16px 24px}
+table{border-collapse:collapse;margin:8px 0 16px}
+th,td{border:1px solid #ddd;padding:4px 8px;text-align:left}
+th{background:#f3f3f3}
+.muted{color:#777}
+.pk{font-weight:bold;text-decoration:underline}
+#diagram{border:1px solid #ddd;overflow:auto;max-height:70vh;margin-top:8px}
+#diagram .entity.selected rect.box{stroke:#0b5cad;stroke-width:3}
+</style>
+</head>
+<body>
+<div id="sidebar">
+<h1>{title}</h1>
+<input id="search" type="search" placeholder="Search tables and columns">
+<div id="nav"></div>
+</div>
+<div id="main"></div>
+'''
+
+REPORT_TAIL = '''<script>
+(function() {
+    'use strict';
+    const data = JSON.parse(document.getElementById('report-data').textContent);
+    const graph = data.graph;
+    const strings = graph.strings;
+    const names = graph.nodes.map(id => strings[id]);
+    const stride = graph.edge_stride;
+    const nav = document.getElementById('nav');
+    const main = document.getElementById('main');
+    let shownPartition = null;
+    let edgesByNode = null;
+
+    function el(tag, text, className) {
+        const node = document.createElement(tag);
+        if (text !== undefined) node.textContent = text;
+        if (className) node.className = className;
+        return node;
+    }
+
+    function table(headers, rows) {
+        const result = el('table');
+        const head = result.insertRow();
+        headers.forEach(h => head.appendChild(el('th', h)));
+        rows.forEach(cells => {
+            const row = result.insertRow();
+            cells.forEach(cell => {
+                const td = row.insertCell();
+                if (cell instanceof Node) td.appendChild(cell); else td.textContent = cell;
+            });
+        });
+        return result;
+    }
+
+    function tableLink(node) {
+        const link = el('a', names[node]);
+        link.addEventListener('click', () => showTable(node));
+        return link;
+    }
+
+    // Index edges by node on first use only
+    function edgesOf(node) {
+        if (!edgesByNode) {
+            edgesByNode = names.map(() => []);
+            for (let i = 0; i < graph.edges.length; i += stride) {
+                edgesByNode[graph.edges[i]].push(i / stride);
+                if (graph.edges[i + 2] !== graph.edges[i]) edgesByNode[graph.edges[i + 2]].push(i / stride);
+            }
+        }
+        return edgesByNode[node];
+    }
+
+    function evidence(edge) {
+        const ev = data.evidence;
+        const offset = edge - ev.start;
+        return offset >= 0 && offset < ev.files.length ? ev.strings[ev.files[offset]] : '';
+    }
+
+    function loadDiagram(partitionId) {
+        const container = document.getElementById('diagram');
+        if (shownPartition !== partitionId || !container.firstChild) {
+            container.innerHTML = document.getElementById('diagram-' + partitionId).textContent;
+            shownPartition = partitionId;
+        }
+        return container;
+    }
+
+    function showOverview() {
+        main.innerHTML = '';
+        main.appendChild(el('h2', 'Overview'));
+        main.appendChild(table(['Metric', 'Value'], Object.entries(data.stats)));
+        if (data.hubs.length) {
+            main.appendChild(el('h3', 'Hub Tables'));
+            main.appendChild(table(['Table', 'Degree', 'Weighted Degree', 'PageRank'],
+                data.hubs.map(hub => [tableLink(hub[0]), hub[1], hub[2], hub[3].toFixed(4)])));
+        }
+        main.appendChild(el('h3', 'Partitions'));
+        main.appendChild(table(['Partition', 'Hub', 'Tables', 'Relationships'],
+            data.partitions.map(p => {
+                const link = el('a', p.name);
+                link.addEventListener('click', () => showPartition(p.id));
+                return [link, p.hub >= 0 ? names[p.hub] : '', p.tables.length, p.relationships];
+            })));
+    }
+
+    function showPartition(partitionId) {
+        const partition = data.partitions.find(p => p.id === partitionId);
+        main.innerHTML = '';
+        main.appendChild(el('h2', partition.name));
+        main.appendChild(el('p', partition.tables.length + ' tables, ' + partition.relationships + ' relationships', 'muted'));
+        main.appendChild(el('div')).id = 'diagram';
+        shownPartition = null;
+        loadDiagram(partitionId);
+    }
+
+    function showTable(node) {
+        const fields = data.fields[node];
+        const partitionId = data.partition_of[node];
+        main.innerHTML = '';
+        main.appendChild(el('h2', names[node]));
+
+        const partitionLink = el('a', 'partition ' + partitionId);
+        partitionLink.addEventListener('click', () => showPartition(partitionId));
+        const info = el('p', 'Diagram: ', 'muted');
+        info.appendChild(partitionLink);
+        main.appendChild(info);
+
+        main.appendChild(el('h3', 'Fields'));
+        main.appendChild(table(['Field'], fields.slice(1).map(id => {
+            const cell = el('span', strings[id]);
+            if (id === fields[0]) cell.className = 'pk';
+            return [cell];
+        })));
+
+        main.appendChild(el('h3', 'Relationships'));
+        main.appendChild(table(['Source', 'Target', 'Type', 'Source File'], edgesOf(node).map(edge => {
+            const e = graph.edges.slice(edge * stride, edge * stride + stride);
+            const source = el('span');
+            source.appendChild(tableLink(e[0]));
+            source.appendChild(document.createTextNode('.' + strings[e[1]]));
+            const target = el('span');
+            target.appendChild(tableLink(e[2]));
+            target.appendChild(document.createTextNode('.' + strings[e[3]]));
+            return [source, target, strings[e[4]], evidence(edge)];
+        })));
+
+        const statementIds = data.table_statements[node] || [];
+        if (statementIds.length) {
+            main.appendChild(el('h3', 'Statements'));
+            main.appendChild(table(['Statement', 'Type', 'File', 'Line'], statementIds.map(id => {
+                const s = data.statements[id];
+                return [(s[0] ? s[0] + '.' : '') + s[1], s[2], s[3], s[4]];
+            })));
+        }
+
+        main.appendChild(el('div')).id = 'diagram';
+        shownPartition = null;
+        loadDiagram(partitionId);
+        const box = document.getElementById('entity-' + names[node]);
+        if (box) {
+            box.classList.add('selected');
+            box.scrollIntoView({ block: 'center', inline: 'center' });
+            main.scrollTop = 0;
+        }
+    }
+
+    function renderNav() {
+        nav.innerHTML = '';
+        const overview = el('a', 'Overview');
+        overview.addEventListener('click', showOverview);
+        nav.appendChild(overview);
+        data.partitions.forEach(p => {
+            const details = el('details');
+            details.appendChild(el('summary', p.name + ' (' + p.tables.length + ')'));
+            // Table links are only created when a partition is expanded
+            details.addEventListener('toggle', () => {
+                if (details.open && details.childNodes.length === 1) {
+                    const link = el('a', 'Diagram');
+                    link.addEventListener('click', () => showPartition(p.id));
+                    details.appendChild(link);
+                    p.tables.slice().sort((a, b) => names[a] < names[b] ? -1 : 1)
+                        .forEach(node => details.appendChild(tableLink(node)));
+                }
+            });
+            nav.appendChild(details);
+        });
+    }
+
+    function search(query) {
+        query = query.trim().toLowerCase();
+        if (!query) {
+            renderNav();
+            return;
+        }
+        nav.innerHTML = '';
+        let count = 0;
+        for (const [stringId, nodes] of data.search) {
+            const value = strings[stringId];
+            if (value.toLowerCase().indexOf(query) < 0) continue;
+            for (const node of nodes) {
+                const link = tableLink(node);
+                if (names[node] !== value) link.textContent += ' (' + value + ')';
+                nav.appendChild(link);
+                if (++count >= 200) return;
+            }
+        }
+        if (!count) nav.appendChild(el('p', 'No matches', 'muted'));
+    }
+
+    let searchTimer = null;
+    document.getElementById('search').addEventListener('input', event => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => search(event.target.value), 150);
+    });
+
+    renderNav();
+    showOverview();
+})();
+</script>
+</body>
+</html>
+'''
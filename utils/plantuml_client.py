@@ -0,0 +1,196 @@
+"""
+PlantUML Client module.
+Renders PlantUML diagrams through a configurable PlantUML server.
+"""
+import logging
+import queue
+import threading
+import time
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import plantuml
+
+
+class PlantUmlClientError(Exception):
+    """Raised when the PlantUML server cannot render a diagram."""
+
+
+class PlantUmlClient:
+    """
+    Pooled HTTP client for a PlantUML server.
+
+    Keeps a small pool of keep-alive connections to the configured server
+    (e.g. a local `plantuml/plantuml-server` container), applies a timeout to
+    every request, retries connection errors and 5xx responses, and can
+    render several diagrams/formats concurrently.
+    """
+
+    DEFAULT_SERVER = 'http://www.plantuml.com/plantuml/svg/'
+    FORMATS = ('svg', 'png', 'txt')
+    # GET URLs longer than this are sent as POST bodies instead
+    MAX_GET_LENGTH = 4000
+
+    def __init__(self, server_url=None, timeout=30, retries=2, pool_size=4):
+        """
+        Initialize the client.
+
+        Args:
+            server_url (str): PlantUML server URL; a trailing format segment
+                (e.g. `/svg/`) is ignored, the format is chosen per request
+            timeout (float): Socket timeout per request in seconds
+            retries (int): Extra attempts after a failed request
+            pool_size (int): Maximum idle connections and concurrent renders
+        """
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = max(1, pool_size)
+
+        parts = urlsplit(server_url or self.DEFAULT_SERVER)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported PlantUML server URL: {server_url}")
+
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        segments = [segment for segment in parts.path.split('/') if segment]
+        if segments and segments[-1] in self.FORMATS:
+            segments.pop()
+        self.base_path = '/' + ''.join(f"{segment}/" for segment in segments)
+
+        self._pool = queue.LifoQueue(maxsize=self.pool_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def render(self, diagram, fmt='svg'):
+        """
+        Render a diagram.
+
+        Args:
+            diagram (str): PlantUML diagram code
+            fmt (str): Output format ('svg', 'png' or 'txt')
+
+        Returns:
+            bytes: Rendered diagram
+
+        Raises:
+            PlantUmlClientError: If the server fails after all retries
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported PlantUML format: {fmt}")
+
+        encoded = plantuml.deflate_and_encode(diagram)
+        if len(encoded) <= self.MAX_GET_LENGTH:
+            method, path, body = 'GET', f"{self.base_path}{fmt}/{encoded}", None
+        else:
+            method, path, body = 'POST', f"{self.base_path}{fmt}", diagram.encode('utf-8')
+
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(min(0.2 * 2 ** (attempt - 1), 2.0))
+
+            connection = self._acquire()
+            try:
+                headers = {'Content-Type': 'text/plain; charset=utf-8'} if body is not None else {}
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                content = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                last_error = f"{type(e).__name__}: {str(e)}"
+                self.logger.warning(f"PlantUML request failed (attempt {attempt + 1}): {last_error}")
+                continue
+
+            self._release(connection)
+
+            if response.status == 200:
+                return content
+
+            last_error = f"HTTP {response.status} {response.reason}"
+            if response.status < 500:
+                break
+            self.logger.warning(f"PlantUML server error (attempt {attempt + 1}): {last_error}")
+
+        raise PlantUmlClientError(f"PlantUML server {self.netloc} could not render {fmt}: {last_error}")
+
+    def render_to_file(self, diagram, output_path, fmt='svg'):
+        """
+        Render a diagram to a file.
+
+        Args:
+            diagram (str): PlantUML diagram code
+            output_path (str): Destination file
+            fmt (str): Output format
+
+        Returns:
+            str: Path to the rendered file
+        """
+        content = self.render(diagram, fmt)
+        with open(output_path, 'wb') as f:
+            f.write(content)
+        return output_path
+
+    def render_many(self, jobs):
+        """
+        Render several diagrams concurrently.
+
+        Args:
+            jobs (list): (diagram, fmt, output_path) tuples
+
+        Returns:
+            list: Output path per job, or None for a failed job
+        """
+        def run(job):
+            diagram, fmt, output_path = job
+            try:
+                return self.render_to_file(diagram, output_path, fmt)
+            except (PlantUmlClientError, OSError) as e:
+                self.logger.error(f"Error rendering {output_path}: {str(e)}")
+                return None
+
+        jobs = list(jobs)
+        if len(jobs) <= 1:
+            return [run(job) for job in jobs]
+
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(jobs))) as executor:
+            return list(executor.map(run, jobs))
+
+    def close(self):
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _acquire(self):
+        """
+        Take an idle connection from the pool or open a new one.
+
+        Returns:
+            http.client.HTTPConnection: Connection to the server
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            self.connections_opened += 1
+
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.netloc, timeout=self.timeout)
+
+    def _release(self, connection):
+        """
+        Return a connection to the pool for reuse.
+
+        Args:
+            connection (http.client.HTTPConnection): Connection whose response
+                has been fully read
+        """
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
@@ -0,0 +1,164 @@
+"""
+Render Cache module.
+Content-addressed on-disk cache for rendered diagrams (SVG/PNG).
+"""
+import os
+import hashlib
+import logging
+import shutil
+import threading
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered diagram files.
+
+    Entries are keyed by the SHA-256 of the diagram source plus the renderer
+    and output format, so an unchanged diagram is copied from the cache
+    without touching any renderer. The total size is capped; the least
+    recently used entries (by file mtime, refreshed on every hit) are evicted
+    first.
+    """
+
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024):
+        """
+        Initialize the render cache.
+
+        Args:
+            cache_dir (str): Directory holding cached files
+            max_bytes (int): Maximum total size of cached files
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+    def key(self, source, renderer, fmt):
+        """
+        Compute the cache key of a diagram.
+
+        Args:
+            source (str or bytes): Diagram source
+            renderer (str): Renderer name (e.g. 'native', 'plantuml')
+            fmt (str): Output format (e.g. 'svg', 'png')
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{renderer}\0{fmt}\0".encode('utf-8'))
+        digest.update(source.encode('utf-8') if isinstance(source, str) else source)
+        return f"{digest.hexdigest()}.{fmt}"
+
+    def fetch(self, key, output_path):
+        """
+        Copy a cached rendering to an output path.
+
+        Args:
+            key (str): Cache key
+            output_path (str): Destination file
+
+        Returns:
+            bool: True on a hit, False on a miss
+        """
+        path = os.path.join(self.cache_dir, key)
+
+        with self._lock:
+            try:
+                shutil.copyfile(path, output_path)
+                os.utime(path)
+            except FileNotFoundError:
+                self.misses += 1
+                self.logger.info(f"Render cache miss: {key} ({self._summary()})")
+                return False
+
+            self.hits += 1
+            self.logger.info(f"Render cache hit: {key} ({self._summary()})")
+            return True
+
+    def store(self, key, rendered_path):
+        """
+        Add a rendered file to the cache and evict old entries.
+
+        Args:
+            key (str): Cache key
+            rendered_path (str): Freshly rendered file
+        """
+        path = os.path.join(self.cache_dir, key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        with self._lock:
+            try:
+                shutil.copyfile(rendered_path, temp_path)
+                os.replace(temp_path, path)
+            except OSError as e:
+                self.logger.warning(f"Could not cache rendering {key}: {str(e)}")
+                return
+
+            self._evict()
+
+    def clear(self):
+        """Remove all cached files and reset counters."""
+        with self._lock:
+            for entry in self._entries():
+                os.remove(entry.path)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit rate, entry count and total size
+        """
+        with self._lock:
+            entries = self._entries()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(entries),
+                'bytes': sum(entry.stat().st_size for entry in entries),
+                'max_bytes': self.max_bytes
+            }
+
+    def _entries(self):
+        """
+        List the cached files.
+
+        Returns:
+            list: os.DirEntry of every cached file
+        """
+        return [entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and not entry.name.endswith('.tmp')]
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self._entries()))
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.logger.debug(f"Evicted {os.path.basename(path)} from render cache")
+
+    def _summary(self):
+        """
+        Format the hit/miss counters for logging.
+
+        Returns:
+            str: Counter summary
+        """
+        return f"{self.hits} hits, {self.misses} misses"
@@ -0,0 +1,213 @@
+"""
+Run Store module.
+Per-analysis output directories keyed by an input fingerprint.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+
+
+class RunStore:
+    """
+    Output directories for individual analysis runs.
+
+    Each run writes into its own directory, named after a fingerprint of the
+    analyzed directory (path, size and modification time of every XML file)
+    and of the settings that affect the output. Concurrent analyses never
+    share files, and analyzing unchanged input again reuses the files already
+    generated for it.
+
+    Run directories are evicted least recently used first (by directory
+    mtime, refreshed by run_dir() and touch()) once they are older than
+    max_age or their total size exceeds max_bytes.
+    """
+
+    def __init__(self, root_dir, max_bytes=1024 * 1024 * 1024, max_age=7 * 24 * 3600):
+        """
+        Initialize the run store.
+
+        Args:
+            root_dir (str): Directory holding the run directories
+            max_bytes (int): Maximum total size of all runs (0 for no limit)
+            max_age (int): Seconds after the last use before a run is
+                evicted (0 for no limit)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        if not os.path.exists(root_dir):
+            os.makedirs(root_dir)
+
+    @staticmethod
+    def fingerprint(directory_path, settings=None):
+        """
+        Fingerprint the input of an analysis.
+
+        Only file metadata is read, so this is cheap compared to the analysis.
+
+        Args:
+            directory_path (str): Directory with MyBatis XML files
+            settings (dict): Settings that change the output (optional)
+
+        Returns:
+            str: Hex fingerprint (run id)
+        """
+        directory_path = os.path.abspath(directory_path)
+        digest = hashlib.sha256()
+        digest.update(directory_path.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(json.dumps(settings or {}, sort_keys=True).encode('utf-8'))
+
+        files = []
+        for root, _, names in os.walk(directory_path):
+            for name in names:
+                if name.endswith('.xml'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((os.path.relpath(path, directory_path), stat.st_size, stat.st_mtime_ns))
+
+        for relative_path, size, mtime in sorted(files):
+            digest.update(f"\0{relative_path}\0{size}\0{mtime}".encode('utf-8'))
+
+        return digest.hexdigest()[:24]
+
+    def run_dir(self, run_id):
+        """
+        Get (and create) the directory of a run and mark it as used.
+
+        Args:
+            run_id (str): Run id from fingerprint()
+
+        Returns:
+            str: Path of the run directory
+        """
+        path = self.path(run_id)
+
+        with self._lock:
+            if os.path.isdir(path):
+                os.utime(path)
+                self.logger.info(f"Reusing run directory {run_id}")
+            else:
+                os.makedirs(path)
+                self.logger.info(f"Created run directory {run_id}")
+
+        return path
+
+    def touch(self, run_id):
+        """
+        Mark an existing run as used, e.g. when one of its files is served.
+
+        Args:
+            run_id (str): Run id
+
+        Returns:
+            bool: True if the run directory exists
+
+        Raises:
+            ValueError: If the run id is not a fingerprint
+        """
+        path = self.path(run_id)
+
+        with self._lock:
+            try:
+                os.utime(path)
+            except OSError:
+                return False
+        return True
+
+    def path(self, run_id):
+        """
+        Get the directory path of a run without creating it.
+
+        Args:
+            run_id (str): Run id
+
+        Returns:
+            str: Path of the run directory
+
+        Raises:
+            ValueError: If the run id is not a fingerprint
+        """
+        if not run_id or not all(c in '0123456789abcdef' for c in run_id):
+            raise ValueError(f"Invalid run id: {run_id}")
+        return os.path.join(self.root_dir, run_id)
+
+    def evict(self, keep=()):
+        """
+        Remove expired runs, then least recently used runs until the store
+        fits max_bytes.
+
+        Args:
+            keep (iterable): Run ids that must not be removed (e.g. runs
+                being analyzed or exported)
+
+        Returns:
+            list: Removed run ids
+        """
+        keep = set(keep)
+        removed = []
+
+        with self._lock:
+            runs = sorted(self._runs())
+            total = sum(size for _, size, _ in runs)
+            now = time.time()
+
+            for mtime, size, run_id in runs:
+                expired = self.max_age and now - mtime > self.max_age
+                too_big = self.max_bytes and total > self.max_bytes
+                if run_id in keep or not (expired or too_big):
+                    continue
+                shutil.rmtree(os.path.join(self.root_dir, run_id), ignore_errors=True)
+                total -= size
+                removed.append(run_id)
+
+        if removed:
+            self.logger.info(f"Evicted {len(removed)} run directories")
+        return removed
+
+    def stats(self):
+        """
+        Get store statistics.
+
+        Returns:
+            dict: Run count, total size and limits
+        """
+        with self._lock:
+            runs = self._runs()
+            return {
+                'runs': len(runs),
+                'bytes': sum(size for _, size, _ in runs),
+                'max_bytes': self.max_bytes,
+                'max_age': self.max_age
+            }
+
+    def _runs(self):
+        """
+        List the run directories.
+
+        Returns:
+            list: (last use, size in bytes, run id) per run
+        """
+        runs = []
+        for entry in os.scandir(self.root_dir):
+            if not entry.is_dir():
+                continue
+            size = 0
+            for root, _, names in os.walk(entry.path):
+                for name in names:
+                    try:
+                        size += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        pass
+            runs.append((entry.stat().st_mtime, size, entry.name))
+        return runs
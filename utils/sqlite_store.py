@@ -0,0 +1,429 @@
+"""
+SQLite Store module.
+Persists analysis results in a local SQLite database for indexed queries.
+"""
+import json
+import time
+import sqlite3
+import logging
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    directory TEXT NOT NULL,
+    fingerprint TEXT,
+    created_at REAL NOT NULL,
+    total_entities INTEGER NOT NULL,
+    total_relationships INTEGER NOT NULL,
+    stats TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs (fingerprint);
+
+CREATE TABLE IF NOT EXISTS entities (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    primary_key TEXT,
+    field_count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS fields (
+    run_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fields_table ON fields (run_id, table_name);
+CREATE INDEX IF NOT EXISTS idx_fields_field ON fields (run_id, field);
+
+CREATE TABLE IF NOT EXISTS relationships (
+    run_id INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    source_table TEXT NOT NULL,
+    source_field TEXT NOT NULL,
+    target_table TEXT NOT NULL,
+    target_field TEXT NOT NULL,
+    relationship_type TEXT,
+    occurrences INTEGER NOT NULL,
+    is_potential_fk INTEGER NOT NULL,
+    PRIMARY KEY (run_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships (run_id, source_table, source_field);
+CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships (run_id, target_table, target_field);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    run_id INTEGER NOT NULL,
+    relationship_id INTEGER NOT NULL,
+    source_file TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_relationship ON evidence (run_id, relationship_id);
+CREATE INDEX IF NOT EXISTS idx_evidence_file ON evidence (run_id, source_file);
+
+CREATE TABLE IF NOT EXISTS statements (
+    run_id INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    namespace TEXT,
+    sql_id TEXT,
+    statement_type TEXT,
+    file TEXT,
+    line INTEGER,
+    PRIMARY KEY (run_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS statement_tables (
+    run_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    statement_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_statement_tables_table ON statement_tables (run_id, table_name);
+
+CREATE TABLE IF NOT EXISTS column_usages (
+    run_id INTEGER NOT NULL,
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    statement_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_column_usages_column ON column_usages (run_id, table_name, column_name);
+"""
+
+# Tables holding per-run rows, in insertion order
+RUN_TABLES = ('entities', 'fields', 'relationships', 'evidence', 'statements', 'statement_tables', 'column_usages')
+
+
+class SqliteStore:
+    """
+    Analysis results persisted in SQLite.
+
+    Every saved analysis is a run; entities, fields, relationships and
+    their evidence, statements and column usages are stored as rows keyed
+    by run id, with indexes on the table and field columns used by the
+    queries. A run is written with executemany inside a single transaction.
+    Queries default to the latest run.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create) a store.
+
+        Args:
+            db_path (str): SQLite database file
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def save(self, results, directory='', fingerprint=None):
+        """
+        Store analysis results as a new run.
+
+        Args:
+            results (dict): Analysis results
+            directory (str): Analyzed directory
+            fingerprint (str): Input fingerprint (see RunStore.fingerprint);
+                results with a fingerprint already stored are not saved again
+
+        Returns:
+            int: Run id
+        """
+        if fingerprint:
+            row = self.connection.execute(
+                'SELECT id FROM runs WHERE fingerprint = ? ORDER BY id DESC LIMIT 1', (fingerprint,)
+            ).fetchone()
+            if row is not None:
+                self.logger.info(f"Run {row['id']} already holds fingerprint {fingerprint}")
+                return row['id']
+
+        start = time.perf_counter()
+        stats = results['stats']
+        relationships = results['relationships']
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (directory, fingerprint, created_at, total_entities, total_relationships, stats) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (directory, fingerprint, time.time(), len(results['entities']), len(relationships),
+                 json.dumps(stats, default=str))
+            )
+            run_id = cursor.lastrowid
+
+            self.connection.executemany(
+                'INSERT INTO entities VALUES (?, ?, ?, ?)',
+                ((run_id, name, entity['primary_key'], len(entity['fields']))
+                 for name, entity in results['entities'].items())
+            )
+            self.connection.executemany(
+                'INSERT INTO fields VALUES (?, ?, ?, ?)',
+                ((run_id, name, field, position)
+                 for name, entity in results['entities'].items()
+                 for position, field in enumerate(entity['fields']))
+            )
+            self.connection.executemany(
+                'INSERT INTO relationships VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((run_id, rel_id, rel['source_table'], rel['source_field'], rel['target_table'],
+                  rel['target_field'], rel.get('relationship_type', ''), rel.get('occurrences', 1),
+                  1 if rel.get('is_potential_fk') else 0)
+                 for rel_id, rel in enumerate(relationships))
+            )
+            self.connection.executemany(
+                'INSERT INTO evidence VALUES (?, ?, ?)',
+                ((run_id, rel_id, rel['source_file'])
+                 for rel_id, rel in enumerate(relationships) if rel.get('source_file'))
+            )
+
+            table_index = results.get('table_index')
+            if table_index is not None:
+                self.connection.executemany(
+                    'INSERT INTO statements VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    ((run_id, statement_id, statement['namespace'], statement['sql_id'],
+                      statement['statement_type'], statement['file'], statement['line'])
+                     for statement_id, statement in enumerate(table_index.statements))
+                )
+                self.connection.executemany(
+                    'INSERT INTO statement_tables VALUES (?, ?, ?)',
+                    ((run_id, table, statement_id)
+                     for table, statement_ids in table_index.tables.items()
+                     for statement_id in statement_ids)
+                )
+
+            column_index = results.get('column_index')
+            if column_index is not None:
+                self.connection.executemany(
+                    'INSERT INTO column_usages VALUES (?, ?, ?, ?, ?)',
+                    self._column_usage_rows(run_id, column_index.to_dict())
+                )
+
+        # 刷新统计信息，否则查询规划器可能放弃表/字段索引而全表扫描
+        self.connection.execute('ANALYZE')
+
+        self.logger.info(f"Stored run {run_id} in {self.db_path} "
+                         f"({len(relationships)} relationships, {time.perf_counter() - start:.3f}s)")
+        return run_id
+
+    def runs(self):
+        """
+        List the stored runs, newest first.
+
+        Returns:
+            list: Run metadata dicts
+        """
+        rows = self.connection.execute(
+            'SELECT id, directory, fingerprint, created_at, total_entities, total_relationships '
+            'FROM runs ORDER BY id DESC'
+        )
+        return [dict(row) for row in rows]
+
+    def latest_run(self):
+        """
+        Get the id of the newest run.
+
+        Returns:
+            int: Run id, or None if the store is empty
+        """
+        row = self.connection.execute('SELECT MAX(id) AS id FROM runs').fetchone()
+        return row['id']
+
+    def delete_run(self, run_id):
+        """
+        Remove a run and all its rows.
+
+        Args:
+            run_id (int): Run id
+        """
+        with self.connection:
+            for table in RUN_TABLES:
+                self.connection.execute(f'DELETE FROM {table} WHERE run_id = ?', (run_id,))
+            self.connection.execute('DELETE FROM runs WHERE id = ?', (run_id,))
+
+    def tables(self, pattern=None, run_id=None):
+        """
+        List the tables of a run.
+
+        Args:
+            pattern (str): SQL LIKE pattern on the table name (optional)
+            run_id (int): Run id (latest when None)
+
+        Returns:
+            list: 'name', 'primary_key' and 'field_count' per table
+        """
+        rows = self.connection.execute(
+            'SELECT name, primary_key, field_count FROM entities '
+            'WHERE run_id = ? AND name LIKE ? ORDER BY name',
+            (self._run(run_id), (pattern or '%').lower())
+        )
+        return [dict(row) for row in rows]
+
+    def fields(self, table, run_id=None):
+        """
+        List the fields of a table.
+
+        Args:
+            table (str): Table name
+            run_id (int): Run id (latest when None)
+
+        Returns:
+            list: Field names in entity order
+        """
+        rows = self.connection.execute(
+            'SELECT field FROM fields WHERE run_id = ? AND table_name = ? ORDER BY position',
+            (self._run(run_id), table.lower())
+        )
+        return [row['field'] for row in rows]
+
+    def relationships(self, table, field=None, run_id=None):
+        """
+        Get the relationships touching a table (or one of its fields).
+
+        Args:
+            table (str): Table name
+            field (str): Field name (optional)
+            run_id (int): Run id (latest when None)
+
+        Returns:
+            list: Relationship dicts with their 'source_file'
+        """
+        run_id = self._run(run_id)
+        table = table.lower()
+        conditions = [('source_table', 'source_field'), ('target_table', 'target_field')]
+        queries = []
+        params = []
+        for table_column, field_column in conditions:
+            # One indexed lookup per side instead of an OR over both indexes
+            query = (f'SELECT r.*, e.source_file FROM relationships r '
+                     f'LEFT JOIN evidence e ON e.run_id = r.run_id AND e.relationship_id = r.id '
+                     f'WHERE r.run_id = ? AND r.{table_column} = ?')
+            params.extend((run_id, table))
+            if field is not None:
+                query += f' AND r.{field_column} = ?'
+                params.append(field.lower())
+            queries.append(query)
+
+        rows = self.connection.execute(f'{queries[0]} UNION {queries[1]} ORDER BY id', params)
+        return [self._relationship(row) for row in rows]
+
+    def statements(self, table, run_id=None):
+        """
+        Get the mapper statements referencing a table.
+
+        Args:
+            table (str): Table name
+            run_id (int): Run id (latest when None)
+
+        Returns:
+            list: Statement metadata dicts
+        """
+        rows = self.connection.execute(
+            'SELECT s.namespace, s.sql_id, s.statement_type, s.file, s.line '
+            'FROM statement_tables t JOIN statements s ON s.run_id = t.run_id AND s.id = t.statement_id '
+            'WHERE t.run_id = ? AND t.table_name = ? ORDER BY s.id',
+            (self._run(run_id), table.lower())
+        )
+        return [dict(row) for row in rows]
+
+    def column_usages(self, table, column, roles=None, run_id=None):
+        """
+        Get the statements using a column.
+
+        Args:
+            table (str): Table name
+            column (str): Column name
+            roles (list): Only these roles (optional)
+            run_id (int): Run id (latest when None)
+
+        Returns:
+            list: Usage dicts ('role' plus statement metadata)
+        """
+        query = ('SELECT u.role, s.namespace, s.sql_id, s.statement_type, s.file, s.line '
+                 'FROM column_usages u JOIN statements s ON s.run_id = u.run_id AND s.id = u.statement_id '
+                 'WHERE u.run_id = ? AND u.table_name = ? AND u.column_name = ?')
+        params = [self._run(run_id), table.lower(), column.lower()]
+        if roles:
+            query += f" AND u.role IN ({', '.join('?' * len(roles))})"
+            params.extend(roles)
+
+        rows = self.connection.execute(query + ' ORDER BY s.id', params)
+        return [dict(row) for row in rows]
+
+    def query(self, sql, params=()):
+        """
+        Run a read-only SQL query.
+
+        Args:
+            sql (str): SELECT statement
+            params (tuple): Query parameters
+
+        Returns:
+            tuple: (column names, list of row tuples)
+
+        Raises:
+            sqlite3.Error: If the query fails or tries to modify the store
+        """
+        self.connection.execute('PRAGMA query_only = ON')
+        try:
+            cursor = self.connection.execute(sql, params)
+            columns = [description[0] for description in cursor.description or ()]
+            return columns, [tuple(row) for row in cursor.fetchall()]
+        finally:
+            self.connection.execute('PRAGMA query_only = OFF')
+
+    def _run(self, run_id):
+        """
+        Resolve the run to query.
+
+        Args:
+            run_id (int): Run id, or None for the latest run
+
+        Returns:
+            int: Run id
+
+        Raises:
+            LookupError: If the store holds no runs
+        """
+        if run_id is not None:
+            return run_id
+        run_id = self.latest_run()
+        if run_id is None:
+            raise LookupError(f"No analysis stored in {self.db_path}")
+        return run_id
+
+    @staticmethod
+    def _column_usage_rows(run_id, column_data):
+        """
+        Flatten a serialized ColumnIndex into rows.
+
+        Yields:
+            tuple: (run id, table, column, role, statement id)
+        """
+        roles = column_data['roles']
+        for key, postings in column_data['columns'].items():
+            table, column = key.split('.', 1)
+            for statement_id, code in postings:
+                yield run_id, table, column, roles[code], statement_id
+
+    @staticmethod
+    def _relationship(row):
+        """
+        Convert a relationship row to the analyzer's relationship dict.
+
+        Returns:
+            dict: Relationship
+        """
+        rel = {
+            'source_table': row['source_table'],
+            'source_field': row['source_field'],
+            'target_table': row['target_table'],
+            'target_field': row['target_field'],
+            'relationship_type': row['relationship_type'],
+            'source_file': row['source_file'] or '',
+            'occurrences': row['occurrences']
+        }
+        if row['is_potential_fk']:
+            rel['is_potential_fk'] = True
+        return rel
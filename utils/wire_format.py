@@ -0,0 +1,166 @@
+"""
+Wire Format module.
+Compact encoding of analysis graphs for the web front end.
+"""
+import logging
+
+
+class CompactGraphEncoder:
+    """
+    Encodes entities and relationships as a string table plus integer arrays.
+
+    Every table, field and relationship type name is stored once in
+    'strings'. Nodes are string indexes; edges are a flat integer array with
+    EDGE_STRIDE values per relationship:
+
+        source node, source field, target node, target field,
+        relationship type, occurrences, flags
+
+    Node and field values index into 'nodes' and 'strings' respectively.
+    Layout positions, when given, are a flat [x, y, ...] array aligned with
+    'nodes'. The per-relationship source files (evidence) are left out and
+    served separately by encode_evidence().
+    """
+
+    FORMAT = 'compact-v1'
+    EDGE_STRIDE = 7
+    FLAG_POTENTIAL_FK = 1
+
+    def __init__(self):
+        """Initialize the encoder."""
+        self.logger = logging.getLogger(__name__)
+
+    def encode(self, entities, relationships, layout=None):
+        """
+        Encode a graph.
+
+        Args:
+            entities (dict or list): Entities (only the names are used)
+            relationships (list): Normalized relationships
+            layout (dict): Layout from LayoutEngine (optional)
+
+        Returns:
+            dict: Compact graph ('format', 'strings', 'nodes', 'edges',
+                'edge_stride' and 'positions')
+        """
+        strings = []
+        string_ids = {}
+
+        def intern(value):
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        nodes = []
+        node_ids = {}
+
+        def node(name):
+            node_id = node_ids.get(name)
+            if node_id is None:
+                node_id = node_ids[name] = len(nodes)
+                nodes.append(intern(name))
+            return node_id
+
+        for name in entities:
+            node(name)
+
+        edges = []
+        for rel in relationships:
+            edges.extend((
+                node(rel['source_table']),
+                intern(rel['source_field']),
+                node(rel['target_table']),
+                intern(rel['target_field']),
+                intern(rel.get('relationship_type', '')),
+                rel.get('occurrences', 1),
+                self.FLAG_POTENTIAL_FK if rel.get('is_potential_fk') else 0
+            ))
+
+        positions = None
+        if layout is not None:
+            positions = []
+            layout_positions = layout['positions']
+            for string_id in nodes:
+                positions.extend(layout_positions.get(strings[string_id], (0, 0)))
+
+        return {
+            'format': self.FORMAT,
+            'strings': strings,
+            'nodes': nodes,
+            'edges': edges,
+            'edge_stride': self.EDGE_STRIDE,
+            'positions': positions,
+            'layout_mode': layout['mode'] if layout is not None else None
+        }
+
+    def encode_evidence(self, relationships, start=0, count=None):
+        """
+        Encode the source files of a range of relationships.
+
+        Args:
+            relationships (list): Normalized relationships
+            start (int): Index of the first relationship
+            count (int): Number of relationships (all remaining when None)
+
+        Returns:
+            dict: 'start', 'strings' (distinct source files) and 'files'
+                (string index per relationship)
+        """
+        end = len(relationships) if count is None else min(len(relationships), start + count)
+        strings = []
+        string_ids = {}
+        files = []
+
+        for rel in relationships[start:end]:
+            source_file = rel.get('source_file', '')
+            string_id = string_ids.get(source_file)
+            if string_id is None:
+                string_id = string_ids[source_file] = len(strings)
+                strings.append(source_file)
+            files.append(string_id)
+
+        return {'start': start, 'strings': strings, 'files': files}
+
+    def decode(self, graph, evidence=None):
+        """
+        Decode a compact graph back into entity names and relationships.
+
+        Args:
+            graph (dict): Output of encode()
+            evidence (dict): Output of encode_evidence() (optional)
+
+        Returns:
+            dict: 'entities' (names), 'relationships' and 'positions'
+                (name -> [x, y], or None)
+        """
+        strings = graph['strings']
+        names = [strings[string_id] for string_id in graph['nodes']]
+        edges = graph['edges']
+        stride = graph['edge_stride']
+
+        relationships = []
+        for i in range(0, len(edges), stride):
+            rel = {
+                'source_table': names[edges[i]],
+                'source_field': strings[edges[i + 1]],
+                'target_table': names[edges[i + 2]],
+                'target_field': strings[edges[i + 3]],
+                'relationship_type': strings[edges[i + 4]],
+                'occurrences': edges[i + 5]
+            }
+            if edges[i + 6] & self.FLAG_POTENTIAL_FK:
+                rel['is_potential_fk'] = True
+            relationships.append(rel)
+
+        if evidence is not None:
+            for offset, string_id in enumerate(evidence['files']):
+                relationships[evidence['start'] + offset]['source_file'] = evidence['strings'][string_id]
+
+        positions = None
+        if graph.get('positions') is not None:
+            flat = graph['positions']
+            positions = {name: [flat[2 * i], flat[2 * i + 1]] for i, name in enumerate(names)}
+
+        return {'entities': names, 'relationships': relationships, 'positions': positions}
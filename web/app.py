@@ -3,11 +3,24 @@ Flask application for MyBatis SQL Relationship Analyzer.
 Provides a web interface for analyzing MyBatis XML files.
 """
 import os
+import time
 import logging
-from flask import Flask, render_template, request, jsonify, send_from_directory
+import threading
+from collections import OrderedDict
+from flask import Flask, Response, abort, render_template, request, jsonify, send_from_directory, stream_with_context
+from werkzeug.security import safe_join
 from core.analyzer import Analyzer
+from core.binary_snapshot import BinarySnapshot
+from core.plantuml_generator import PlantUmlGenerator
+from core.snapshot_diff import SnapshotDiff
+from utils.compression import ArtifactCompressor
 from utils.config import Config
 from utils.exporter import Exporter
+from utils.export_pipeline import ExportPipeline
+from utils.plantuml_client import PlantUmlClient
+from utils.render_cache import RenderCache
+from utils.run_store import RunStore
+from utils.wire_format import CompactGraphEncoder
 
 
 # Configure logging
@@ -26,10 +39,65 @@ if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
 # Initialize the analyzer
-analyzer = Analyzer(max_depth=config.get_int('MAX_DEPTH', 3))
+analyzer = Analyzer(
+    max_depth=config.get_int('MAX_DEPTH', 3),
+    cache_size=config.get_int('EXTRACTION_CACHE_SIZE', 4096),
+    layout_mode=config.get('LAYOUT_MODE', 'auto')
+)
+
+# Initialize the render cache (RENDER_CACHE_MAX_MB=0 disables it)
+render_cache = None
+if config.get_int('RENDER_CACHE_MAX_MB', 256) > 0:
+    render_cache = RenderCache(
+        config.get('RENDER_CACHE_DIR') or os.path.join(output_dir, '.render_cache'),
+        max_bytes=config.get_int('RENDER_CACHE_MAX_MB', 256) * 1024 * 1024
+    )
+
+# Shared keep-alive client for the configured PlantUML server
+plantuml_client = PlantUmlClient(
+    config.get('PLANTUML_SERVER'),
+    timeout=config.get_int('PLANTUML_TIMEOUT', 30),
+    retries=config.get_int('PLANTUML_RETRIES', 2),
+    pool_size=config.get_int('PLANTUML_POOL_SIZE', 4)
+)
+
+# Every analysis exports into its own run directory (<OUTPUT_DIR>/runs/<fingerprint>)
+run_store = RunStore(
+    os.path.join(output_dir, 'runs'),
+    max_bytes=config.get_int('RUN_STORE_MAX_MB', 1024) * 1024 * 1024,
+    max_age=config.get_int('RUN_STORE_MAX_AGE_HOURS', 168) * 3600
+)
+
+# Settings that change the exported files, part of the run fingerprint
+run_settings = {
+    'max_depth': config.get_int('MAX_DEPTH', 3),
+    'layout_mode': config.get('LAYOUT_MODE', 'auto'),
+    'svg_renderer': config.get('SVG_RENDERER', 'native')
+}
+
+# Compressed variants of downloads, plus on-the-fly compression of large
+# JSON responses (COMPRESS_MIN_KB=0 disables the latter)
+compressor = ArtifactCompressor()
+compress_min_bytes = config.get_int('COMPRESS_MIN_KB', 64) * 1024
+
+# Run exports never change for a run id; files in OUTPUT_DIR are revalidated
+DOWNLOAD_MAX_AGE = 24 * 3600
+
+# Encoder for the compact /analyze response
+graph_encoder = CompactGraphEncoder()
+
+# Results of the most recent analysis, used by the query endpoints
+current_results = None
+
+# Downloadable formats; each file is generated on its first download
+DOWNLOAD_FORMATS = ('plantuml', 'svg', 'csv', 'json', 'markdown', 'column_usage', 'html', 'snapshot')
+download_formats = {ExportPipeline.DEFAULT_FILENAMES[fmt]: fmt for fmt in DOWNLOAD_FORMATS}
 
-# Initialize the exporter
-exporter = Exporter(output_dir=output_dir)
+# Results of recent runs (run id -> results), kept for on-demand exports
+MAX_RECENT_RUNS = 8
+recent_runs = OrderedDict()
+run_locks = {}
+runs_lock = threading.Lock()
 
 # Create Flask app
 app = Flask(__name__)
@@ -49,10 +117,17 @@ def analyze():
     
     Expects:
         directory_path: Path to directory containing MyBatis XML files
+        format: 'compact' for the string-table graph encoding (optional);
+            the diagram text and relationship source files are then left
+            out and fetched from /diagram and /evidence with the run id
         
     Returns:
-        JSON with analysis results
+        JSON with analysis results; 'run' is the run id and 'files' holds
+        the names to request from /download, where each format is generated
+        on first use
     """
+    global current_results
+    
     try:
         data = request.get_json()
         directory_path = data.get('directory_path', '')
@@ -60,32 +135,52 @@ def analyze():
         if not directory_path:
             return jsonify({'error': 'No directory path provided'}), 400
         
-        # Analyze the directory
-        results = analyzer.analyze_directory(directory_path)
+        # 不存在的目录不会生成运行 id，也不会留下空的运行目录
+        if not os.path.isdir(directory_path):
+            return jsonify({'error': f'Directory not found: {directory_path}'}), 400
+        
+        # Unchanged input maps to the same run and reuses its results and files
+        run_id = run_store.fingerprint(directory_path, run_settings)
+        with runs_lock:
+            results = recent_runs.get(run_id)
+            if results is not None:
+                recent_runs.move_to_end(run_id)
+        
+        if results is None:
+            # /columns and the column usage download need the column index
+            results = analyzer.analyze_directory(directory_path, column_usages=True)
+            remember_run(run_id, results)
+        else:
+            logger.info(f"Reusing analysis of run {run_id}")
+        current_results = results
         
-        # Export results
-        plantuml_path = exporter.export_plantuml(results['diagram'])
-        svg_path = exporter.export_svg(results['diagram'])
-        csv_path = exporter.export_csv(results['relationships'])
-        json_path = exporter.export_json(results)
-        markdown_path = exporter.export_markdown(results)
+        run_store.run_dir(run_id)
+        with runs_lock:
+            active_runs = list(recent_runs)
+        run_store.evict(keep=active_runs)
+        
+        # Compute diagram positions once; the browser only places elements
+        layout = analyzer.get_layout(results)
         
         # Prepare response
         response = {
             'success': True,
             'message': f"Analysis complete. Found {results['stats']['total_entities']} tables and {results['stats']['total_relationships']} relationships.",
-            'diagram': results['diagram'],
-            'entities': list(results['entities'].keys()),
-            'relationships': results['relationships'],
-            'files': {
-                'plantuml': os.path.basename(plantuml_path) if plantuml_path else None,
-                'svg': os.path.basename(svg_path) if svg_path else None,
-                'csv': os.path.basename(csv_path) if csv_path else None,
-                'json': os.path.basename(json_path) if json_path else None,
-                'markdown': os.path.basename(markdown_path) if markdown_path else None
-            }
+            'table_rankings': results['table_rankings'],
+            'run': run_id,
+            'files': {fmt: f"{run_id}/{ExportPipeline.DEFAULT_FILENAMES[fmt]}" for fmt in DOWNLOAD_FORMATS}
         }
         
+        if data.get('format') == 'compact':
+            response['graph'] = graph_encoder.encode(results['entities'], results['relationships'], layout)
+        else:
+            response.update({
+                'diagram': results['diagram'],
+                'entities': list(results['entities'].keys()),
+                'relationships': results['relationships'],
+                'layout': layout
+            })
+        
         return jsonify(response)
         
     except Exception as e:
@@ -93,18 +188,502 @@ def analyze():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/download/<filename>')
+@app.route('/join-path')
+def join_path():
+    """
+    Find the shortest join paths between two tables of the latest analysis.
+    
+    Expects:
+        source: Table to start from
+        target: Table to reach
+        k: Maximum number of paths (default 3)
+        
+    Returns:
+        JSON with the join paths and the join columns for each hop
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    source = request.args.get('source', '').strip()
+    target = request.args.get('target', '').strip()
+    k = request.args.get('k', 3, type=int)
+    
+    if not source or not target:
+        return jsonify({'error': 'Both source and target tables are required'}), 400
+    
+    graph_index = analyzer.get_graph_index(current_results)
+    for table in (source, target):
+        if table.lower() not in graph_index:
+            return jsonify({'error': f'Unknown table: {table}'}), 404
+    
+    paths = graph_index.join_path(source, target, max(1, min(k, 20)))
+    
+    return jsonify({'source': source, 'target': target, 'paths': paths})
+
+
+@app.route('/focus')
+def focus():
+    """
+    Get the k-hop neighborhood of a table from the latest analysis.
+    
+    Expects:
+        table: Table at the center of the diagram
+        hops: Neighborhood radius (default 2)
+        
+    Returns:
+        JSON with the focused diagram, entities and relationships
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    table = request.args.get('table', '').strip()
+    hops = request.args.get('hops', 2, type=int)
+    
+    if not table:
+        return jsonify({'error': 'No table provided'}), 400
+    
+    focused = analyzer.focus(current_results, table, max(0, min(hops, 10)))
+    if focused is None:
+        return jsonify({'error': f'Unknown table: {table}'}), 404
+    
+    return jsonify({
+        'success': True,
+        'message': f"Showing {focused['stats']['total_entities']} tables and {focused['stats']['total_relationships']} relationships around {table}.",
+        'diagram': focused['diagram'],
+        'entities': list(focused['entities'].keys()),
+        'relationships': focused['relationships'],
+        'layout': analyzer.get_layout(focused),
+        'stats': focused['stats']
+    })
+
+
+@app.route('/partitions')
+def partitions():
+    """
+    Split the latest analysis into size-bounded partitions.
+    
+    Expects:
+        max_size: Maximum number of tables per partition (default 40)
+        
+    Returns:
+        JSON with one diagram and relationship list per partition, the
+        partition-to-partition edges and the overview diagram
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    max_size = request.args.get('max_size', 40, type=int)
+    partitioned = analyzer.partition(current_results, max(2, max_size))
+    
+    return jsonify(partitioned)
+
+
+@app.route('/impact/<table>')
+def impact(table):
+    """
+    List every mapper statement of the latest analysis that references a table.
+    
+    Args:
+        table (str): Table name
+        
+    Returns:
+        JSON with the statements (namespace, sql_id, statement_type, file, line)
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    table_index = current_results.get('table_index')
+    if table_index is None or table not in table_index:
+        return jsonify({'error': f'Unknown table: {table}'}), 404
+    
+    statements = table_index.lookup(table)
+    
+    return jsonify({'table': table.lower(), 'count': len(statements), 'statements': statements})
+
+
+@app.route('/columns')
+def columns():
+    """
+    Look up column usages in the latest analysis.
+    
+    Expects:
+        table: Table name
+        column: Column name (optional, without it a per-column summary of
+            the table is returned)
+        role: Only return this role, repeatable (optional)
+        
+    Returns:
+        JSON with the statements using the column and the role of each use
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    table = request.args.get('table', '').strip()
+    column = request.args.get('column', '').strip()
+    roles = request.args.getlist('role')
+    
+    if not table:
+        return jsonify({'error': 'No table provided'}), 400
+    
+    column_index = current_results['column_index']
+    
+    if not column:
+        return jsonify({'table': table.lower(), 'columns': column_index.summary(table)})
+    
+    if (table, column) not in column_index:
+        return jsonify({'error': f'Unknown column: {table}.{column}'}), 404
+    
+    usages = column_index.lookup(table, column, roles)
+    
+    return jsonify({'table': table.lower(), 'column': column.lower(), 'count': len(usages), 'usages': usages})
+
+
+@app.route('/search')
+def search():
+    """
+    Search the SQL of all statements in the latest analysis.
+    
+    Expects:
+        q: Text fragment (case and whitespace insensitive)
+        limit: Maximum number of hits (default 50)
+        
+    Returns:
+        JSON with the matching statements and a snippet for each
+    """
+    if current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    query = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 50, type=int)
+    
+    if not query:
+        return jsonify({'error': 'No search query provided'}), 400
+    
+    start = time.perf_counter()
+    hits = analyzer.search_statements(current_results, query, max(1, min(limit, 1000)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    return jsonify({'query': query, 'count': len(hits), 'hits': hits, 'elapsed_ms': round(elapsed_ms, 3)})
+
+
+@app.route('/diff', methods=['POST'])
+def diff():
+    """
+    Compare two saved analysis results.
+    
+    Snapshots are named by run id (as returned by /analyze) or by a path
+    relative to OUTPUT_DIR; other server paths are rejected.
+    
+    Expects:
+        old: Run id or analysis_results.json / binary snapshot under OUTPUT_DIR
+        new: Run id or snapshot under OUTPUT_DIR (optional, defaults to the
+            latest analysis)
+        
+    Returns:
+        JSON with added, removed and changed relationships and entities
+    """
+    data = request.get_json() or {}
+    old_name = data.get('old', '').strip()
+    new_name = data.get('new', '').strip()
+    
+    if not old_name:
+        return jsonify({'error': 'No snapshot provided'}), 400
+    
+    if not new_name and current_results is None:
+        return jsonify({'error': 'No analysis results available'}), 400
+    
+    snapshot_diff = SnapshotDiff()
+    snapshots = []
+    try:
+        for name in (old_name, new_name):
+            try:
+                snapshots.append(resolve_snapshot(name, snapshot_diff) if name else current_results)
+            except LookupError:
+                return jsonify({'error': f'Unknown snapshot: {name} '
+                                         '(expected a run id or a file under the output directory)'}), 400
+            except (OSError, ValueError):
+                # 不返回解析异常的细节
+                return jsonify({'error': f'Not a valid snapshot: {name}'}), 400
+        return jsonify(snapshot_diff.diff(*snapshots))
+    finally:
+        for snapshot in snapshots:
+            if isinstance(snapshot, BinarySnapshot):
+                snapshot.close()
+
+
+def resolve_snapshot(name, snapshot_diff):
+    """
+    Load a /diff snapshot by run id or by path relative to OUTPUT_DIR.
+    
+    Args:
+        name: Run id, or a file path relative to OUTPUT_DIR
+        snapshot_diff: SnapshotDiff used to load files
+        
+    Returns:
+        dict or BinarySnapshot: Snapshot with 'entities' and 'relationships'
+        
+    Raises:
+        LookupError: If name is neither a known run nor a file under OUTPUT_DIR
+    """
+    with runs_lock:
+        results = recent_runs.get(name)
+    if results is not None:
+        return results
+    
+    # 运行结果已不在内存中时，使用其目录中已导出的快照
+    try:
+        run_dir = run_store.path(name)
+    except ValueError:
+        run_dir = None
+    if run_dir is not None:
+        for fmt in ('snapshot', 'json'):
+            path = os.path.join(run_dir, ExportPipeline.DEFAULT_FILENAMES[fmt])
+            if os.path.isfile(path):
+                return snapshot_diff.load_snapshot(path)
+    
+    # 只允许读取输出目录内的文件，拒绝绝对路径和 ..
+    path = safe_join(os.path.abspath(output_dir), name)
+    if path is None or not os.path.isfile(path):
+        raise LookupError(name)
+    return snapshot_diff.load_snapshot(path)
+
+
+@app.route('/diagram')
+def diagram():
+    """
+    Stream the PlantUML diagram of an analysis run.
+    
+    Lines are sent as they are generated, so large diagrams are never
+    built as a single string.
+    
+    Query parameters:
+        run: Run id returned by /analyze
+    
+    Returns:
+        PlantUML diagram code (text/plain)
+    """
+    results, error = lookup_run(request.args.get('run', ''))
+    if error is not None:
+        return error
+    
+    chunks = PlantUmlGenerator.iter_chunks(analyzer.iter_diagram(results))
+    return Response(stream_with_context(chunks), mimetype='text/plain')
+
+
+@app.route('/evidence')
+def evidence():
+    """
+    Get the source files of an analysis run's relationships.
+    
+    Complements the compact /analyze response, which leaves them out.
+    
+    Query parameters:
+        run: Run id returned by /analyze
+        start: Index of the first relationship (default 0)
+        count: Number of relationships (default all)
+        
+    Returns:
+        JSON with 'start', the distinct source file 'strings' and a string
+        index per relationship in 'files'
+    """
+    results, error = lookup_run(request.args.get('run', ''))
+    if error is not None:
+        return error
+    
+    start = max(0, request.args.get('start', 0, type=int))
+    count = request.args.get('count', None, type=int)
+    
+    return jsonify(graph_encoder.encode_evidence(results['relationships'], start, count))
+
+
+def lookup_run(run_id):
+    """
+    Get the results of a recent run.
+    
+    The compact /analyze response refers to its run, so overlapping
+    analyses never read each other's results.
+    
+    Args:
+        run_id: Run id returned by /analyze
+        
+    Returns:
+        tuple: (results, None), or (None, error response) if the run id is
+            missing or its results are no longer in memory
+    """
+    if not run_id:
+        return None, (jsonify({'error': 'No run id provided'}), 400)
+    
+    with runs_lock:
+        results = recent_runs.get(run_id)
+    if results is None:
+        return None, (jsonify({'error': 'Analysis results expired, please analyze again'}), 404)
+    return results, None
+
+
+def remember_run(run_id, results):
+    """
+    Keep the results of a run for on-demand exports, dropping the oldest.
+    
+    Args:
+        run_id: Run id
+        results: Analysis results
+    """
+    with runs_lock:
+        recent_runs[run_id] = results
+        recent_runs.move_to_end(run_id)
+        while len(recent_runs) > MAX_RECENT_RUNS:
+            expired_run, _ = recent_runs.popitem(last=False)
+            run_locks.pop(expired_run, None)
+
+
+def generate_download(run_id, fmt):
+    """
+    Generate a download format of a run, once.
+    
+    Args:
+        run_id: Run id
+        fmt: Export format (see DOWNLOAD_FORMATS)
+        
+    Returns:
+        str: Path of the generated file, or None if the export failed
+        
+    Raises:
+        LookupError: If the file does not exist and the run's results are
+            no longer in memory
+    """
+    name = ExportPipeline.DEFAULT_FILENAMES[fmt]
+    path = os.path.join(run_store.path(run_id), name)
+    
+    # 只为内存中仍有结果的运行创建锁，未知运行 id 不会留下任何状态
+    with runs_lock:
+        results = recent_runs.get(run_id)
+        lock = None if results is None else run_locks.setdefault(run_id, threading.Lock())
+    if lock is None:
+        if os.path.exists(path):
+            return path
+        raise LookupError(run_id)
+    
+    # 同一次运行的导出串行执行，不同运行之间互不阻塞
+    with lock:
+        if os.path.exists(path):
+            return path
+        
+        exporter = Exporter(output_dir=run_store.run_dir(run_id), render_cache=render_cache,
+                            plantuml_client=plantuml_client)
+        pipeline = ExportPipeline(exporter, svg_renderer=run_settings['svg_renderer'])
+        positions = analyzer.get_layout(results)['positions'] if fmt == 'svg' else None
+        partitioned = analyzer.partition(results, 40) if fmt == 'html' else None
+        
+        # Export to a temporary name and rename it, so an existing file is
+        # always complete and a failed export leaves nothing to serve
+        temp_path = os.path.join(exporter.output_dir, name + '.tmp')
+        exported = pipeline.run(results, {fmt: name + '.tmp'}, positions=positions,
+                                partitioned=partitioned)[fmt]
+        if exported is None:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        
+        os.replace(temp_path, path)
+        compressor.compress_file(path)
+        return path
+
+
+@app.route('/download/<path:filename>')
 def download_file(filename):
     """
     Download a generated file.
     
+    Analysis exports are requested as <run id>/<filename>; they are
+    generated from the run's results on their first request and served
+    from the run directory afterwards.
+    
     Args:
         filename: Name of the file to download
         
     Returns:
         File for download
     """
-    return send_from_directory(output_dir, filename, as_attachment=True)
+    run_id, _, name = filename.rpartition('/')
+    if not run_id:
+        return send_artifact(output_dir, filename)
+    
+    try:
+        directory = run_store.path(run_id)
+    except ValueError:
+        return jsonify({'error': 'Unknown run'}), 404
+    
+    # 下载也算一次使用，常被下载的运行不会按 RUN_STORE_MAX_AGE_HOURS 过期
+    run_store.touch(run_id)
+    
+    fmt = download_formats.get(name)
+    if fmt is not None:
+        try:
+            if generate_download(run_id, fmt) is None:
+                return jsonify({'error': f'Failed to export {name}'}), 500
+        except LookupError:
+            return jsonify({'error': 'Analysis results expired, please analyze again'}), 404
+    
+    return send_artifact(directory, name, DOWNLOAD_MAX_AGE)
+
+
+def send_artifact(directory, name, max_age=None):
+    """
+    Send a file, or its precompressed variant if the client accepts one.
+    
+    Args:
+        directory: Directory of the file
+        name: File name
+        max_age: Seconds the client may cache the file; None makes it
+            revalidate (ETag / Last-Modified) on every use
+        
+    Returns:
+        File response
+    """
+    directory = os.path.abspath(directory)
+    path = safe_join(directory, name)
+    if path is None:
+        abort(404)
+    
+    served, encoding = compressor.select(path, request.headers.get('Accept-Encoding', ''))
+    # download_name 保留原文件名，Content-Type 按原文件推断
+    response = send_from_directory(directory, os.path.basename(served), as_attachment=True,
+                                   download_name=name, max_age=max_age)
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    if max_age is not None:
+        # 分析结果只应缓存在客户端，不应缓存在共享代理中
+        response.cache_control.public = False
+        response.cache_control.private = True
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """
+    Compress large JSON responses according to Accept-Encoding.
+    
+    Args:
+        response: Outgoing response
+        
+    Returns:
+        The response, compressed if it is JSON of at least COMPRESS_MIN_KB
+    """
+    if (compress_min_bytes <= 0 or response.direct_passthrough or response.is_streamed
+            or response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    
+    data = response.get_data()
+    if len(data) < compress_min_bytes:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = compressor.negotiate(request.headers.get('Accept-Encoding', ''))
+    if encoding is not None:
+        response.set_data(compressor.compress_bytes(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 
 @app.route('/config')
@@ -120,6 +699,7 @@ def get_config():
         'max_depth': config.get_int('MAX_DEPTH', 3),
         'output_dir': config.get('OUTPUT_DIR', './output'),
         'plantuml_server': config.get('PLANTUML_SERVER', 'http://www.plantuml.com/plantuml/svg/'),
+        'svg_renderer': config.get('SVG_RENDERER', 'native'),
         'version': '1.1.0'
     }
     
@@ -8,6 +8,8 @@ let lastMousePosition = { x: 0, y: 0 };
 let paperOrigin = { x: 0, y: 0 };
 let currentLayout = 'grid'; // Default layout
 let currentEntities = []; // Store entities for layout changes
+let serverPositions = null; // Positions computed by the server for the current diagram
+let entityElements = {}; // Table name -> JointJS element of the current diagram
 
 // Import layout manager
 import { applyLayout, updateLinks, MIN_ENTITY_SPACING } from './layouts/layout-manager.js';
@@ -113,6 +115,7 @@ function createLayoutControls() {
     
     // Layout options
     const layouts = [
+        { value: 'server', label: 'Precomputed (Server)' },
         { value: 'grid', label: 'Grid' },
         { value: 'dagre', label: 'Hierarchical (Dagre)' },
         { value: 'force', label: 'Force-Directed' },
@@ -179,6 +182,16 @@ function applySelectedLayout(layoutType) {
     // Store current entities for layout changes
     currentEntities = elements;
     
+    // Positions computed by the server only need to be applied
+    if (layoutType === 'server') {
+        if (applyServerPositions()) {
+            setTimeout(fitContentWithPadding, 100);
+        } else {
+            console.log('No precomputed layout available');
+        }
+        return;
+    }
+    
     // Get actual paper dimensions
     const paperWidth = paper.options.width;
     const paperHeight = paper.options.height;
@@ -204,6 +217,23 @@ function applySelectedLayout(layoutType) {
     }
 }
 
+// Place entities at the positions computed by the server
+function applyServerPositions() {
+    if (!serverPositions) {
+        return false;
+    }
+    
+    Object.entries(entityElements).forEach(([tableName, entity]) => {
+        const position = serverPositions[tableName];
+        if (position) {
+            entity.position(position[0], position[1]);
+        }
+    });
+    
+    updateLinks(graph);
+    return true;
+}
+
 // Custom fit content that ensures reasonable padding
 function fitContentWithPadding() {
     if (!graph || graph.getElements().length === 0) return;
@@ -388,7 +418,9 @@ function setupPanning() {
 }
 
 // Render ER diagram from relationship data
-function renderERDiagram(relationshipData) {
+// layout: optional server-computed layout; when present, elements are only
+// placed at its positions instead of running a layout in the browser
+function renderERDiagram(relationshipData, layout) {
     if (!paper || !graph) {
         initializeERDiagram();
     }
@@ -422,21 +454,29 @@ function renderERDiagram(relationshipData) {
         relationships.push(rel);
     });
     
-    // Add all entities to the graph
-    Object.values(entities).forEach(entity => {
-        graph.addCell(entity);
-    });
+    entityElements = entities;
+    serverPositions = layout && layout.positions ? layout.positions : null;
     
-    // Add relationships
-    relationships.forEach(rel => {
-        const link = createRelationship(
-            entities[rel.source_table],
-            entities[rel.target_table],
-            rel.source_field,
-            rel.target_field
-        );
-        graph.addCell(link);
-    });
+    // Place entities before adding them when positions are known
+    if (serverPositions) {
+        Object.entries(entities).forEach(([tableName, entity]) => {
+            const position = serverPositions[tableName];
+            if (position) {
+                entity.position(position[0], position[1]);
+            }
+        });
+    }
+    
+    // Add all entities to the graph in one batch
+    graph.addCells(Object.values(entities));
+    
+    // Add relationships in one batch
+    graph.addCells(relationships.map(rel => createRelationship(
+        entities[rel.source_table],
+        entities[rel.target_table],
+        rel.source_field,
+        rel.target_field
+    )));
     
     // Enable download buttons
     document.getElementById('download-svg-btn').disabled = false;
@@ -447,6 +487,25 @@ function renderERDiagram(relationshipData) {
     currentScale = 1;
     paper.scale(1);
     
+    const layoutSelect = document.getElementById('layout-select');
+    
+    if (serverPositions) {
+        console.log('Rendering diagram with precomputed layout:', layout.mode);
+        currentLayout = 'server';
+        if (layoutSelect) {
+            layoutSelect.value = 'server';
+        }
+        setTimeout(fitContentWithPadding, 100);
+        return;
+    }
+    
+    if (currentLayout === 'server') {
+        currentLayout = 'grid';
+        if (layoutSelect) {
+            layoutSelect.value = 'grid';
+        }
+    }
+    
     // Apply the current layout after a short delay to ensure rendering is complete
     console.log('Rendering diagram with layout:', currentLayout);
     setTimeout(function() {
@@ -7,6 +7,7 @@
 // 当 er-diagram.js 加载完毕后执行分析
 let erDiagramLoaded = false;
 let pendingRelationships = null;
+let pendingLayout = null;
 
 // 创建一个用于等待 er-diagram.js 加载完成的函数
 function waitForERDiagram() {
@@ -15,8 +16,9 @@ function waitForERDiagram() {
         // 如果有待处理的关系数据，处理它
         if (pendingRelationships) {
             console.log("Processing pending relationships data");
-            window.renderERDiagram(pendingRelationships);
+            window.renderERDiagram(pendingRelationships, pendingLayout);
             pendingRelationships = null;
+            pendingLayout = null;
         }
         return true;
     }
@@ -52,12 +54,43 @@ document.addEventListener('DOMContentLoaded', function() {
     const downloadCsvBtn = document.getElementById('download-csv-btn');
     const downloadJsonBtn = document.getElementById('download-json-btn');
     const downloadMarkdownBtn = document.getElementById('download-markdown-btn');
+    const downloadHtmlBtn = document.getElementById('download-html-btn');
     
     // PlantUML elements
     const plantumlCode = document.getElementById('plantuml-code');
     const copyPlantumlBtn = document.getElementById('copy-plantuml-btn');
     const downloadPlantumlBtn = document.getElementById('download-plantuml-btn');
     
+    // Focus elements
+    const focusForm = document.getElementById('focus-form');
+    const focusTable = document.getElementById('focus-table');
+    const focusTableOptions = document.getElementById('focus-table-options');
+    const focusHops = document.getElementById('focus-hops');
+    const focusResetBtn = document.getElementById('focus-reset-btn');
+    const partitionSelect = document.getElementById('partition-select');
+    
+    // Partitions of the current analysis
+    let currentPartitions = null;
+    
+    // Search elements
+    const searchForm = document.getElementById('search-form');
+    const searchQuery = document.getElementById('search-query');
+    const searchSummary = document.getElementById('search-summary');
+    const searchTable = document.getElementById('search-table').querySelector('tbody');
+    
+    // Snapshot diff elements
+    const diffForm = document.getElementById('diff-form');
+    const diffOldPath = document.getElementById('diff-old-path');
+    const diffNewPath = document.getElementById('diff-new-path');
+    const diffBtn = document.getElementById('diff-btn');
+    const diffResults = document.getElementById('diff-results');
+    const diffSummary = document.getElementById('diff-summary');
+    const diffTable = document.getElementById('diff-table').querySelector('tbody');
+    
+    // Hub tables elements
+    const hubTablesTable = document.getElementById('hub-tables-table');
+    let hubTableSort = { key: 'pagerank', descending: true };
+    
     // Theme toggle
     const themeToggleBtn = document.getElementById('theme-toggle-btn');
     const themeIcon = document.getElementById('theme-icon');
@@ -65,6 +98,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Store analysis results
     let currentResults = null;
     
+    // Source File cells of the relationships table, filled in by /evidence
+    let sourceFileCells = [];
+    
     // Initialize theme
     initTheme();
     
@@ -96,7 +132,7 @@ document.addEventListener('DOMContentLoaded', function() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ directory_path: path })
+            body: JSON.stringify({ directory_path: path, format: 'compact' })
         })
         .then(response => response.json())
         .then(data => {
@@ -109,6 +145,12 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
             
+            // Decode the compact graph once; table and diagram share the result
+            if (data.graph) {
+                Object.assign(data, decodeCompactGraph(data.graph));
+                delete data.graph;
+            }
+            
             // Store results
             currentResults = data;
             
@@ -116,26 +158,42 @@ document.addEventListener('DOMContentLoaded', function() {
             resultMessage.textContent = data.message;
             results.classList.remove('d-none');
             
-            // Update diagram
-            updateDiagram(data.diagram);
+            // Update diagram (compact responses fetch the PlantUML text separately)
+            if (data.diagram !== undefined) {
+                updateDiagram(data.diagram);
+            } else {
+                loadDiagramText(data);
+            }
             
-            // Update relationships table
+            // Update relationships table; source files follow from /evidence
             updateRelationshipsTable(data.relationships);
+            if (data.evidence_pending) {
+                loadEvidence(data);
+            }
+            
+            // Update hub table ranking
+            hubTableSort = { key: 'pagerank', descending: true };
+            updateHubTablesTable(data.table_rankings || []);
+            
+            // Clear results of a previous search
+            searchSummary.textContent = '';
+            searchTable.innerHTML = '';
             
             // Update PlantUML code
-            plantumlCode.textContent = data.diagram;
+            plantumlCode.textContent = data.diagram !== undefined ? data.diagram : 'Loading...';
             
             // Enable export buttons
             enableExportButtons(data);
             
-            // Render the JointJS diagram
-            if (erDiagramLoaded && window.renderERDiagram) {
-                console.log("Rendering ER diagram...");
-                window.renderERDiagram(data.relationships);
-            } else {
-                console.log("ER diagram not yet loaded, queueing data");
-                pendingRelationships = data.relationships;
-            }
+            // Offer the analyzed tables as focus targets
+            updateFocusOptions(data.entities);
+            focusResetBtn.disabled = true;
+            
+            // Offer per-partition diagrams for large schemas
+            loadPartitions();
+            
+            // Render the JointJS diagram at the server-computed positions
+            renderDiagramView(data.relationships, data.layout);
         })
         .catch(error => {
             console.error('Error:', error);
@@ -145,6 +203,232 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
+    // Decode the compact /analyze graph: string table plus integer arrays
+    function decodeCompactGraph(graph) {
+        const strings = graph.strings;
+        const names = graph.nodes.map(id => strings[id]);
+        const edges = graph.edges;
+        const stride = graph.edge_stride;
+        const relationships = new Array(edges.length / stride);
+        
+        for (let i = 0, j = 0; i < edges.length; i += stride, j++) {
+            relationships[j] = {
+                source_table: names[edges[i]],
+                source_field: strings[edges[i + 1]],
+                target_table: names[edges[i + 2]],
+                target_field: strings[edges[i + 3]],
+                relationship_type: strings[edges[i + 4]],
+                occurrences: edges[i + 5],
+                is_potential_fk: (edges[i + 6] & 1) === 1,
+                source_file: ''
+            };
+        }
+        
+        let layout = null;
+        if (graph.positions) {
+            const positions = {};
+            names.forEach((name, i) => {
+                positions[name] = [graph.positions[2 * i], graph.positions[2 * i + 1]];
+            });
+            layout = { mode: graph.layout_mode, positions: positions };
+        }
+        
+        return { entities: names, relationships: relationships, layout: layout, evidence_pending: true };
+    }
+    
+    // Fetch the PlantUML text left out of compact responses
+    function loadDiagramText(data) {
+        fetch('/diagram?run=' + encodeURIComponent(data.run))
+            .then(response => {
+                if (response.ok) {
+                    return response.text();
+                }
+                // 400/404 carry a JSON error, never PlantUML text
+                return response.json()
+                    .catch(() => ({}))
+                    .then(body => {
+                        throw new Error(body.error || `HTTP ${response.status}`);
+                    });
+            })
+            .then(text => {
+                data.diagram = text;
+                updateDiagram(text);
+                if (currentResults === data) {
+                    plantumlCode.textContent = text;
+                }
+            })
+            .catch(error => {
+                console.error('Error loading diagram:', error);
+                if (currentResults === data) {
+                    plantumlCode.textContent = 'Error loading diagram: ' + error.message;
+                }
+            });
+    }
+    
+    // Fetch relationship source files left out of compact responses
+    function loadEvidence(data) {
+        fetch('/evidence?run=' + encodeURIComponent(data.run))
+            .then(response => response.json())
+            .then(evidence => {
+                if (evidence.error) {
+                    return;
+                }
+                evidence.files.forEach((stringId, offset) => {
+                    data.relationships[evidence.start + offset].source_file = evidence.strings[stringId];
+                });
+                data.evidence_pending = false;
+                // Only the Source File cells change; the rows stay as rendered
+                if (currentResults === data) {
+                    evidence.files.forEach((stringId, offset) => {
+                        const cell = sourceFileCells[evidence.start + offset];
+                        if (cell) {
+                            cell.textContent = evidence.strings[stringId];
+                        }
+                    });
+                }
+            })
+            .catch(error => console.error('Error loading evidence:', error));
+    }
+    
+    // Render relationships in the interactive ER diagram
+    // layout: optional server-computed positions ({positions: {table: [x, y]}})
+    function renderDiagramView(relationships, layout) {
+        if (erDiagramLoaded && window.renderERDiagram) {
+            console.log("Rendering ER diagram...");
+            window.renderERDiagram(relationships, layout);
+        } else {
+            console.log("ER diagram not yet loaded, queueing data");
+            pendingRelationships = relationships;
+            pendingLayout = layout || null;
+        }
+    }
+    
+    // Fill the focus table suggestions
+    function updateFocusOptions(entities) {
+        focusTableOptions.innerHTML = '';
+        (entities || []).forEach(name => {
+            const option = document.createElement('option');
+            option.value = name;
+            focusTableOptions.appendChild(option);
+        });
+    }
+    
+    // Focus the diagram on the neighborhood of one table
+    focusForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        const table = focusTable.value.trim();
+        if (!table || !currentResults) {
+            return;
+        }
+        
+        const params = new URLSearchParams({ table: table, hops: focusHops.value });
+        fetch(`/focus?${params.toString()}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    alert('Error: ' + data.error);
+                    return;
+                }
+                
+                resultMessage.textContent = data.message;
+                plantumlCode.textContent = data.diagram;
+                renderDiagramView(data.relationships, data.layout);
+                focusResetBtn.disabled = false;
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('An error occurred while focusing: ' + error.message);
+            });
+    });
+    
+    // Go back to the full diagram
+    focusResetBtn.addEventListener('click', function() {
+        if (!currentResults) {
+            return;
+        }
+        
+        resultMessage.textContent = currentResults.message;
+        plantumlCode.textContent = currentResults.diagram;
+        renderDiagramView(currentResults.relationships, currentResults.layout);
+        focusResetBtn.disabled = true;
+    });
+    
+    // Fetch size-bounded partitions and fill the partition selector
+    function loadPartitions() {
+        currentPartitions = null;
+        partitionSelect.classList.add('d-none');
+        partitionSelect.innerHTML = '<option value="">All tables / 全部表</option>';
+        
+        fetch('/partitions')
+            .then(response => response.json())
+            .then(data => {
+                if (data.error || !data.partitions || data.partitions.length < 2) {
+                    return;
+                }
+                
+                currentPartitions = data;
+                
+                const overviewOption = document.createElement('option');
+                overviewOption.value = 'overview';
+                overviewOption.textContent = `Overview (${data.partitions.length} partitions)`;
+                partitionSelect.appendChild(overviewOption);
+                
+                data.partitions.forEach(partition => {
+                    const option = document.createElement('option');
+                    option.value = String(partition.id);
+                    option.textContent = `${partition.name}: ${partition.tables.length} tables (${partition.hub})`;
+                    partitionSelect.appendChild(option);
+                });
+                
+                partitionSelect.classList.remove('d-none');
+            })
+            .catch(error => console.error('Error loading partitions:', error));
+    }
+    
+    // Render one partition, the overview, or everything
+    partitionSelect.addEventListener('change', function() {
+        if (!currentResults) {
+            return;
+        }
+        
+        const value = partitionSelect.value;
+        
+        if (!value || !currentPartitions) {
+            resultMessage.textContent = currentResults.message;
+            plantumlCode.textContent = currentResults.diagram;
+            renderDiagramView(currentResults.relationships, currentResults.layout);
+            return;
+        }
+        
+        if (value === 'overview') {
+            const names = {};
+            currentPartitions.partitions.forEach(partition => {
+                names[partition.id] = `${partition.name} (${partition.hub})`;
+            });
+            
+            // Draw partitions as entities, labelled with relationship counts
+            const overviewRelationships = currentPartitions.cross_edges.map(edge => ({
+                source_table: names[edge.source],
+                source_field: `${edge.relationships} rel.`,
+                target_table: names[edge.target],
+                target_field: ''
+            }));
+            
+            resultMessage.textContent = `Overview of ${currentPartitions.partitions.length} partitions.`;
+            plantumlCode.textContent = currentPartitions.overview;
+            renderDiagramView(overviewRelationships);
+            return;
+        }
+        
+        const partition = currentPartitions.partitions.find(p => String(p.id) === value);
+        if (partition) {
+            resultMessage.textContent = `${partition.name}: ${partition.tables.length} tables and ${partition.relationships.length} relationships.`;
+            plantumlCode.textContent = partition.diagram;
+            renderDiagramView(partition.relationships);
+        }
+    });
+    
     // Enable all export buttons based on available data
     function enableExportButtons(data) {
         if (data.files) {
@@ -173,6 +457,11 @@ document.addEventListener('DOMContentLoaded', function() {
             if (data.files.markdown) {
                 downloadMarkdownBtn.disabled = false;
             }
+            
+            // Offline HTML report download
+            if (data.files.html) {
+                downloadHtmlBtn.disabled = false;
+            }
         }
     }
     
@@ -222,8 +511,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Update relationships table
     function updateRelationshipsTable(relationships) {
         relationshipsTable.innerHTML = '';
+        sourceFileCells = new Array(relationships.length);
         
-        relationships.forEach(rel => {
+        relationships.forEach((rel, index) => {
             const row = document.createElement('tr');
             
             const sourceTableCell = document.createElement('td');
@@ -259,11 +549,179 @@ document.addEventListener('DOMContentLoaded', function() {
             const sourceFileCell = document.createElement('td');
             sourceFileCell.textContent = rel.source_file;
             row.appendChild(sourceFileCell);
+            sourceFileCells[index] = sourceFileCell;
             
             relationshipsTable.appendChild(row);
         });
     }
     
+    // Search the SQL of all statements
+    searchForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        const query = searchQuery.value.trim();
+        if (!query || !currentResults) {
+            return;
+        }
+        
+        fetch(`/search?q=${encodeURIComponent(query)}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    alert('Error: ' + data.error);
+                    return;
+                }
+                updateSearchResults(data);
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('An error occurred while searching: ' + error.message);
+            });
+    });
+    
+    // Update search results table
+    function updateSearchResults(data) {
+        searchSummary.textContent = `${data.count} statement(s) in ${data.elapsed_ms} ms`;
+        searchTable.innerHTML = '';
+        
+        data.hits.forEach(hit => {
+            const row = document.createElement('tr');
+            
+            const statementCell = document.createElement('td');
+            statementCell.textContent = hit.namespace ? `${hit.namespace}.${hit.sql_id}` : hit.sql_id;
+            const typeBadge = document.createElement('span');
+            typeBadge.className = 'badge bg-secondary ms-1';
+            typeBadge.textContent = hit.statement_type;
+            statementCell.appendChild(typeBadge);
+            row.appendChild(statementCell);
+            
+            const fileCell = document.createElement('td');
+            fileCell.textContent = `${hit.file}:${hit.line}`;
+            row.appendChild(fileCell);
+            
+            const snippetCell = document.createElement('td');
+            const code = document.createElement('code');
+            code.textContent = hit.snippet;
+            snippetCell.appendChild(code);
+            row.appendChild(snippetCell);
+            
+            searchTable.appendChild(row);
+        });
+    }
+    
+    // Compare two snapshots
+    diffForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        diffBtn.disabled = true;
+        fetch('/diff', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ old: diffOldPath.value.trim(), new: diffNewPath.value.trim() })
+        })
+        .then(response => response.json())
+        .then(data => {
+            diffBtn.disabled = false;
+            if (data.error) {
+                alert('Error: ' + data.error);
+                return;
+            }
+            updateDiffResults(data);
+        })
+        .catch(error => {
+            diffBtn.disabled = false;
+            console.error('Error:', error);
+            alert('An error occurred while comparing: ' + error.message);
+        });
+    });
+    
+    // Render a snapshot diff as one row per change
+    function updateDiffResults(diff) {
+        const stats = diff.stats;
+        diffSummary.textContent =
+            `Relationships: +${stats.relationships_added} -${stats.relationships_removed} ` +
+            `~${stats.relationships_changed} (${stats.relationships_unchanged} unchanged) / ` +
+            `Entities: +${stats.entities_added} -${stats.entities_removed} ~${stats.entities_changed}`;
+        diffTable.innerHTML = '';
+        
+        const describe = rel => `${rel.source_table}.${rel.source_field} = ${rel.target_table}.${rel.target_field}`;
+        const addRow = (change, className, item, details) => {
+            const row = document.createElement('tr');
+            row.className = className;
+            [change, item, details].forEach(value => {
+                const cell = document.createElement('td');
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            diffTable.appendChild(row);
+        };
+        
+        diff.relationships.added.forEach(rel =>
+            addRow('+ relationship', 'table-success', describe(rel), `x${rel.occurrences}`));
+        diff.relationships.removed.forEach(rel =>
+            addRow('- relationship', 'table-danger', describe(rel), `x${rel.occurrences}`));
+        diff.relationships.changed.forEach(rel =>
+            addRow('~ relationship', 'table-warning', describe(rel),
+                `x${rel.occurrences_before} -> x${rel.occurrences_after}`));
+        diff.entities.added.forEach(name => addRow('+ entity', 'table-success', name, ''));
+        diff.entities.removed.forEach(name => addRow('- entity', 'table-danger', name, ''));
+        diff.entities.changed.forEach(entity => {
+            const changes = entity.added_fields.map(field => `+${field}`)
+                .concat(entity.removed_fields.map(field => `-${field}`));
+            if (entity.primary_key_before !== entity.primary_key_after) {
+                changes.push(`pk ${entity.primary_key_before} -> ${entity.primary_key_after}`);
+            }
+            addRow('~ entity', 'table-warning', entity.name, changes.join(', '));
+        });
+        
+        diffResults.classList.remove('d-none');
+    }
+    
+    // Update hub tables ranking, sorted by the selected column
+    function updateHubTablesTable(rankings) {
+        const tbody = hubTablesTable.querySelector('tbody');
+        tbody.innerHTML = '';
+        
+        const key = hubTableSort.key;
+        const direction = hubTableSort.descending ? -1 : 1;
+        const sorted = rankings.slice().sort((a, b) => {
+            if (a[key] < b[key]) return -direction;
+            if (a[key] > b[key]) return direction;
+            return a.table < b.table ? -1 : 1;
+        });
+        
+        sorted.forEach(hub => {
+            const row = document.createElement('tr');
+            [hub.table, hub.degree, hub.weighted_degree, hub.pagerank.toFixed(4)].forEach(value => {
+                const cell = document.createElement('td');
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            tbody.appendChild(row);
+        });
+        
+        hubTablesTable.querySelectorAll('th[data-sort-key]').forEach(th => {
+            th.classList.toggle('text-primary', th.dataset.sortKey === key);
+        });
+    }
+    
+    // Sort hub tables by column
+    hubTablesTable.querySelectorAll('th[data-sort-key]').forEach(th => {
+        th.addEventListener('click', function() {
+            const key = this.dataset.sortKey;
+            if (hubTableSort.key === key) {
+                hubTableSort.descending = !hubTableSort.descending;
+            } else {
+                hubTableSort = { key: key, descending: key !== 'table' };
+            }
+            if (currentResults) {
+                updateHubTablesTable(currentResults.table_rankings || []);
+            }
+        });
+    });
+    
     // Theme functions
     function initTheme() {
         // Check for saved theme preference or respect OS preference
@@ -311,7 +769,7 @@ document.addEventListener('DOMContentLoaded', function() {
     });
     
     downloadPngBtn.addEventListener('click', function() {
-        if (currentResults && currentResults.files) {
+        if (currentResults && currentResults.files && currentResults.diagram !== undefined) {
             // Try to get SVG data and convert to PNG
             const encodedDiagram = encodePlantUML(currentResults.diagram);
             let url = `http://www.plantuml.com/plantuml/png/${encodedDiagram}`;
@@ -349,6 +807,15 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Offline HTML report download
+    if (downloadHtmlBtn) {
+        downloadHtmlBtn.addEventListener('click', function() {
+            if (currentResults && currentResults.files && currentResults.files.html) {
+                window.location.href = `/download/${currentResults.files.html}`;
+            }
+        });
+    }
+    
     downloadPlantumlBtn.addEventListener('click', function() {
         if (currentResults && currentResults.files && currentResults.files.plantuml) {
             window.location.href = `/download/${currentResults.files.plantuml}`;
@@ -439,10 +906,11 @@ document.addEventListener('DOMContentLoaded', function() {
         // Render JointJS diagram with relationship data
         if (erDiagramLoaded && window.renderERDiagram) {
             console.log("Rendering ER diagram in displayResults...");
-            window.renderERDiagram(data.relationships);
+            window.renderERDiagram(data.relationships, data.layout);
         } else {
             console.log("ER diagram not yet loaded in displayResults, queueing data");
             pendingRelationships = data.relationships;
+            pendingLayout = data.layout || null;
         }
         
         // Update relationships table